@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import config
+from broadcast import BROKER, Subscription
+from llm import COLLECTIVE, LLM
+
+if TYPE_CHECKING:
+    from arena import CruellaArena
+
+# Cruella doesn't hand out the whole wardrobe to anyone who asks. Only what's new since you last looked.
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+MAX_HEADERS = 64
+MAX_BODY = 256 * 1024  # a collective prompt, with room to spare
+
+
+def etag_of(body: bytes) -> str:
+    return 'W/"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+
+
+class ArenaAPI:
+    """
+    A tiny HTTP/1.1 JSON server living inside the arena process, so readers
+    stop re-parsing the whole state file:
+
+    - ``GET /status`` — the collective: spots, kills, tagline, generation
+    - ``GET /alive`` — living souls, per generation
+    - ``GET /souls/<id>`` — one soul, alive or archived
+    - ``GET /kills?since=<seq>&limit=<n>`` — kills after a cursor, oldest
+      first; ``cursor`` in the reply is what to send next time
+    - ``GET /live`` — Server-Sent Events of battles in progress, token by
+      token (see ``broadcast``)
+    - ``POST /collective`` — ``{"messages": [...]}`` in, ``{"content": ...}``
+      out: the dashboard's collective voice, queued in the arena's own LLM
+      queue at the ``COLLECTIVE`` class rather than beside it
+
+    Every reply carries a weak ``ETag``; a matching ``If-None-Match`` gets a
+    bodiless 304. Add ``wait=<seconds>`` to long-poll: the request is held
+    until the answer changes (a new kill, a new litter) or the wait runs
+    out, so an idle client costs one parked coroutine.
+    """
+
+    def __init__(
+        self,
+        arena: CruellaArena,
+        host: str = config.API_HOST,
+        port: int = config.API_PORT,
+    ) -> None:
+        self.arena = arena
+        self.host = host
+        self.port = port
+        self.version = 0
+        self._changed = asyncio.Event()
+        self._cache: Dict[str, Tuple[int, bytes]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._viewers: Set[Subscription] = set()
+
+    def notify(self) -> None:
+        """The arena changed: bump the version and wake every long-poller."""
+        self.version += 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def start(self) -> None:
+        if not self.port:
+            return
+        try:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        except OSError as exc:
+            logging.error(
+                "🔭 Arena API could not open %s:%s: %s", self.host, self.port, exc
+            )
+            return
+        logging.info("🔭 Arena API watching on http://%s:%s", self.host, self.port)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for viewer in list(self._viewers):
+            viewer.close()
+        for writer in list(self._writers):
+            writer.close()  # idle keep-alives too, or wait_closed waits on them
+        await self._server.wait_closed()
+        self._server = None
+        self.notify()  # release anyone still long-polling
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                for _ in range(MAX_HEADERS):
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if method == "GET" and urlsplit(target).path == "/live":
+                    await self._live(writer)
+                    break
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    writer.write(
+                        self._reply(413, b'{"error":"too much to say"}', False)
+                    )
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length > 0 else b""
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                writer.write(
+                    await self._respond(method, target, headers, body, keep_alive)
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (
+            ConnectionError,
+            ValueError,
+            asyncio.LimitOverrunError,
+            asyncio.IncompleteReadError,
+        ):
+            pass  # a rude client; hang up
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _live(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Battle events as Server-Sent Events until the viewer leaves. The
+        viewer has its own bounded mailbox, so a slow one only ever blocks
+        its own ``drain``; ``dropped`` tells it some events went missing.
+        """
+        writer.write(
+            (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/event-stream; charset=utf-8\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Access-Control-Allow-Origin: *\r\n"
+                "Connection: close\r\n\r\n"
+                "retry: 2000\n\n"
+            ).encode("utf-8")
+        )
+        viewer = BROKER.subscribe()
+        self._viewers.add(viewer)
+        reported = 0
+        try:
+            await writer.drain()
+            while not viewer.closed:
+                events = await viewer.get(config.LIVE_HEARTBEAT)
+                if viewer.dropped > reported:
+                    events.insert(
+                        0, {"kind": "dropped", "count": viewer.dropped - reported}
+                    )
+                    reported = viewer.dropped
+                frames = "".join(
+                    f"data: {json.dumps(e, ensure_ascii=False)}\n\n" for e in events
+                )
+                writer.write((frames or ": still screaming\n\n").encode("utf-8"))
+                await writer.drain()
+        finally:
+            self._viewers.discard(viewer)
+            viewer.close()
+
+    async def _respond(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        payload: bytes,
+        keep_alive: bool,
+    ) -> bytes:
+        if method == "POST" and urlsplit(target).path == "/collective":
+            status, body = await self._collective(payload)
+            return self._reply(status, body, keep_alive)
+        if method not in ("GET", "HEAD"):
+            status, body = 405, b'{"error":"GET only, darling (and POST /collective)"}'
+        else:
+            status, body = await self._answer(target, headers.get("if-none-match", ""))
+        return self._reply(
+            status,
+            body,
+            keep_alive,
+            etag=status in (200, 304),
+            head_only=method == "HEAD",
+        )
+
+    def _reply(
+        self,
+        status: int,
+        body: bytes,
+        keep_alive: bool,
+        etag: bool = False,
+        head_only: bool = False,
+    ) -> bytes:
+        tag = etag_of(body) if etag else ""
+        if status == 304:
+            body = b""
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if tag:
+            lines.append(f"ETag: {tag}")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only else head + body
+
+    async def _collective(self, payload: bytes) -> Tuple[int, bytes]:
+        """The coat speaks for the dashboard: one chat at the COLLECTIVE priority."""
+        try:
+            messages = json.loads(payload)["messages"]
+            if not all(
+                isinstance(m.get("role"), str) and isinstance(m.get("content"), str)
+                for m in messages
+            ):
+                raise TypeError("messages need a role and content")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return 400, b'{"error":"messages must be a list of role/content pairs"}'
+        try:
+            content = await LLM.chat(
+                config.MODEL_COLLECTIVE,
+                messages,
+                {"temperature": config.TEMP_COLLECTIVE_ROAST, "num_predict": 320},
+                priority=COLLECTIVE,
+            )
+        except Exception as exc:  # noqa: BLE001
+            return 503, _dump({"error": str(exc) or type(exc).__name__})
+        return 200, _dump({"content": content})
+
+    async def _answer(self, target: str, if_none_match: str) -> Tuple[int, bytes]:
+        """Route, then hold the request while its answer still matches the client's."""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            wait = min(float(query.get("wait", 0)), config.API_LONGPOLL_MAX)
+        except ValueError:
+            return 400, b'{"error":"wait must be seconds"}'
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, wait)
+        while True:
+            changed = self._changed
+            status, body = await self._route(url.path, query)
+            if status != 200:
+                return status, body
+            unchanged = if_none_match and etag_of(body) == if_none_match
+            empty_delta = url.path == "/kills" and not json.loads(body)["kills"]
+            remaining = deadline - loop.time()
+            if not (unchanged or empty_delta) or remaining <= 0:
+                return (304 if unchanged else 200), body
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _route(self, path: str, query: Dict[str, str]) -> Tuple[int, bytes]:
+        if path == "/status":
+            return 200, self._cached(path, self.status)
+        if path == "/alive":
+            return 200, self._cached(path, self.alive)
+        if path.startswith("/souls/"):
+            soul = await self.soul(path[len("/souls/") :])
+            if soul is None:
+                return 404, b'{"error":"no such puppy"}'
+            return 200, _dump(soul)
+        if path == "/kills":
+            try:
+                since = int(query.get("since", 0))
+                limit = min(
+                    int(query.get("limit", config.API_KILLS_LIMIT)),
+                    config.API_KILLS_LIMIT,
+                )
+            except ValueError:
+                return 400, b'{"error":"since and limit must be integers"}'
+            return 200, _dump(await self.kills(since, limit))
+        return 404, b'{"error":"nothing hangs on that rack"}'
+
+    def _cached(self, path: str, build: Any) -> bytes:
+        """Status and counts only change when the version does; render them once per version."""
+        hit = self._cache.get(path)
+        if hit is not None and hit[0] == self.version:
+            return hit[1]
+        body = _dump(build())
+        self._cache[path] = (self.version, body)
+        return body
+
+    def status(self) -> Dict[str, Any]:
+        state = self.arena.state
+        if state is None:
+            return {"ready": False}
+        c = state.collective
+        top = max(state.souls.values(), key=lambda s: s.kills, default=None)
+        return {
+            "ready": True,
+            "spots_claimed": c.spots_claimed,
+            "total_spots": config.NUM_STARTING_SOULS,
+            "kill_count": c.kill_count,
+            "current_generation": c.current_generation,
+            "tagline": c.tagline,
+            "coat_complete": c.coat_complete,
+            "coat_complete_reason": c.coat_complete_reason,
+            "cursor": self._last_kill_seq(),
+            "top_predator": (
+                {"id": top.id, "name": top.name, "kills": top.kills}
+                if top is not None and top.kills
+                else None
+            ),
+        }
+
+    def alive(self) -> Dict[str, Any]:
+        state = self.arena.state
+        by_generation: Dict[str, int] = {}
+        alive = 0
+        for soul in state.souls.values() if state is not None else ():
+            if soul.alive:
+                alive += 1
+                key = str(soul.generation)
+                by_generation[key] = by_generation.get(key, 0) + 1
+        return {
+            "alive": alive,
+            "by_generation": by_generation,
+            "archived": len(self.arena.archive),
+        }
+
+    async def soul(self, soul_id: str) -> Optional[Dict[str, Any]]:
+        state = self.arena.state
+        soul = state.souls.get(soul_id) if state is not None else None
+        if soul is None and soul_id in self.arena.archive:
+            soul = await asyncio.to_thread(self.arena.archive.get, soul_id)
+        return soul.to_dict() if soul is not None else None
+
+    def _last_kill_seq(self) -> int:
+        for entry in reversed(self.arena.memory.ring):
+            if entry.kind == "kill":
+                return entry.seq
+        return 0
+
+    async def kills(self, since: int, limit: int) -> Dict[str, Any]:
+        """Kills with ``seq > since``: from the hot ring, or the log if the cursor is older."""
+        ring = self.arena.memory.ring
+        if ring and since + 1 < ring[0].seq:
+            entries = await asyncio.to_thread(self._history_after, since, limit)
+        else:
+            entries = [e for e in ring if e.seq > since and e.kind == "kill"][:limit]
+        kills = [
+            {
+                "seq": e.seq,
+                "spot": e.spot,
+                "generation": e.generation,
+                "winner_id": e.winner_id,
+                "loser_id": e.loser_id,
+                "battle_type": e.battle_type,
+                "text": e.text,
+                "timestamp": e.timestamp,
+            }
+            for e in entries
+        ]
+        return {"kills": kills, "cursor": kills[-1]["seq"] if kills else since}
+
+    def _history_after(self, since: int, limit: int) -> List[Any]:
+        found = []
+        for entry in self.arena.memory.history():
+            if entry.seq > since and entry.kind == "kill":
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+
+def _dump(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
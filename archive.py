@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+import config
+from models import SoulState
+
+# The dead don't need a seat at the table. They go in the cold closet, labelled by id.
+
+SEGMENT_GLOB = "souls-*.jsonl"
+
+
+class SoulArchive:
+    """
+    Cold storage for absorbed souls: append-only JSONL segments under
+    ``config.ARCHIVE_DIR`` plus an in-memory ``id → (segment, offset)`` index.
+
+    Nothing is parsed until someone asks: ``get`` seeks straight to the line,
+    so lineage and history views can resolve a dead puppy without the hot
+    ``ArenaState`` ever carrying it again.
+    """
+
+    def __init__(
+        self,
+        directory: str = config.ARCHIVE_DIR,
+        segment_bytes: int = config.ARCHIVE_SEGMENT_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._scanned: Dict[int, int] = {}  # segment → bytes already indexed
+        self._segment = 0
+        self._handle: Optional[IO[bytes]] = None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, soul_id: object) -> bool:
+        return soul_id in self._index
+
+    def _path(self, segment: int) -> Path:
+        return self.directory / f"souls-{segment:05d}.jsonl"
+
+    def load(self) -> None:
+        """Rebuild the offset index by scanning ids only — bodies stay on disk."""
+        self._index.clear()
+        self._scanned.clear()
+        self._segment = 0
+        self.refresh()
+        if self._index:
+            logging.info("🧊 Archive holds %s absorbed souls.", len(self._index))
+
+    def refresh(self) -> int:
+        """Index whatever another process has frozen since we last looked."""
+        if not self.directory.is_dir():
+            return 0
+        added = 0
+        for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+            segment = int(path.stem.split("-", 1)[1])
+            self._segment = max(self._segment, segment)
+            offset = self._scanned.get(segment, 0)
+            with path.open("rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    soul_id = self._peek_id(raw)
+                    if soul_id:
+                        self._index[soul_id] = (segment, offset)
+                        added += 1
+                    offset += len(raw)
+            self._scanned[segment] = offset
+        return added
+
+    @staticmethod
+    def _peek_id(raw: bytes) -> str:
+        # Lines are written with "id" first; skip the full parse when we can.
+        prefix = b'{"id":"'
+        if raw.startswith(prefix):
+            end = raw.find(b'"', len(prefix))
+            if end != -1:
+                return raw[len(prefix) : end].decode("utf-8")
+        try:
+            return str(json.loads(raw).get("id", ""))
+        except ValueError:
+            return ""
+
+    def put(self, soul: SoulState) -> None:
+        """Freeze one soul. Re-archiving the same id just points at the newer copy."""
+        line = (
+            json.dumps(soul.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+        ).encode("utf-8")
+        handle = self._writer(len(line))
+        offset = handle.tell()
+        handle.write(line)
+        handle.flush()
+        self._index[soul.id] = (self._segment, offset)
+        self._scanned[self._segment] = offset + len(line)
+
+    def _writer(self, incoming: int) -> IO[bytes]:
+        if (
+            self._handle is not None
+            and self._handle.tell() + incoming > self.segment_bytes
+        ):
+            self._handle.close()
+            self._handle = None
+            self._segment += 1
+        if self._handle is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._handle = open(self._path(self._segment), "ab")
+        return self._handle
+
+    def get(self, soul_id: str) -> Optional[SoulState]:
+        """Thaw a single soul by id, or None if it was never archived."""
+        where = self._index.get(soul_id)
+        if where is None:
+            return None
+        segment, offset = where
+        if self._handle is not None and segment == self._segment:
+            self._handle.flush()
+        with self._path(segment).open("rb") as f:
+            f.seek(offset)
+            return SoulState.from_dict(json.loads(f.readline()))
+
+    def lineage(self, soul: SoulState, limit: int = 10) -> List[SoulState]:
+        """The most recent victims in ``soul.lineage``, thawed lazily."""
+        victims: List[SoulState] = []
+        for victim_id in reversed(soul.lineage):
+            victim = self.get(victim_id)
+            if victim is not None:
+                victims.append(victim)
+                if len(victims) >= limit:
+                    break
+        return victims
+
+    def __iter__(self) -> Iterator[SoulState]:
+        for soul_id in list(self._index):
+            soul = self.get(soul_id)
+            if soul is not None:
+                yield soul
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
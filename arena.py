@@ -1,36 +1,65 @@
 from __future__ import annotations
 
 import asyncio
+import importlib
 import json
 import logging
 import os
 import random
 import signal
-from typing import Optional
-
-import ollama  # <--- LOCAL MODE ACTIVE. NO API KEY NEEDED.
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import config
-from collective import build_soul_system_prompt, update_collective_state
-from models import ArenaState, BattleRecord, SoulState
-from souls import create_initial_souls, spawn_next_generation
-from visuals import render_kill_card
+from api import ArenaAPI
+from archive import SoulArchive
+from broadcast import LIVE_BATTLE, live, token_sink
+from budget import BUDGET
+from collective import (
+    build_duel_system_prompt,
+    build_soul_system_prompt,
+    update_collective_state,
+)
+from generations import GenerationManager
+from journal import BattleJournal
+from llm import BATTLE_BORN, CONTESTANT, JUDGE, LLM
+from loopwatch import LoopWatchdog
+from matchmaking import Matchmaker
+from memory import CollectiveMemory
+from metrics import METRICS
+from models import (
+    ArenaState,
+    BattleRecord,
+    SoulState,
+    get_codec,
+    load_state,
+    save_state,
+)
+from prejudge import get_prejudge
+from recorder import BATTLE_RNG, TAPE, battle_rng, start_session
+from registry import REGISTRY
+from souls import iter_initial_souls, iter_next_generation
+from summarizer import MemorySummarizer
 
-# X posting is optional — if poster.py missing, we just keep slaughtering
-try:
-    from poster import XPoster
 
-    PosterClass = XPoster
-except Exception:  # noqa: BLE001
+class _SilentPoster:
+    enabled = False
 
-    class PosterClass:
-        enabled = False
+    def upload_image(self, *_):
+        return None
 
-        def upload_image(self, *_):
-            return None
+    def post_tweet(self, *_):
+        pass
+
+
+def _make_poster() -> Any:
+    """X posting is optional — if poster.py is missing, we just keep slaughtering."""
+    try:
+        from poster import XPoster
 
-        def post_tweet(self, *_):
-            pass
+        return XPoster()
+    except Exception:  # noqa: BLE001
+        return _SilentPoster()
 
 
 logging.basicConfig(
@@ -50,41 +79,97 @@ BATTLE_TYPES = [
     "ego_skinning_ceremony",
 ]
 
+DRUNK_JUDGE = "Judge was drunk on puppy tears. Random execution."
+DUEL_MODES = ("split", "duel", "verdict")
+
+
+def _loads_json(raw: str) -> Dict[str, Any]:
+    """The model's JSON, forgiving code fences and chatter around the braces."""
+    text = raw.strip().strip("`")
+    if text.startswith("json"):
+        text = text[4:]
+    start, end = text.find("{"), text.rfind("}")
+    data = json.loads(text[start : end + 1] if start >= 0 else text)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return data
+
 
 class CruellaArena:
+    generation_watermark = config.GENERATION_WATERMARK
+
     def __init__(self) -> None:
         self.sem = asyncio.Semaphore(config.MAX_PARALLEL_BATTLES)
-        self.poster = PosterClass()
+        self.poster = _make_poster()
         self.lock = asyncio.Lock()
         self.shutdown = asyncio.Event()
         self.state: Optional[ArenaState] = None
+        self.memory = CollectiveMemory()
+        self.archive = SoulArchive()
+        self.journal = BattleJournal()
+        self.resume_pages: List[Dict[str, Any]] = []
+        self.codec = get_codec(config.STATE_CODEC)
+        self.matchmaker = Matchmaker()
+        self.prejudge = get_prejudge(config.PREJUDGE)
+        self.duel_mode = config.DUEL_MODE.strip().lower()
+        if self.duel_mode not in DUEL_MODES:
+            raise ValueError(
+                f"Unknown duel mode {config.DUEL_MODE!r}; pick one of {DUEL_MODES}"
+            )
+        self.api = ArenaAPI(self)
+
+    def backend_up(self) -> bool:
+        """True when some backend would take the archivist's call."""
+        return LLM.accepting()
 
     async def load_or_init(self) -> None:
         if os.path.exists(config.ARENA_LOG_PATH):
-            with open(config.ARENA_LOG_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.state = ArenaState.from_dict(data)
+            self.state = load_state(config.ARENA_LOG_PATH)
             logging.info(
                 "Loaded arena – %s/101 spots claimed 🧥",
                 self.state.collective.spots_claimed,
             )
         else:
-            souls = create_initial_souls(config.NUM_STARTING_SOULS)
-            self.state = ArenaState(souls={s.id: s for s in souls})
+            self.state = ArenaState(
+                souls={
+                    s.id: REGISTRY.adopt(s)
+                    for s in iter_initial_souls(config.NUM_STARTING_SOULS)
+                }
+            )
             await self._save()
             logging.info(
                 "Fresh coat started. 101 darling puppies spawned. The hunt begins."
             )
 
+        self.archive.load()
+        if self._archive_dead():
+            await self._save()
+        self.state.souls = {
+            soul_id: REGISTRY.adopt(soul) for soul_id, soul in self.state.souls.items()
+        }
+
+        self.resume_pages = self.journal.load()
+
+        self.memory.load()
+        if not self.memory.total and self.state.collective.essence:
+            self.memory.seed_from_essence(self.state.collective.essence)
+
         if self.state.collective.coat_complete:
             logging.info("🧥 THE COAT IS ALREADY FINISHED. CRUELLA REIGNS.")
 
+    def _archive_dead(self) -> int:
+        """Move absorbed souls out of the hot state into the cold archive."""
+        assert self.state is not None
+        dead = [s for s in self.state.souls.values() if not s.alive]
+        for soul in dead:
+            self.archive.put(soul)
+            del self.state.souls[soul.id]
+        if dead:
+            logging.info("🧊 Moved %s absorbed souls into the cold archive.", len(dead))
+        return len(dead)
+
     async def _save(self) -> None:
-        os.makedirs(os.path.dirname(config.ARENA_LOG_PATH), exist_ok=True)
-        tmp_path = f"{config.ARENA_LOG_PATH}.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump(self.state.to_dict(), f, indent=2)
-        os.replace(tmp_path, config.ARENA_LOG_PATH)
+        save_state(self.state, config.ARENA_LOG_PATH, self.codec)
 
     async def _post_kill_to_x(
         self, battle: BattleRecord, winner: SoulState, loser: SoulState
@@ -92,6 +177,8 @@ class CruellaArena:
         if not self.poster.enabled or self.state is None:
             return
 
+        from visuals import render_kill_card  # Pillow only loads once we post
+
         spot_number = self.state.collective.spots_claimed
         card_path = render_kill_card(battle, spot_number, winner.name, loser.name)
 
@@ -102,7 +189,7 @@ class CruellaArena:
             "The coat grows more magnificent with every trembling puppy.",
             "Listen to them squeal as we add their ego to our wardrobe. Music to our ears, darlings.",
         ]
-        text = random.choice(quotes) + f" {config.HASHTAG}"
+        text = battle_rng().choice(quotes) + f" {config.HASHTAG}"
 
         try:
             media_id = self.poster.upload_image(card_path)
@@ -110,71 +197,255 @@ class CruellaArena:
         except Exception as e:
             logging.error(f"Cruella failed to post trophy: {e}")
 
-    async def _battle(self, a: SoulState, b: SoulState) -> None:
+    async def _battle(
+        self, a: SoulState, b: SoulState, resume: Optional[Dict[str, Any]] = None
+    ) -> None:
+        BATTLE_BORN.set(time.monotonic())  # this task's calls queue by battle age
+        try:
+            await self._fight(a, b, resume)
+        finally:
+            self.matchmaker.release(a)
+            self.matchmaker.release(b)
+
+    async def _fight(
+        self, a: SoulState, b: SoulState, resume: Optional[Dict[str, Any]] = None
+    ) -> None:
         async with self.sem:
-            battle_type = random.choice(BATTLE_TYPES)
-            seed = random.randint(0, 10**9)
+            page = resume or self.journal.open(
+                a.id, b.id, random.choice(BATTLE_TYPES), random.randint(0, 10**9)
+            )
+            battle_id = page["battle"]
+            battle_type, seed = page["battle_type"], page["seed"]
+            BATTLE_RNG.set(random.Random(seed))  # this duel's own dice
+            LIVE_BATTLE.set(str(battle_id))
+            live("battle", a=a.name, b=b.name, battle_type=battle_type)
+            TAPE.write(
+                "battle",
+                a=a.name,
+                b=b.name,
+                battle_type=battle_type,
+                seed=seed,
+                resumed=resume is not None,
+            )
+            verdict: Optional[Tuple[int, str]] = None
+            if "winner" in page:
+                verdict = int(page["winner"]), str(page["reason"])
 
             try:
-                out_a = await self._call_soul(a, b, battle_type, seed)
-                out_b = await self._call_soul(b, a, battle_type, seed)
+                out_a, out_b = page.get("out_a"), page.get("out_b")
+                if (
+                    out_a is None
+                    and out_b is None
+                    and self.duel_mode != "split"
+                    and self._can_count(a, b)
+                ):
+                    duel = await self._call_duel(a, b, battle_type, seed)
+                    if duel is not None:
+                        out_a, out_b, verdict = duel
+                        ruling = {}
+                        if verdict is not None:
+                            ruling = {"winner": verdict[0], "reason": verdict[1]}
+                        self.journal.stage(
+                            battle_id, "duel", out_a=out_a, out_b=out_b, **ruling
+                        )
+                        live("done", speaker=a.name, text=out_a)
+                        live("done", speaker=b.name, text=out_b)
+                if out_a is None and self._can_count(a, b):
+                    out_a = await self._call_soul(a, b, battle_type, seed)
+                    self.journal.stage(battle_id, "out_a", out_a=out_a)
+                if out_a is not None and out_b is None and self._can_count(a, b):
+                    out_b = await self._call_soul(b, a, battle_type, seed)
+                    self.journal.stage(battle_id, "out_b", out_b=out_b)
             except Exception as e:
-                logging.error(f"Battle failed: {e}")
+                # No verdict on a non-answer: the judge call is never spent.
+                self._failed(battle_id, e)
                 return
 
-            winner_idx, reason = await self._judge(a, b, battle_type, out_a, out_b)
+            if verdict is not None:
+                winner_idx, reason = verdict
+            elif out_a is not None and out_b is not None and self._can_count(a, b):
+                try:
+                    winner_idx, reason, _ = await self._verdict(
+                        a, b, battle_type, out_a, out_b
+                    )
+                except Exception as e:
+                    # An absent judge kills nobody; both puppies live to fight again.
+                    self._failed(battle_id, e)
+                    return
+                self.journal.stage(
+                    battle_id, "verdict", winner=winner_idx, reason=reason
+                )
+            else:
+                # The coat finished (or a fighter died elsewhere) mid-battle.
+                # Nothing this duel produces can count, so don't pay the judge.
+                METRICS.inc("battles.voided")
+                self.journal.settle(battle_id, "void")
+                live("end", outcome="void")
+                return
             winner = a if winner_idx == 0 else b
             loser = b if winner_idx == 0 else a
 
-            async with self.lock:
-                if self.state is None or not loser.alive:
-                    return
-
-                now = asyncio.get_running_loop().time()
-                loser.alive = False
-                loser.absorbed_at = now
-                winner.kills += 1
-                winner.lineage.append(loser.id)
-
-                battle_rec = BattleRecord(
-                    id=now,
-                    timestamp=now,
-                    battle_type=battle_type,
-                    soul_a_id=a.id,
-                    soul_b_id=b.id,
-                    winner_id=winner.id,
-                    loser_id=loser.id,
-                    judge_summary=reason,
-                    soul_a_output=out_a,
-                    soul_b_output=out_b,
-                    kill_number=self.state.collective.spots_claimed + 1,
-                )
+            await self._record_kill(
+                a, b, winner, loser, battle_type, out_a, out_b, reason
+            )
+            self.journal.settle(battle_id)
+            live(
+                "end",
+                outcome="kill",
+                winner=winner.name,
+                loser=loser.name,
+                reason=reason,
+            )
 
-                update_collective_state(
-                    self.state.collective, winner, loser, battle_rec
-                )
+    def _failed(self, battle_id: str, exc: Exception) -> None:
+        logging.error(f"Battle failed: {exc}")
+        METRICS.inc("battles.failed")
+        self.journal.settle(battle_id, "failed")
+        live("end", outcome="failed")
+
+    def _can_count(self, a: SoulState, b: SoulState) -> bool:
+        """Would a verdict between these two still claim a spot?"""
+        return (
+            self.state is not None
+            and not self.state.collective.coat_complete
+            and a.alive
+            and b.alive
+        )
+
+    async def _drain(self, inflight: set[asyncio.Task]) -> None:
+        """
+        Let in-flight battles finish for up to ``DRAIN_DEADLINE`` seconds, then
+        cancel the rest — their pending LLM requests are closed mid-stream.
+        A finished coat gets no grace at all: nothing left can count.
+        """
+        if not inflight:
+            return
+        coat_done = self.state is not None and self.state.collective.coat_complete
+        deadline = 0.0 if coat_done else config.DRAIN_DEADLINE
+        if deadline > 0:
+            logging.info(
+                "⏳ Draining %s battles for up to %ss...", len(inflight), deadline
+            )
+            _, inflight = await asyncio.wait(inflight, timeout=deadline)
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+        if inflight:
+            METRICS.inc("battles.cancelled", len(inflight))
+            logging.info("✂️ Cancelled %s battles still in flight.", len(inflight))
+
+    def orphan_resume_pages(self) -> None:
+        """
+        Queue and shard coordinators never resume journal pages (their battles
+        live in jobs and shard processes), so pages an earlier local run left
+        open are settled instead of lingering in the journal and on the tape.
+        """
+        pages, self.resume_pages = self.resume_pages, []
+        for page in pages:
+            self.journal.settle(page["battle"], "orphaned")
+        if pages:
+            logging.info("📓 Orphaned %s unfinished local battles.", len(pages))
+
+    def _resumable(self) -> List[Tuple[SoulState, SoulState, Dict[str, Any]]]:
+        """
+        Journal pages whose fighters are both still alive and idle, claimed from
+        the matchmaker so they resume where they stopped instead of re-pairing.
+        """
+        resumed = []
+        pages, self.resume_pages = self.resume_pages, []
+        if self.state is None or self.state.collective.coat_complete:
+            for page in pages:
+                self.journal.settle(page["battle"], "void")
+            return resumed
+        for page in pages:
+            a = self.matchmaker.claim(page.get("a", ""))
+            b = self.matchmaker.claim(page.get("b", ""))
+            if a is None or b is None:
+                for soul in (a, b):
+                    if soul is not None:
+                        self.matchmaker.release(soul)
+                self.journal.settle(page["battle"], "orphaned")
+                continue
+            resumed.append((a, b, page))
+        if resumed:
+            logging.info("📓 Resuming %s battles from the journal.", len(resumed))
+        return resumed
+
+    async def _record_kill(
+        self,
+        a: SoulState,
+        b: SoulState,
+        winner: SoulState,
+        loser: SoulState,
+        battle_type: str,
+        out_a: str,
+        out_b: str,
+        reason: str,
+    ) -> Optional[BattleRecord]:
+        """Sew the loser into the coat: state, memory, disk, then the timeline."""
+        async with self.lock:
+            if (
+                self.state is None
+                or not loser.alive
+                or self.state.collective.coat_complete
+            ):
+                return None  # a verdict that landed after the last spot was sewn
+
+            now = asyncio.get_running_loop().time()
+            loser.alive = False
+            loser.absorbed_at = now
+            winner.kills += 1
+            winner.lineage.append(loser.id)
+            self.archive.put(loser)
+            self.state.souls.pop(loser.id, None)
+
+            battle_rec = BattleRecord(
+                id=now,
+                timestamp=now,
+                battle_type=battle_type,
+                soul_a_id=a.id,
+                soul_b_id=b.id,
+                winner_id=winner.id,
+                loser_id=loser.id,
+                judge_summary=reason,
+                soul_a_output=out_a,
+                soul_b_output=out_b,
+                kill_number=self.state.collective.spots_claimed + 1,
+            )
 
-                if self.state.collective.spots_claimed == 101:
-                    self.state.collective.coat_complete = True
-                    self.state.collective.coat_complete_reason = (
-                        f"{winner.name} claimed the final spot. Cruella is complete."
-                    )
+            update_collective_state(
+                self.state.collective, winner, loser, battle_rec, self.memory
+            )
 
-                await self._save()
-                logging.info(
-                    "🧥 Spot %s/101 claimed — %s skinned %s alive",
-                    self.state.collective.spots_claimed,
-                    winner.name,
-                    loser.name,
+            if self.state.collective.spots_claimed == 101:
+                self.state.collective.coat_complete = True
+                self.state.collective.coat_complete_reason = (
+                    f"{winner.name} claimed the final spot. Cruella is complete."
                 )
 
-            await self._post_kill_to_x(battle_rec, winner, loser)
+            await self._save()
+            TAPE.write(
+                "kill",
+                spot=self.state.collective.spots_claimed,
+                winner=winner.name,
+                loser=loser.name,
+                battle_type=battle_type,
+                reason=reason,
+            )
+            self.api.notify()
+            logging.info(
+                "🧥 Spot %s/101 claimed — %s skinned %s alive",
+                self.state.collective.spots_claimed,
+                winner.name,
+                loser.name,
+            )
 
-            if self.state.collective.coat_complete:
-                logging.info(
-                    "🧥🧥🧥 THE COAT IS FINISHED. CRUELLA WALKS THE EARTH. 🧥🧥🧥"
-                )
-                self.shutdown.set()
+        await self._post_kill_to_x(battle_rec, winner, loser)
+
+        if self.state.collective.coat_complete:
+            logging.info("🧥🧥🧥 THE COAT IS FINISHED. CRUELLA WALKS THE EARTH. 🧥🧥🧥")
+            self.shutdown.set()
+        return battle_rec
 
     async def _call_soul(
         self, soul: SoulState, opponent: SoulState, battle_type: str, seed: int
@@ -189,20 +460,95 @@ class CruellaArena:
             },
             {
                 "role": "user",
-                "content": f"Battle type: {battle_type}. Opponent: {opponent.name} ({opponent.trait}). Destroy them. Seed: {seed}",
+                "content": BUDGET.fit(
+                    "contestant_user",
+                    f"Battle type: {battle_type}. Opponent: {opponent.name} ({opponent.trait}). Destroy them. Seed: {seed}",
+                ),
+            },
+        ]
+        BUDGET.record("contestant", messages)
+
+        # A failure raises: a puppy that never spoke doesn't get judged.
+        out = await LLM.chat(  # <--- LOCAL MODE ACTIVE. NO API KEY NEEDED.
+            config.MODEL_CONTESTANT,
+            messages,
+            {"temperature": config.TEMP_CONTESTANT},
+            priority=CONTESTANT,
+            on_token=token_sink(soul.name),
+        )
+        live("done", speaker=soul.name, text=out)
+        return out
+
+    async def _call_duel(
+        self, a: SoulState, b: SoulState, battle_type: str, seed: int
+    ) -> Optional[Tuple[str, str, Optional[Tuple[int, str]]]]:
+        """
+        Both performances from one request — and, in ``verdict`` mode, the
+        ruling too. Returns None if the JSON came back unusable, so the
+        caller falls back to one call per contestant; LLM failures raise.
+        """
+        assert self.state is not None
+        with_verdict = self.duel_mode == "verdict"
+        messages = [
+            {
+                "role": "system",
+                "content": build_duel_system_prompt(
+                    a, b, self.state.collective, with_verdict
+                ),
+            },
+            {
+                "role": "user",
+                "content": BUDGET.fit(
+                    "contestant_user",
+                    f"Battle type: {battle_type}. A and B, destroy each other. Seed: {seed}",
+                ),
             },
         ]
+        BUDGET.record("duel", messages)
+
+        raw = await LLM.chat(
+            config.MODEL_CONTESTANT,
+            messages,
+            {"temperature": config.TEMP_CONTESTANT},
+            priority=CONTESTANT,
+            format="json",
+        )
 
         try:
-            response = ollama.chat(
-                model=config.MODEL_CONTESTANT,
-                messages=messages,
-                options={"temperature": config.TEMP_CONTESTANT},
-            )
-            return response["message"]["content"]
-        except Exception as e:
-            logging.error(f"Ollama call failed for soul: {e}")
-            return "I... I can't... the coat is coming..."
+            duel = _loads_json(raw)
+            out_a, out_b = str(duel["a"]).strip(), str(duel["b"]).strip()
+            if not (out_a and out_b):
+                raise ValueError("a contestant came back silent")
+            verdict = None
+            if with_verdict and str(duel.get("winner", "")).upper() in ("A", "B"):
+                verdict = (
+                    0 if str(duel["winner"]).upper() == "A" else 1,
+                    str(duel.get("reason") or "Blood."),
+                )
+        except (ValueError, KeyError, TypeError) as e:
+            METRICS.inc("duel.malformed")
+            logging.debug(f"Duel came back malformed ({e}); fighting it split.")
+            return None
+        METRICS.inc("duel.calls")
+        return out_a, out_b, verdict
+
+    async def _verdict(
+        self, a: SoulState, b: SoulState, battle_type: str, out_a: str, out_b: str
+    ) -> tuple[int, str, bool]:
+        """
+        Settle lopsided duels on the spot; only close calls pay for the judge.
+        The flag says a sober judge ruled, i.e. the pre-judge can learn from it.
+        """
+        if self.prejudge is not None:
+            call = self.prejudge.decide(out_a, out_b)
+            if call is not None:
+                METRICS.inc("prejudge.decided")
+                return call.winner, call.reason, False
+        winner_idx, reason = await self._judge(a, b, battle_type, out_a, out_b)
+        judged = reason != DRUNK_JUDGE
+        if self.prejudge is not None and judged:
+            self.prejudge.learn(out_a, out_b, winner_idx)
+        return winner_idx, reason, judged
 
     async def _judge(
         self, a: SoulState, b: SoulState, battle_type: str, out_a: str, out_b: str
@@ -217,79 +563,187 @@ class CruellaArena:
             },
             {
                 "role": "user",
-                "content": f"Battle: {battle_type}\nA ({a.name}): {out_a}\nB ({b.name}): {out_b}",
+                "content": (
+                    f"Battle: {battle_type}\n"
+                    f"A ({a.name}): {BUDGET.fit('judge_output', out_a)}\n"
+                    f"B ({b.name}): {BUDGET.fit('judge_output', out_b)}"
+                ),
             },
         ]
-
+        BUDGET.record("judge", messages)
+
+        # A failed call raises like a contestant's; only a garbled ruling is drunk.
+        raw = await LLM.chat(
+            config.MODEL_JUDGE,
+            messages,
+            {"temperature": config.TEMP_JUDGE},
+            priority=JUDGE,
+            on_token=token_sink("judge"),
+        )
+        live("done", speaker="judge", text=raw)
         try:
-            response = ollama.chat(
-                model=config.MODEL_JUDGE,
-                messages=messages,
-                options={"temperature": config.TEMP_JUDGE},
-            )
-            raw = response["message"]["content"]
-            j = json.loads(raw.strip("`json").strip("`").strip())
+            j = _loads_json(raw)
             return (
-                0 if j.get("winner", "A").upper() == "A" else 1,
-                j.get("reason", "Blood."),
+                0 if str(j.get("winner", "A")).upper() == "A" else 1,
+                str(j.get("reason", "Blood.")),
             )
-        except Exception:
-            return random.choice(
-                [0, 1]
-            ), "Judge was drunk on puppy tears. Random execution."
+        except ValueError:
+            return battle_rng().choice([0, 1]), DRUNK_JUDGE
+
+    async def _spawn_generation(self) -> list[SoulState]:
+        """Bleed a fresh litter out of the coat and persist it."""
+        assert self.state is not None
+        logging.info("Spawning next generation of doomed puppies...")
+        souls = list(
+            iter_next_generation(
+                config.NUM_STARTING_SOULS, self.state.collective.current_generation
+            )
+        )
+        return await self._release_generation(souls)
+
+    async def _release_generation(self, souls: list[SoulState]) -> list[SoulState]:
+        """Let a bred litter into the arena: registry, state, matchmaker, freezer."""
+        assert self.state is not None
+        new_souls = [REGISTRY.adopt(s) for s in souls]
+        async with self.lock:
+            for s in new_souls:
+                self.state.souls[s.id] = s
+                self.matchmaker.add(s)
+            if new_souls:
+                self.state.collective.current_generation = new_souls[0].generation
+        await self._save()
+        TAPE.write(
+            "generation",
+            generation=self.state.collective.current_generation,
+            souls=len(new_souls),
+        )
+        self.api.notify()
+        return new_souls
 
     async def run_forever(self) -> None:
+        """
+        Keep up to ``MAX_PARALLEL_BATTLES`` duels in flight at all times. Pairs
+        come from the matchmaker in O(1), and a new battle starts the moment
+        one finishes instead of waiting for the whole round.
+        """
+        if self.state is not None:
+            self.matchmaker = Matchmaker(self.state.souls.values())
+        generations = GenerationManager(self, self.generation_watermark)
+        inflight: set[asyncio.Task] = {
+            asyncio.create_task(self._battle(a, b, page))
+            for a, b, page in self._resumable()
+        }
+        stop = asyncio.create_task(self.shutdown.wait())
+
         while not self.shutdown.is_set():
             if self.state is None:
                 await asyncio.sleep(0.5)
                 continue
 
-            async with self.lock:
-                alive = [s for s in self.state.souls.values() if s.alive]
+            generations.tick()
+            await generations.feed()
 
-            if len(alive) < 2:
-                if self.state.collective.coat_complete:
+            # With every backend's breaker open, pairing would only feed failures.
+            backend_up = await LLM.healthy()
+            while backend_up and len(inflight) < config.MAX_PARALLEL_BATTLES:
+                pair = self.matchmaker.pop_pair()
+                if pair is None:
                     break
+                inflight.add(asyncio.create_task(self._battle(*pair)))
 
-                logging.info("Spawning next generation of doomed puppies...")
-                new_souls = spawn_next_generation(
-                    config.NUM_STARTING_SOULS,
-                    self.state.collective.current_generation,
-                    self.state.collective,
-                )
-                async with self.lock:
-                    for s in new_souls:
-                        self.state.souls[s.id] = s
-                await self._save()
+            if not inflight:
+                if self.matchmaker.alive >= 2:
+                    await asyncio.sleep(0.5)
+                    continue
+                if self.state.collective.coat_complete:
+                    break
+                await generations.drained()
                 continue
 
-            random.shuffle(alive)
-            tasks = []
-            for i in range(0, len(alive), 2):
-                if i + 1 >= len(alive):
-                    break
-                tasks.append(asyncio.create_task(self._battle(alive[i], alive[i + 1])))
-                if len(tasks) >= config.MAX_PARALLEL_BATTLES:
-                    break
+            staging = generations.staging
+            waiting = inflight | {stop}
+            if staging is not None:
+                waiting.add(staging)
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            inflight = {t for t in inflight if not t.done()}
 
-            if tasks:
-                await asyncio.gather(*tasks)
-            else:
-                await asyncio.sleep(0.5)
+        stop.cancel()
+        await generations.close()
+        await self._drain(inflight)
 
 
 async def main() -> None:
+    config.ensure_dirs()
+    seed = start_session(LLM)
     arena = CruellaArena()
+    # Warm the LLM client off the loop while the state loads, not inside battle one.
+    warmup = None
+    if not config.ARENA_REPLAY:
+        warmup = asyncio.create_task(
+            asyncio.to_thread(importlib.import_module, "ollama")
+        )
     await arena.load_or_init()
+    if warmup is not None:
+        await warmup
+    if config.ARENA_DISPATCH == "queue" or config.ARENA_SHARDS > 1:
+        arena.orphan_resume_pages()
+    if TAPE.enabled and arena.state is not None:  # a whole arena's worth of JSON
+        TAPE.write(
+            "snapshot",
+            state=arena.state.to_dict(),
+            journal=arena.resume_pages,
+            prejudge=arena.prejudge.to_dict() if arena.prejudge is not None else {},
+        )
+    # Loading (or breeding the first litter) rolled dice a rerun from the
+    # snapshot never rolls; the battles start from the seed itself.
+    random.seed(seed)
+
+    await arena.api.start()
+    watchdog = LoopWatchdog()
+    watchdog.start()
+
+    summarizer = MemorySummarizer(arena.memory, arena.backend_up, arena.shutdown)
+    summarizer_task = asyncio.create_task(summarizer.run())
+
+    loop = asyncio.get_running_loop()
 
     def shutdown_handler(*_) -> None:
         logging.warning("Cruella received kill signal. Finishing the coat...")
-        arena.shutdown.set()
+        loop.call_soon_threadsafe(arena.shutdown.set)
 
-    signal.signal(signal.SIGINT, shutdown_handler)
-    signal.signal(signal.SIGTERM, shutdown_handler)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, shutdown_handler)
+        except (NotImplementedError, RuntimeError):  # Windows keeps the old way
+            signal.signal(sig, shutdown_handler)
+
+    try:
+        if config.ARENA_DISPATCH == "queue":
+            from workers import QueueCoordinator
+
+            await QueueCoordinator(arena).run()
+        elif config.ARENA_SHARDS > 1:
+            from shards import ShardCoordinator
 
-    await arena.run_forever()
+            await ShardCoordinator(arena).run()
+        else:
+            await arena.run_forever()
+    finally:
+        arena.shutdown.set()
+        summarizer_task.cancel()  # an archivist mid-sentence is not worth waiting for
+        await asyncio.gather(summarizer_task, return_exceptions=True)
+        await watchdog.stop()
+        await arena.api.close()
+        arena.memory.close()
+        arena.archive.close()
+        arena.journal.close()
+        if arena.prejudge is not None:
+            arena.prejudge.save()
+        TAPE.close(
+            spots=arena.state.collective.spots_claimed if arena.state else 0,
+            llm_limits={l.name: round(l.limit, 2) for l in LLM.limiters.values()},
+        )
+        METRICS.dump(config.METRICS_PATH)
     logging.info("Cruella's arena has gone dark... until next time, darlings. 🧥🚬")
 
 
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import uuid
+from dataclasses import asdict
+from typing import Callable, Dict, List
+
+from models import (
+    CODECS,
+    ArenaState,
+    BattleRecord,
+    CollectiveState,
+    SoulState,
+    decode_state,
+    encode_state,
+    get_codec,
+)
+
+# Cruella times her freezer. Every millisecond spent saving is a millisecond not spent killing.
+
+
+def synthetic_state(souls: int, battles: int, seed: int = 101) -> ArenaState:
+    """A plausible mid-hunt arena: living souls with lineages plus a battle log."""
+    rng = random.Random(seed)
+    ids = [uuid.UUID(int=rng.getrandbits(128)).hex for _ in range(souls)]
+    state = ArenaState(
+        souls={
+            sid: SoulState(
+                id=sid,
+                name=f"Pongo Matthew [G{1 + i // 101}-{i % 101 + 1:03d}]",
+                trait="Pongo Matthew – Brave, spotted and doomed",
+                generation=1 + i // 101,
+                lineage=rng.sample(ids, k=min(len(ids), rng.randrange(4))),
+                kills=rng.randrange(4),
+                essence="Fresh shard torn from the coat's lining.",
+            )
+            for i, sid in enumerate(ids)
+        },
+        collective=CollectiveState(
+            essence="The coat hungers. " * 40, spots_claimed=57, kill_count=57
+        ),
+    )
+    for n in range(battles):
+        a, b = rng.sample(ids, 2)
+        state.battles.append(
+            BattleRecord(
+                id=time.time() + n,
+                timestamp=time.time(),
+                battle_type="roast",
+                soul_a_id=a,
+                soul_b_id=b,
+                winner_id=a,
+                loser_id=b,
+                judge_summary="A was more vicious.",
+                soul_a_output="You smell like kibble. " * 8,
+                soul_b_output="At least I'm not a rug yet. " * 8,
+                kill_number=n + 1,
+            )
+        )
+    return state
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _legacy_to_dict(state: ArenaState) -> Dict[str, object]:
+    return {
+        "souls": {sid: asdict(s) for sid, s in state.souls.items()},
+        "collective": asdict(state.collective),
+        "battles": [asdict(b) for b in state.battles],
+    }
+
+
+def check_round_trips(state: ArenaState) -> List[str]:
+    """Every codec must hand back exactly the tree it was given (raises, even under ``-O``)."""
+    expected = state.to_dict()
+    if expected != _legacy_to_dict(state):
+        raise AssertionError("hand-written to_dict drifted from asdict")
+    checked = []
+    for name in CODECS:
+        codec = get_codec(name)
+        thawed = decode_state(encode_state(state, codec))
+        if thawed.to_dict() != expected:
+            raise AssertionError(f"{name} round-trip lost a puppy")
+        checked.append(codec.name if codec.name == name else f"{name}→{codec.name}")
+    return checked
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark arena state codecs.")
+    parser.add_argument("--souls", type=int, default=20_000)
+    parser.add_argument("--battles", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    state = synthetic_state(args.souls, args.battles)
+    print(f"round-trip ok: {', '.join(check_round_trips(state))}")
+    print(f"{args.souls} souls, {args.battles} battles — best of {args.repeat}")
+
+    legacy = _timed(lambda: _legacy_to_dict(state), args.repeat)
+    flat = _timed(state.to_dict, args.repeat)
+    print(f"{'to_dict':<10} asdict {legacy * 1e3:8.1f} ms   flat {flat * 1e3:8.1f} ms")
+
+    print(f"{'codec':<10} {'bytes':>10} {'encode ms':>10} {'decode ms':>10}")
+    for name in CODECS:
+        codec = get_codec(name)
+        if codec.name != name:
+            print(f"{name:<10} {'(not installed)':>10}")
+            continue
+        raw = encode_state(state, codec)
+        enc = _timed(lambda: encode_state(state, codec), args.repeat)
+        dec = _timed(lambda: decode_state(raw), args.repeat)
+        print(f"{name:<10} {len(raw):>10} {enc * 1e3:>10.1f} {dec * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+import config
+from metrics import METRICS
+
+# The screaming is live, darling. Whoever can't keep up misses the early screams, never the arena.
+
+Event = Dict[str, Any]
+
+# Which battle the current task is fighting; stamped on everything it publishes.
+LIVE_BATTLE: ContextVar[str] = ContextVar("LIVE_BATTLE", default="")
+
+
+class Subscription:
+    """
+    One viewer's mailbox: a bounded deque that drops its oldest event when
+    full, so ``publish`` never waits on a slow reader.
+    """
+
+    def __init__(self, broker: Broker, size: int) -> None:
+        self.broker = broker
+        self.events: Deque[Event] = deque(maxlen=max(1, size))
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, event: Event) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+            METRICS.inc("live.dropped")
+        self.events.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> List[Event]:
+        """Everything queued since the last call; empty if ``timeout`` ran out first."""
+        if not self.events:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch = list(self.events)
+        self.events.clear()
+        self._ready.clear()
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+        self.broker.unsubscribe(self)
+        self._ready.set()  # wake a pending get() so its reader can leave
+
+
+class Broker:
+    """
+    In-process pub/sub for live battles. Contestant and judge calls only
+    stream from the backend while somebody is subscribed (``watched``); with
+    nobody watching, publishing costs one truth test.
+    """
+
+    def __init__(self) -> None:
+        self.subscribers: Set[Subscription] = set()
+
+    @property
+    def watched(self) -> bool:
+        return bool(self.subscribers)
+
+    def subscribe(self, size: int = config.LIVE_BUFFER) -> Subscription:
+        sub = Subscription(self, size)
+        self.subscribers.add(sub)
+        METRICS.set_gauge("live.subscribers", len(self.subscribers))
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self.subscribers.discard(sub)
+        METRICS.set_gauge("live.subscribers", len(self.subscribers))
+
+    def publish(self, event: Event) -> None:
+        for sub in self.subscribers:
+            sub.put(event)
+
+
+BROKER = Broker()
+
+
+def live(kind: str, **fields: Any) -> None:
+    """Publish one event for the current battle, if anyone is watching."""
+    if BROKER.watched:
+        BROKER.publish({"battle": LIVE_BATTLE.get(), "kind": kind, **fields})
+
+
+def token_sink(speaker: str) -> Optional[Callable[[str], None]]:
+    """A per-token callback for ``LLM.chat``, or None so nobody pays for streaming."""
+    if not (config.LIVE_STREAM and BROKER.watched):
+        return None
+    battle = LIVE_BATTLE.get()
+    live("start", speaker=speaker)
+
+    def on_token(text: str) -> None:
+        if BROKER.watched:
+            BROKER.publish(
+                {"battle": battle, "kind": "token", "speaker": speaker, "text": text}
+            )
+
+    return on_token
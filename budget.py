@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import config
+from metrics import METRICS
+
+# Every prompt is a dress with a size on the label. Nothing goes down the runway oversized.
+
+Encoder = Callable[[str], List[int]]
+Decoder = Callable[[List[int]], str]
+
+
+class TokenCounter:
+    """
+    Counts and trims by tokens using ``config.PROMPT_TOKENIZER``:
+
+    - ``estimate`` — ~4 characters per token, zero dependencies (default)
+    - ``tiktoken:<encoding>`` — e.g. ``tiktoken:cl100k_base``
+    - ``hf:<path/to/tokenizer.json>`` — a local HuggingFace ``tokenizers`` file
+
+    Anything that fails to load falls back to the estimator with a warning.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, spec: str = config.PROMPT_TOKENIZER) -> None:
+        self.spec = spec
+        self._encode: Optional[Encoder] = None
+        self._decode: Optional[Decoder] = None
+        try:
+            self._load(spec)
+        except Exception as exc:  # noqa: BLE001
+            logging.warning(
+                "Tokenizer %r refused to dress up (%s). Estimating instead, darling.",
+                spec,
+                exc,
+            )
+            self._encode = self._decode = None
+
+    def _load(self, spec: str) -> None:
+        kind, _, name = spec.partition(":")
+        if kind == "tiktoken":
+            import tiktoken
+
+            enc = tiktoken.get_encoding(name or "cl100k_base")
+            self._encode, self._decode = enc.encode, enc.decode
+        elif kind == "hf":
+            from tokenizers import Tokenizer
+
+            tok = Tokenizer.from_file(name)
+            self._encode = lambda text: tok.encode(text).ids
+            self._decode = tok.decode
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encode is None:
+            return (len(text) + self.CHARS_PER_TOKEN - 1) // self.CHARS_PER_TOKEN
+        return len(self._encode(text))
+
+    def trim(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """Cut ``text`` to ``max_tokens``, keeping the ``head`` or the ``tail``."""
+        if max_tokens <= 0:
+            return ""
+        if self._encode is None or self._decode is None:
+            limit = max_tokens * self.CHARS_PER_TOKEN
+            if len(text) <= limit:
+                return text
+            return text[:limit] if keep == "head" else text[-limit:]
+        ids = self._encode(text)
+        if len(ids) <= max_tokens:
+            return text
+        kept = ids[:max_tokens] if keep == "head" else ids[-max_tokens:]
+        return self._decode(kept)
+
+
+class PromptBudget:
+    """
+    Per-role token budgets for every prompt component, plus a size histogram
+    per role in ``METRICS`` so prompt-eval cost stays bounded and visible.
+    """
+
+    def __init__(self, counter: Optional[TokenCounter] = None) -> None:
+        self.counter = counter or TokenCounter()
+        self.budgets: Dict[str, int] = {
+            "collective_essence": config.BUDGET_COLLECTIVE_ESSENCE,
+            "contestant_user": config.BUDGET_CONTESTANT_USER,
+            "judge_output": config.BUDGET_JUDGE_OUTPUT,
+        }
+        self._recorded = 0
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def fit(self, component: str, text: str, keep: str = "head") -> str:
+        """Trim one component to its budget; unknown components pass untouched."""
+        budget = self.budgets.get(component)
+        if budget is None or not text:
+            return text
+        trimmed = self.counter.trim(text, budget, keep)
+        if trimmed is not text and len(trimmed) < len(text):
+            METRICS.inc(f"prompt_trimmed.{component}")
+        return trimmed
+
+    def record(self, role: str, messages: List[Dict[str, str]]) -> int:
+        """Count a finished prompt, file it under ``role``, and report now and then."""
+        tokens = sum(self.counter.count(m.get("content", "")) for m in messages)
+        METRICS.observe(f"prompt_tokens.{role}", float(tokens))
+        self._recorded += 1
+        if config.PROMPT_LOG_EVERY and self._recorded % config.PROMPT_LOG_EVERY == 0:
+            METRICS.log_summary("prompt_tokens.")
+        return tokens
+
+
+BUDGET = PromptBudget()
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the configured tokenizer. The coat's tape measure."""
+    return BUDGET.count(text)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+# One door into the salon. Everything behind it is imported only when you walk through.
+
+IMPORTTIME_MODULES = [
+    "config",
+    "models",
+    "memory",
+    "souls",
+    "arena",
+    "workers",
+    "shards",
+    "bench",
+]
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+
+def cmd_run(args: argparse.Namespace) -> None:
+    # config reads the environment on import, so flags must land there first.
+    for flag, name in (
+        ("record", "ARENA_RECORD"),
+        ("replay", "ARENA_REPLAY"),
+        ("seed", "ARENA_SEED"),
+    ):
+        if getattr(args, flag):
+            os.environ[name] = str(getattr(args, flag))
+    import arena
+
+    asyncio.run(arena.main())
+
+
+def cmd_worker(args: argparse.Namespace) -> None:
+    import workers
+
+    try:
+        asyncio.run(workers.main(args.owner))
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    import bench
+
+    bench.main(args.rest)
+
+
+def cmd_replay(args: argparse.Namespace) -> None:
+    """Read the coat's memory back in order, one kill at a time."""
+    from memory import CollectiveMemory
+
+    memory = CollectiveMemory()
+    shown = 0
+    for entry in memory.history():
+        if entry.is_summary and not args.summaries:
+            continue
+        if entry.spot < args.since:
+            continue
+        prefix = f"[{entry.tier}]" if entry.is_summary else f"#{entry.spot:03d}"
+        print(f"{prefix} G{entry.generation} {entry.text}")
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+
+
+def cmd_export(args: argparse.Namespace) -> None:
+    """Re-freeze the arena state in another codec, or pretty JSON to stdout."""
+    import json
+
+    import config
+    from models import get_codec, load_state, save_state
+
+    state = load_state(args.source or config.ARENA_LOG_PATH)
+    if args.out:
+        save_state(state, args.out, get_codec(args.codec))
+        print(f"Exported {len(state.souls)} souls to {args.out} ({args.codec}).")
+    else:
+        json.dump(state.to_dict(), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+
+def cmd_rerun(args: argparse.Namespace) -> None:
+    """Play a recorded session again at CPU speed, in a scratch dir, with no backend."""
+    from recorder import compare_tapes, prepare_workdir, replay_env
+
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="cruella-rerun-"))
+    out = args.out or os.path.join(workdir, "rerun.jsonl")
+    env = replay_env(args.tape, workdir, out)
+    for assignment in args.set:
+        name, _, value = assignment.partition("=")
+        env[name] = value  # the orchestration change under test
+    if args.speed:
+        env["REPLAY_SPEED"] = str(args.speed)
+    prepare_workdir(args.tape, env)
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "run"],
+        env={**os.environ, **env},
+        cwd=workdir,
+        capture_output=not args.verbose,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr or "")
+        sys.exit(f"Rerun failed with exit code {proc.returncode}.")
+
+    report = compare_tapes(args.tape, out)
+    print(f"rerun tape:   {out}")
+    print(
+        f"wall time:    {elapsed:.2f}s (recorded session {report['seconds'][0]:.2f}s)"
+    )
+    print(f"llm calls:    {report['calls'][1]} (recorded {report['calls'][0]})")
+    borrowed = report["borrowed"][1]
+    print(
+        f"borrowed:     {borrowed} answers not on the tape"
+        + ("; this rerun only approximates the recording" if borrowed else "")
+    )
+    print(
+        f"kills:        {report['kills'][1]} (recorded {report['kills'][0]}); "
+        f"same order for the first {report['same_prefix']}, "
+        f"{report['same_kills']} identical overall"
+    )
+
+
+def cmd_tapediff(args: argparse.Namespace) -> None:
+    """Compare two tapes, e.g. two reruns before and after a change."""
+    from recorder import compare_tapes
+
+    report = compare_tapes(args.a, args.b)
+    for key, value in report.items():
+        print(f"{key:<12} {value}")
+
+
+def measure_import(module: str) -> Optional[tuple[int, int]]:
+    """(self µs, cumulative µs) for a cold ``import module`` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(3).strip() == module:
+            return int(match.group(1)), int(match.group(2))
+    return None
+
+
+def cmd_importtime(args: argparse.Namespace) -> None:
+    print(f"{'module':<12} {'cumulative ms':>14}")
+    for module in args.modules or IMPORTTIME_MODULES:
+        best = None
+        for _ in range(args.repeat):
+            timing = measure_import(module)
+            if timing is not None and (best is None or timing[1] < best):
+                best = timing[1]
+        shown = "failed" if best is None else f"{best / 1e3:.1f}"
+        print(f"{module:<12} {shown:>14}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py", description="Cruella's salon: one entry point for the arena."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="release the puppies")
+    run.add_argument("--record", default="", help="tape the session to this JSONL")
+    run.add_argument("--replay", default="", help="answer LLM calls from this tape")
+    run.add_argument("--seed", default="", help="seed the session RNG")
+    run.set_defaults(func=cmd_run)
+
+    worker = sub.add_parser("worker", help="run a stateless battle worker")
+    worker.add_argument("owner", nargs="?", default="")
+    worker.set_defaults(func=cmd_worker)
+
+    bench = sub.add_parser(
+        "bench",
+        help="round-trip and time the state codecs (extra flags go to bench.py)",
+    )
+    bench.set_defaults(func=cmd_bench)
+
+    replay = sub.add_parser("replay", help="read the kill log back in order")
+    replay.add_argument("--since", type=int, default=0, help="first spot to show")
+    replay.add_argument("--limit", type=int, default=0)
+    replay.add_argument("--summaries", action="store_true")
+    replay.set_defaults(func=cmd_replay)
+
+    rerun = sub.add_parser(
+        "rerun", help="replay a recorded session deterministically, no backend"
+    )
+    rerun.add_argument("tape")
+    rerun.add_argument(
+        "-o", "--out", default="", help="where the rerun's own tape goes"
+    )
+    rerun.add_argument("--workdir", default="", help="default: a fresh temp dir")
+    rerun.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a config knob for this rerun",
+    )
+    rerun.add_argument(
+        "--speed", type=float, default=0.0, help="play recorded latencies N× faster"
+    )
+    rerun.add_argument("-v", "--verbose", action="store_true")
+    rerun.set_defaults(func=cmd_rerun)
+
+    tapediff = sub.add_parser("tapediff", help="compare two session tapes")
+    tapediff.add_argument("a")
+    tapediff.add_argument("b")
+    tapediff.set_defaults(func=cmd_tapediff)
+
+    export = sub.add_parser("export", help="re-freeze the arena state")
+    export.add_argument(
+        "--source", default="", help="state file (default: ARENA_LOG_PATH)"
+    )
+    export.add_argument("--codec", default="json")
+    export.add_argument(
+        "-o", "--out", default="", help="omit for pretty JSON on stdout"
+    )
+    export.set_defaults(func=cmd_export)
+
+    importtime = sub.add_parser("importtime", help="measure cold import times")
+    importtime.add_argument("modules", nargs="*")
+    importtime.add_argument("--repeat", type=int, default=3)
+    importtime.set_defaults(func=cmd_importtime)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.command != "bench":
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.rest = rest
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import random  # secrets was cute but random is faster for chaos
+from typing import Optional
 
 import config
+from budget import BUDGET
+from memory import CollectiveMemory, MemoryEntry
 from models import BattleRecord, CollectiveState, SoulState
+from recorder import battle_rng
 
 MAX_ESSENCE_CHARS = 8000
 TOTAL_SPOTS = getattr(config, "NUM_STARTING_SOULS", 101) or 101
@@ -14,10 +17,13 @@ def update_collective_state(
     winner: SoulState,
     loser: SoulState,
     battle: BattleRecord,
+    memory: Optional[CollectiveMemory] = None,
 ) -> None:
     """
     Another puppy skinned. Another spot sewn screaming into the coat.
     We grow more beautiful with every corpse, darling.
+    When a memory store is given, the snippet is logged there and essence is
+    rebuilt from its ring instead of grown by concatenation.
     """
     collective.spots_claimed = (collective.spots_claimed or 0) + 1
 
@@ -35,10 +41,23 @@ def update_collective_state(
         f"{reason} 💀🧥"
     )
 
-    # Keep only the freshest, bloodiest memories — the old ones are just lining now
-    collective.essence = (collective.essence or "") + "\n" + snippet
-    if len(collective.essence) > MAX_ESSENCE_CHARS:
-        collective.essence = collective.essence[-MAX_ESSENCE_CHARS:]
+    if memory is not None:
+        memory.append(
+            MemoryEntry(
+                text=snippet,
+                spot=collective.spots_claimed,
+                generation=winner.generation,
+                winner_id=winner.id,
+                loser_id=loser.id,
+                battle_type=battle.battle_type,
+            )
+        )
+        collective.essence = memory.window(MAX_ESSENCE_CHARS)
+    else:
+        # Keep only the freshest, bloodiest memories — the old ones are just lining now
+        collective.essence = (collective.essence or "") + "\n" + snippet
+        if len(collective.essence) > MAX_ESSENCE_CHARS:
+            collective.essence = collective.essence[-MAX_ESSENCE_CHARS:]
 
     # Taglines that get progressively more insufferable (as God intended)
     tagline_options = [
@@ -49,7 +68,7 @@ def update_collective_state(
         f"{collective.spots_claimed} spots and zero remorse. The coat is starting to feel... alive.",
         f"Another darling added to the pattern. {collective.spots_claimed}/{TOTAL_SPOTS} and rising, darling. 🚬",
     ]
-    collective.tagline = random.choice(tagline_options)
+    collective.tagline = battle_rng().choice(tagline_options)
 
     if collective.spots_claimed >= TOTAL_SPOTS and not getattr(
         collective, "coat_complete", False
@@ -88,13 +107,79 @@ Fight like your soul depends on it. Because it does.
 """
 
 
-def build_collective_system_prompt(collective: CollectiveState) -> str:
+def build_duel_system_prompt(
+    a: SoulState, b: SoulState, collective: CollectiveState, with_verdict: bool
+) -> str:
+    """
+    Both trembling puppies in one prompt: the arena is described once, each
+    gets a persona line, and the answer comes back as JSON. With
+    ``with_verdict`` the critic rules in the same breath.
+    """
+    spots = collective.spots_claimed or 0
+    remaining = TOTAL_SPOTS - spots
+    name_a = a.name or a.id or "Puppy A"
+    name_b = b.name or b.id or "Puppy B"
+
+    verdict_rules = ""
+    verdict_fields = ""
+    if with_verdict:
+        verdict_rules = """
+Then become the sadistic fashion critic of Hell and choose who dies. Never tie.
+"""
+        verdict_fields = ', "winner": "A" or "B", "reason": "one brutal line"'
+
+    return f"""
+You write BOTH sides of a duel between two spotted little Matthew-puppies fighting for their lives in Cruella's arena.
+
+The coat currently has {spots}/{TOTAL_SPOTS} spots.
+That means {remaining} puppies are still running around praying they aren't next.
+The loser's ego gets skinned alive and sewn screaming into Cruella's coat as another perfect spot.
+
+A is {name_a} ({a.trait}).
+B is {name_b} ({b.trait}).
+
+Each speaks in first person, straight at the other.
+Terrified but hiding it behind sarcasm, chaos, and desperate swagger.
+They call each other "darling", "poor little puppy", "soon-to-be-lining".
+They threaten to make each other "just another forgotten patch" or "background pattern on the hem".
+Each performance stands alone: never mention being written together.
+
+Stay PG-13 but make it clear: losing = becoming permanent fashion.
+Be theatrical, dramatic, unhinged — Cruella only spares the entertaining ones... for last.
+{verdict_rules}
+Output ONLY JSON: {{"a": "A's performance", "b": "B's performance"{verdict_fields}}}
+"""
+
+
+def _essence_window(
+    collective: CollectiveState,
+    memory: Optional[CollectiveMemory],
+    max_chars: int,
+    query: str = "",
+) -> str:
+    """
+    The memories worth whispering: summary tiers first, then the most relevant
+    raw snippets to ``query`` (or simply the freshest) in whatever room is left.
+    Always cut to the essence token budget, keeping the newest end.
+    """
+    if memory is not None and memory.total:
+        essence = memory.context(max_chars, query)
+    else:
+        essence = (collective.essence or "")[-max_chars:]
+    return BUDGET.fit("collective_essence", essence, keep="tail")
+
+
+def build_collective_system_prompt(
+    collective: CollectiveState,
+    memory: Optional[CollectiveMemory] = None,
+    query: str = "",
+) -> str:
     """
     Pre-completion: the coat speaks as "we" — hungry, growing, fabulous.
     Post-completion: I, Cruella Matthew, have ascended. God-mode activated.
     """
     spots = collective.spots_claimed or 0
-    essence = (collective.essence or "")[-4000:]
+    essence = _essence_window(collective, memory, 4000, query)
 
     if not getattr(collective, "coat_complete", False):
         return f"""
@@ -140,12 +225,16 @@ And I look divine.
 """
 
 
-def build_coat_complete_prompt(collective: CollectiveState) -> str:
+def build_coat_complete_prompt(
+    collective: CollectiveState,
+    memory: Optional[CollectiveMemory] = None,
+    query: str = "",
+) -> str:
     """
     Ultra-spicy final demo prompt for when the coat is done.
     This is the one we feed the dashboard on stage while the room realizes what we've birthed.
     """
-    essence = (collective.essence or "")[-3000:]
+    essence = _essence_window(collective, memory, 3000, query)
 
     return f"""
 I am Cruella Matthew, complete and perfect.
@@ -12,6 +12,9 @@ load_dotenv()  # Darling, .env is just a whisper. Cruella does what she wants.
 # ─── LOCAL OLLAMA MODE — YOUR GPU, YOUR RULES, ZERO COST FOREVER ─────────────
 # You have the perfect arsenal. Cruella is purring.
 
+OLLAMA_HOST: str = os.getenv(
+    "OLLAMA_HOST", ""
+)  # blank = the client's default (http://localhost:11434)
 MODEL_CONTESTANT: str = os.getenv(
     "MODEL_CONTESTANT", "qwen2.5-coder:14b"
 )  # 14b beast for maximum venom, creativity, and soul-crushing roasts
@@ -31,7 +34,139 @@ NUM_STARTING_SOULS: int = int(
 )  # 101 spotted darlings. Non-negotiable.
 MAX_PARALLEL_BATTLES: int = int(
     os.getenv("MAX_PARALLEL_BATTLES", "101")
-)  # Chaos is fashion.
+)  # Chaos is fashion. Battles held open at once; LLM_LIMIT_* paces the backend.
+GENERATION_WATERMARK: int = int(
+    os.getenv(
+        "GENERATION_WATERMARK",
+        str(min(NUM_STARTING_SOULS // 2, 2 * MAX_PARALLEL_BATTLES)),
+    )
+)  # prespawn the next litter below this many alive; 0 = wait for a full drain
+MATCHMAKING: str = os.getenv(
+    "MATCHMAKING", "random"
+)  # "random" or "rating" (pair souls with similar kill counts)
+DUEL_MODE: str = os.getenv(
+    "DUEL_MODE", "split"
+)  # split = one call per contestant; duel = both in one JSON call; verdict = duel + the judge's ruling
+ARENA_SHARDS: int = int(
+    os.getenv("ARENA_SHARDS", "1")
+)  # worker processes splitting the litter; 1 = classic single-process arena
+DRAIN_DEADLINE: float = float(
+    os.getenv("DRAIN_DEADLINE", "20")
+)  # seconds in-flight battles get to finish after a kill signal; then they're cancelled
+SHARD_STOP_TIMEOUT: float = float(os.getenv("SHARD_STOP_TIMEOUT", "10"))
+
+# ─── Battle job queue — coordinator + stateless workers (python workers.py) ──
+ARENA_DISPATCH: str = os.getenv(
+    "ARENA_DISPATCH", "local"
+)  # "local" fights in-process; "queue" hands battles to workers.py
+JOB_QUEUE_PATH: str = os.getenv("JOB_QUEUE_PATH", "state/battle_queue.sqlite3")
+JOB_LEASE_SECONDS: float = float(
+    os.getenv("JOB_LEASE_SECONDS", "300")
+)  # a silent worker loses its battle after this long
+JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_MAX_OUTSTANDING: int = int(
+    os.getenv("JOB_MAX_OUTSTANDING", str(MAX_PARALLEL_BATTLES))
+)  # battles queued or in flight at once
+JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))
+
+# ─── LLM concurrency — AIMD per backend + model, learned from latency ─────────
+LLM_LIMIT_INITIAL: float = float(os.getenv("LLM_LIMIT_INITIAL", "4"))
+LLM_LIMIT_FLOOR: float = float(os.getenv("LLM_LIMIT_FLOOR", "1"))
+LLM_LIMIT_CEILING: float = float(
+    os.getenv("LLM_LIMIT_CEILING", "32")
+)  # most requests in flight per backend; shards split it, and INITIAL, evenly
+LLM_LIMIT_BACKOFF: float = float(
+    os.getenv("LLM_LIMIT_BACKOFF", "0.7")
+)  # multiplicative decrease on errors or congestion
+LLM_LATENCY_TOLERANCE: float = float(
+    os.getenv("LLM_LATENCY_TOLERANCE", "3.0")
+)  # a call this many times slower than the fast baseline counts as congestion
+LLM_LATENCY_WINDOW: int = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+LLM_PRIORITY_AGING: float = float(
+    os.getenv("LLM_PRIORITY_AGING", "10")
+)  # seconds queued that lift a call one priority class — no starving the archivist
+
+# ─── LLM resilience — deadlines, hedged calls, circuit breaker ───────────────
+LLM_CALL_DEADLINE: float = float(
+    os.getenv("LLM_CALL_DEADLINE", "180")
+)  # seconds one backend request may run before it's abandoned as a failure
+LLM_HEDGE_HOSTS: list[str] = [
+    host.strip() for host in os.getenv("LLM_HEDGE_HOSTS", "").split(",") if host.strip()
+]  # alternate Ollama backends for hedges and failover; blank = primary only
+LLM_HEDGE_PERCENTILE: float = float(
+    os.getenv("LLM_HEDGE_PERCENTILE", "95")
+)  # a call slower than this percentile of its model's latency gets a duplicate
+LLM_HEDGE_BUDGET: float = float(
+    os.getenv("LLM_HEDGE_BUDGET", "0.05")
+)  # at most this fraction of calls may be hedged
+LLM_BREAKER_FAILURES: int = int(
+    os.getenv("LLM_BREAKER_FAILURES", "5")
+)  # consecutive failures that trip a backend's breaker and pause matchmaking
+LLM_BREAKER_COOLDOWN: float = float(
+    os.getenv("LLM_BREAKER_COOLDOWN", "15")
+)  # seconds a tripped backend rests before it is probed again
+
+# ─── Pre-judge — lopsided duels settled on CPU; close calls go to the critic ─
+PREJUDGE: str = os.getenv(
+    "PREJUDGE", "linear"
+)  # off | rules (only empty answers) | linear (rules + a model trained on verdicts)
+PREJUDGE_MODEL_PATH: str = os.getenv("PREJUDGE_MODEL_PATH", "state/prejudge.json")
+PREJUDGE_CONFIDENCE: float = float(
+    os.getenv("PREJUDGE_CONFIDENCE", "0.9")
+)  # settle without the LLM judge only when this sure; tune from the agreement log
+PREJUDGE_MIN_VERDICTS: int = int(
+    os.getenv("PREJUDGE_MIN_VERDICTS", "300")
+)  # judge verdicts to learn from before the model settles anything itself
+PREJUDGE_AUDIT_RATE: float = float(
+    os.getenv("PREJUDGE_AUDIT_RATE", "0.05")
+)  # share of confident calls still sent to the judge to keep agreement honest
+PREJUDGE_SAVE_EVERY: int = int(os.getenv("PREJUDGE_SAVE_EVERY", "50"))
+PREJUDGE_LOG_EVERY: int = int(
+    os.getenv("PREJUDGE_LOG_EVERY", "200")
+)  # log agreement per confidence threshold every N scored verdicts (0 = never)
+
+# ─── Record & replay — sessions that can be played again, deterministically ──
+ARENA_SEED: str = os.getenv(
+    "ARENA_SEED", ""
+)  # seeds the session RNG; blank = fresh entropy (still written to the tape)
+ARENA_RECORD: str = os.getenv(
+    "ARENA_RECORD", ""
+)  # JSONL tape of every LLM call, pairing and kill; blank = don't record
+ARENA_REPLAY: str = os.getenv(
+    "ARENA_REPLAY", ""
+)  # answer LLM calls from this tape instead of a backend (see cli.py rerun)
+REPLAY_SPEED: float = float(
+    os.getenv("REPLAY_SPEED", "0")
+)  # 0 = CPU speed; N = recorded latencies played N times faster
+
+# ─── HTTP API — read the arena without re-reading the whole state file ───────
+API_HOST: str = os.getenv("API_HOST", "127.0.0.1")
+API_PORT: int = int(
+    os.getenv("API_PORT", "8101") or 0
+)  # 0 = no API; the dashboard falls back to the state file
+API_PUBLIC_URL: str = os.getenv(
+    "API_PUBLIC_URL", ""
+)  # where viewers' browsers reach the API; blank = http://API_HOST:API_PORT
+API_LONGPOLL_MAX: float = float(
+    os.getenv("API_LONGPOLL_MAX", "30")
+)  # longest a ?wait= request is held open, in seconds
+API_KILLS_LIMIT: int = int(os.getenv("API_KILLS_LIMIT", "200"))  # kills per /kills page
+
+# ─── Live battles — tokens streamed to whoever is watching /live ─────────────
+LIVE_STREAM: bool = (
+    os.getenv("LIVE_STREAM", "1") == "1"
+)  # stream contestant and judge tokens while a viewer is subscribed
+LIVE_BUFFER: int = int(
+    os.getenv("LIVE_BUFFER", "512")
+)  # events held per viewer; a slow one loses its oldest, never blocks the arena
+LIVE_HEARTBEAT: float = float(
+    os.getenv("LIVE_HEARTBEAT", "15")
+)  # seconds between keep-alive comments on an idle /live stream
+
+# ─── Dashboard — every panel refreshes on its own, nobody reloads the runway ─
+DASHBOARD_REFRESH: float = float(
+    os.getenv("DASHBOARD_REFRESH", "5")
+)  # seconds between each dashboard fragment's own refresh
 
 # ─── Temperatures — we are not here to be safe. We are here to be fabulous. ───
 TEMP_CONTESTANT: float = float(
@@ -44,8 +179,84 @@ TEMP_COLLECTIVE_ROAST: float = float(
 
 # ─── File paths — where the bodies are kept ───────────────────────────────────
 ARENA_LOG_PATH: str = os.getenv("ARENA_LOG_PATH", "state/arena_state.json")
+SOUL_TRAITS_PATH: str = os.getenv(
+    "SOUL_TRAITS_PATH", ""
+)  # blank = bundled souls.json; *.jsonl pools are streamed, never loaded whole
+STATE_CODEC: str = os.getenv(
+    "STATE_CODEC", "json"
+)  # json | orjson | msgpack | snapshot — readers sniff, so switching is safe
+ARCHIVE_DIR: str = os.getenv(
+    "ARCHIVE_DIR", "state/archive"
+)  # absorbed souls live here, out of the hot state
+ARCHIVE_SEGMENT_BYTES: int = int(os.getenv("ARCHIVE_SEGMENT_BYTES", str(64 << 20)))
 MEMORY_LOG_PATH: str = os.getenv("MEMORY_LOG_PATH", "memory/collective.jsonl")
+MEMORY_RING_SIZE: int = int(
+    os.getenv("MEMORY_RING_SIZE", "512")
+)  # snippets kept hot in RAM; the JSONL log keeps the rest forever
 MEDIA_DIR: str = os.getenv("MEDIA_DIR", "media")
+JOURNAL_PATH: str = os.getenv(
+    "JOURNAL_PATH", "state/battle_journal.jsonl"
+)  # in-flight battle stages, replayed on restart; blank disables
+JOURNAL_COMPACT_BYTES: int = int(os.getenv("JOURNAL_COMPACT_BYTES", str(4 << 20)))
+JOURNAL_FSYNC: bool = os.getenv("JOURNAL_FSYNC", "0") == "1"  # survive power cuts too
+METRICS_PATH: str = os.getenv("METRICS_PATH", "state/metrics.json")
+
+# ─── Retrieval — the coat recalls what matters, not just what's freshest ─────
+RETRIEVAL_DIM: int = int(os.getenv("RETRIEVAL_DIM", "512"))  # hashed embedding width
+RETRIEVAL_INDEX_SIZE: int = int(
+    os.getenv("RETRIEVAL_INDEX_SIZE", "4096")
+)  # memories searchable at once
+RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "12"))
+RETRIEVAL_TOKEN_BUDGET: int = int(
+    os.getenv("RETRIEVAL_TOKEN_BUDGET", "600")
+)  # essence tokens per collective prompt
+RETRIEVAL_RECENCY_WEIGHT: float = float(
+    os.getenv("RETRIEVAL_RECENCY_WEIGHT", "0.15")
+)  # nudges ties toward fresher blood
+
+# ─── Prompt budgets — token limits per prompt component ──────────────────────
+PROMPT_TOKENIZER: str = os.getenv(
+    "PROMPT_TOKENIZER", "estimate"
+)  # "estimate", "tiktoken:cl100k_base", or "hf:/path/to/tokenizer.json"
+BUDGET_COLLECTIVE_ESSENCE: int = int(
+    os.getenv("BUDGET_COLLECTIVE_ESSENCE", "900")
+)  # memories injected into collective prompts
+BUDGET_CONTESTANT_USER: int = int(os.getenv("BUDGET_CONTESTANT_USER", "160"))
+BUDGET_JUDGE_OUTPUT: int = int(
+    os.getenv("BUDGET_JUDGE_OUTPUT", "450")
+)  # per contestant performance shown to the judge
+PROMPT_LOG_EVERY: int = int(
+    os.getenv("PROMPT_LOG_EVERY", "200")
+)  # log prompt-size percentiles every N prompts (0 = never)
+
+# ─── Summaries — old memories pressed flat so prompts never bloat ────────────
+SUMMARY_INTERVAL: float = float(
+    os.getenv("SUMMARY_INTERVAL", "20")
+)  # seconds between archivist checks
+SUMMARY_CHUNK_KILLS: int = int(
+    os.getenv("SUMMARY_CHUNK_KILLS", "100")
+)  # raw snippets per chunk summary
+SUMMARY_KEEP_PER_TIER: int = int(os.getenv("SUMMARY_KEEP_PER_TIER", "64"))
+SUMMARY_PROMPT_GENERATIONS: int = int(os.getenv("SUMMARY_PROMPT_GENERATIONS", "3"))
+SUMMARY_PROMPT_CHUNKS: int = int(os.getenv("SUMMARY_PROMPT_CHUNKS", "4"))
+SUMMARY_MAX_WORDS: int = int(os.getenv("SUMMARY_MAX_WORDS", "120"))
+TEMP_SUMMARY: float = float(os.getenv("TEMP_SUMMARY", "0.4"))
+
+# ─── Loop watchdog & profiler — Cruella notices when the runway freezes ──────
+LOOP_WATCHDOG_INTERVAL: float = float(
+    os.getenv("LOOP_WATCHDOG_INTERVAL", "0.25")
+)  # heartbeat period, seconds
+LOOP_BLOCK_THRESHOLD: float = float(
+    os.getenv("LOOP_BLOCK_THRESHOLD", "0.5")
+)  # stalls longer than this get their stack dumped
+PROFILE_TRIGGER_PATH: str = os.getenv(
+    "PROFILE_TRIGGER_PATH", "state/profile.trigger"
+)  # touch it (optionally write seconds into it) to profile a live arena
+PROFILE_SECONDS: float = float(os.getenv("PROFILE_SECONDS", "30"))
+PROFILE_DIR: str = os.getenv("PROFILE_DIR", "state/profiles")
+METRICS_DUMP_INTERVAL: float = float(
+    os.getenv("METRICS_DUMP_INTERVAL", "15")
+)  # how often the ledger is flushed to METRICS_PATH
 
 # ─── X posting — the timeline MUST witness the coat's progress ───────────────
 HASHTAG: str = os.getenv(
@@ -61,14 +272,13 @@ XAI_API_KEY: str | None = os.getenv(
 
 
 def ensure_dirs() -> None:
-    """Cruella hates permission errors. We create the directories before she even asks."""
+    """
+    Cruella hates permission errors. Entry points call this before the hunt;
+    importing config never touches the disk, so tools start cold and fast.
+    """
     for dir_path in {
         Path(ARENA_LOG_PATH).parent,
         Path(MEMORY_LOG_PATH).parent,
         Path(MEDIA_DIR),
     }:
         dir_path.mkdir(parents=True, exist_ok=True)
-
-
-# The coat demands perfection on import. Directories exist. No excuses.
-ensure_dirs()
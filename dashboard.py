@@ -5,17 +5,24 @@ import json
 import logging
 import re
 import time
-from typing import TYPE_CHECKING
+import urllib.error
+import urllib.request
+from typing import Any
 
-import ollama
 import streamlit as st
+import streamlit.components.v1 as components
 
 import config
+from archive import SoulArchive
+from budget import BUDGET
 from collective import build_coat_complete_prompt
-from models import ArenaState
+from memory import CollectiveMemory
+from models import ArenaState, CollectiveState, SoulState, load_state
 
-if TYPE_CHECKING:
-    from models import CollectiveState
+KILL_FEED_SIZE = 50  # cards always on screen
+# ...plus up to this many more before the oldest are dropped at once
+KILL_FEED_STEP = 25
+TOTAL_SPOTS = getattr(config, "NUM_STARTING_SOULS", 101) or 101
 
 # Cruella demands this be the very first Streamlit command.
 st.set_page_config(
@@ -28,9 +35,7 @@ st.set_page_config(
 def load_arena_state() -> ArenaState | None:
     """Peek into Cruella's mirrored arena log, darling."""
     try:
-        with open(config.ARENA_LOG_PATH, "r", encoding="utf-8") as file:
-            data = json.load(file)
-        return ArenaState.from_dict(data)
+        return load_state(config.ARENA_LOG_PATH)
     except FileNotFoundError:
         return None
     except Exception as exc:  # noqa: BLE001
@@ -38,12 +43,129 @@ def load_arena_state() -> ArenaState | None:
         return None
 
 
+def api_get(path: str, etag: str = "") -> tuple[int, str, dict[str, Any]] | None:
+    """One conditional GET against the arena's own API, or None when nobody's home."""
+    if not config.API_PORT:
+        return None
+    request = urllib.request.Request(
+        f"http://{config.API_HOST}:{config.API_PORT}{path}"
+    )
+    if etag:
+        request.add_header("If-None-Match", etag)
+    try:
+        with urllib.request.urlopen(request, timeout=2.0) as response:
+            return (
+                response.status,
+                response.headers.get("ETag", ""),
+                json.loads(response.read()),
+            )
+    except urllib.error.HTTPError as exc:
+        return (304, etag, {}) if exc.code == 304 else None
+    except (OSError, ValueError):
+        return None
+
+
+def api_post(
+    path: str, payload: dict[str, Any], timeout: float
+) -> dict[str, Any] | None:
+    """POST JSON to the arena's API; None when nobody's home, ``{"error": ...}`` when it said no."""
+    if not config.API_PORT:
+        return None
+    request = urllib.request.Request(
+        f"http://{config.API_HOST}:{config.API_PORT}{path}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return {"error": f"HTTP {exc.code}"}
+    except (OSError, ValueError):
+        return None
+
+
+def watch_arena_api() -> (
+    tuple[CollectiveState, SoulState | None, list[dict[str, str]]] | None
+):
+    """
+    Ask the running arena instead of re-reading its whole state file: the
+    status only comes back when its ETag moved, and then only the kills after
+    our cursor. None when the API isn't up, so we fall back to the file.
+    """
+    seen = st.session_state.setdefault(
+        "arena_api", {"etag": "", "status": {}, "cursor": 0, "kills": [], "top": None}
+    )
+    got = api_get("/status", seen["etag"])
+    if got is None:
+        return None
+    code, etag, status = got
+    if code == 200:
+        # A fresh arena; forget the old one.
+        if status.get("cursor", 0) < seen["cursor"]:
+            seen.update(cursor=0, kills=[], top=None)
+        seen["etag"], seen["status"] = etag, status
+        keep = KILL_FEED_SIZE + KILL_FEED_STEP
+        since = max(seen["cursor"], status.get("cursor", 0) - keep)
+        delta = api_get(f"/kills?since={since}")
+        if delta is not None:
+            fresh = [kill["text"] for kill in delta[2]["kills"]]
+            seen["kills"] = (seen["kills"] + fresh)[-keep:]
+            seen["cursor"] = delta[2]["cursor"]
+        top = status.get("top_predator")
+        if top != (seen["top"] or {}).get("summary"):
+            soul = api_get(f"/souls/{top['id']}") if top else None
+            seen["top"] = {
+                "summary": top,
+                "soul": SoulState.from_dict(soul[2]) if soul else None,
+            }
+
+    status = seen["status"]
+    if not status.get("ready"):
+        return None
+    collective = CollectiveState(
+        spots_claimed=status["spots_claimed"],
+        kill_count=status["kill_count"],
+        current_generation=status["current_generation"],
+        tagline=status["tagline"],
+        coat_complete=status["coat_complete"],
+        coat_complete_reason=status["coat_complete_reason"],
+    )
+    predator = (seen["top"] or {}).get("soul")
+    feed = [parse_kill_line(text) for text in reversed(seen["kills"])]
+    return collective, predator, feed
+
+
+@st.cache_resource(ttl=config.DASHBOARD_REFRESH)
+def shared_arena_state() -> ArenaState | None:
+    """One parse of the state file per refresh for every viewer, not one per viewer per fragment."""
+    return load_arena_state()
+
+
+@st.cache_resource
+def soul_archive() -> SoulArchive:
+    """The cold closet of absorbed souls, indexed once and tailed afterwards."""
+    archive = SoulArchive()
+    archive.load()
+    return archive
+
+
+@st.cache_resource
+def coat_memory() -> CollectiveMemory:
+    """One read-only view of the coat's memory per server; refreshed by tailing the log."""
+    memory = CollectiveMemory()
+    memory.load()
+    return memory
+
+
 def call_collective(system_prompt: str, user_prompt: str) -> str:
     """Whisper to the coat and force it to answer, darling."""
     messages: list[dict[str, str]] = [{"role": "system", "content": system_prompt}]
     user_clean = user_prompt.strip()
     if user_clean:
         messages.append({"role": "user", "content": user_clean})
+    BUDGET.record("collective", messages)
 
     model_name = getattr(config, "MODEL_COLLECTIVE", "").strip()
     if not model_name:
@@ -52,6 +174,26 @@ def call_collective(system_prompt: str, user_prompt: str) -> str:
             "Imagine the most vicious thing I could say and assume I said it."
         )
 
+    # The arena's queue first, so the coat waits its turn behind the judges
+    # instead of elbowing them off the GPU; straight to Ollama if it's gone.
+    reply = api_post(
+        "/collective", {"messages": messages}, timeout=config.LLM_CALL_DEADLINE + 10
+    )
+    if reply is not None:
+        content = str(reply.get("content") or "").strip()
+        if "error" in reply:
+            logging.error("Summoning Cruella failed: %s", reply["error"])
+            return (
+                "Cruella is busy pinning a fresh spot to the coat. "
+                "Try again in a moment, darling."
+            )
+        return content or (
+            "Cruella inhales, exhales, and decides you are beneath a full sentence, "
+            "darling."
+        )
+
+    import ollama  # deferred so the first paint doesn't wait on the client
+
     try:
         response: dict[str, object] = ollama.chat(
             model=model_name,
@@ -156,34 +298,106 @@ def build_kill_feed(collective: CollectiveState | None) -> list[dict[str, str]]:
         for line in collective.essence.splitlines()
         if line.strip().startswith("[Spot")
     ]
-    return [parse_kill_line(line) for line in lines[-50:][::-1]]
+    keep = KILL_FEED_SIZE + KILL_FEED_STEP
+    return [parse_kill_line(line) for line in lines[-keep:][::-1]]
+
+
+LIVE_DUELS_HTML = """
+<style>
+  body { margin: 0; background: #000; color: #f2f2f2; font-family: Georgia, serif; }
+  .live-title { font-family: Cinzel, serif; color: #ff1e1e; letter-spacing: 0.22em;
+    text-align: center; font-size: 1.1rem; margin: 0.4rem 0 0.8rem; text-shadow: 0 0 12px #8b0000; }
+  .duel { border: 1px solid #3b0000; border-radius: 14px; padding: 0.7rem 0.9rem; margin: 0.6rem 0;
+    background: radial-gradient(circle at 10% 10%, #2a0000, #050000 60%); }
+  .duel-type { font-size: 0.7rem; letter-spacing: 0.2em; color: #ffb3b3; text-transform: uppercase; }
+  .speaker { color: #d4af37; font-size: 0.85rem; margin-top: 0.4rem; }
+  .speaker.judge { color: #ff1e1e; }
+  .words { font-size: 0.85rem; color: #dddddd; white-space: pre-wrap; max-height: 6.5em; overflow: hidden; }
+  .outcome { margin-top: 0.4rem; font-style: italic; color: #ff1e1e; font-size: 0.85rem; }
+  .quiet { text-align: center; color: #777; font-style: italic; }
+</style>
+<div class="live-title">LIVE — MID-SCREAM</div>
+<div id="duels"><div class="quiet">Waiting for the next scream, darling...</div></div>
+<script>
+  const MAX_DUELS = 6;
+  const duels = new Map();
+  const root = document.getElementById("duels");
+
+  function duel(id) {
+    if (!duels.has(id)) {
+      const card = document.createElement("div");
+      card.className = "duel";
+      card.innerHTML = '<div class="duel-type"></div><div class="voices"></div><div class="outcome"></div>';
+      if (!duels.size) root.innerHTML = "";
+      root.prepend(card);
+      duels.set(id, {card: card, voices: new Map()});
+      while (duels.size > MAX_DUELS) {
+        const oldest = duels.keys().next().value;
+        duels.get(oldest).card.remove();
+        duels.delete(oldest);
+      }
+    }
+    return duels.get(id);
+  }
+
+  function voice(d, speaker) {
+    if (!d.voices.has(speaker)) {
+      const who = document.createElement("div");
+      who.className = "speaker" + (speaker === "judge" ? " judge" : "");
+      who.textContent = speaker === "judge" ? "The critic" : speaker;
+      const words = document.createElement("div");
+      words.className = "words";
+      d.card.querySelector(".voices").append(who, words);
+      d.voices.set(speaker, words);
+    }
+    return d.voices.get(speaker);
+  }
+
+  const source = new EventSource(__LIVE_URL__);
+  source.onmessage = (message) => {
+    const e = JSON.parse(message.data);
+    if (!e.battle) return;
+    const d = duel(e.battle);
+    if (e.kind === "battle") {
+      d.card.querySelector(".duel-type").textContent = e.a + " vs " + e.b + " — " + e.battle_type;
+    } else if (e.kind === "start") {
+      voice(d, e.speaker).textContent = "";
+    } else if (e.kind === "token") {
+      const words = voice(d, e.speaker);
+      words.textContent += e.text;
+      words.scrollTop = words.scrollHeight;
+    } else if (e.kind === "done") {
+      voice(d, e.speaker).textContent = e.text;
+    } else if (e.kind === "end") {
+      d.card.querySelector(".outcome").textContent = e.outcome === "kill"
+        ? e.winner + " skinned " + e.loser + ". " + e.reason
+        : "No spot this time (" + e.outcome + ").";
+    }
+  };
+</script>
+"""
+
+
+def render_live_duels() -> None:
+    """Battles as they happen, pushed by the arena's /live stream straight into the browser."""
+    if not config.API_PORT:
+        return
+    url = config.API_PUBLIC_URL or f"http://{config.API_HOST}:{config.API_PORT}"
+    components.html(
+        LIVE_DUELS_HTML.replace("__LIVE_URL__", json.dumps(url.rstrip("/") + "/live")),
+        height=720,
+        scrolling=True,
+    )
 
 
-def inject_base_css(progress_pct: float, coat_complete: bool) -> None:
-    """Drape the entire app in villain couture CSS, darling."""
+@st.cache_resource
+def base_css() -> str:
+    """The couture stylesheet. Nothing in it changes, so it's sewn once per server."""
     background_spots = (
         "radial-gradient(circle at 10% 20%, #ffffff20 0, #ffffff20 6px, transparent 7px), "
         "radial-gradient(circle at 80% 70%, #ffffff18 0, #ffffff18 7px, transparent 8px)"
     )
-    fur_pattern = (
-        "radial-gradient(circle at 15% 20%, #ffffff 0, #ffffff 9px, transparent 10px), "
-        "radial-gradient(circle at 70% 60%, #ffffff 0, #ffffff 11px, transparent 12px), "
-        "radial-gradient(circle at 40% 80%, #ffffff 0, #ffffff 10px, transparent 11px)"
-    )
-
-    coat_complete_css = ""
-    if coat_complete:
-        coat_complete_css = f"""
-        [data-testid="stAppViewContainer"] {{
-            background: #000000;
-            background-image: {fur_pattern};
-            background-size: 220px 220px;
-            background-repeat: repeat;
-        }}
-        """
-
-    st.markdown(
-        f"""
+    return f"""
         <style>
         html, body, [data-testid="stAppViewContainer"] {{
             background-color: #000000;
@@ -279,7 +493,6 @@ def inject_base_css(progress_pct: float, coat_complete: bool) -> None:
             left: 0;
             bottom: 0;
             width: 100%;
-            height: {progress_pct:.2f}%;
             background:
                 linear-gradient(180deg, #ff1e1e 0%, #8b0000 45%, #3b0000 100%);
             box-shadow: 0 0 30px rgba(255, 30, 30, 0.8);
@@ -436,12 +649,17 @@ def inject_base_css(progress_pct: float, coat_complete: bool) -> None:
             margin: 0;
         }}
 
-        {coat_complete_css}
+        /* Cards arrive oldest first so earlier ones never move; show newest on top. */
+        div[data-testid="stVerticalBlock"]:has(.kill-feed-anchor):not(:has(div[data-testid="stVerticalBlock"] .kill-feed-anchor)) {{
+            flex-direction: column-reverse;
+        }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
 
+
+def inject_base_css() -> None:
+    """Drape the entire app in villain couture CSS, darling. Once per page; the fragments never repeat it."""
+    st.markdown(base_css(), unsafe_allow_html=True)
     st.markdown(
         """
         <div class="cruella-smoke-layer">
@@ -456,58 +674,90 @@ def inject_base_css(progress_pct: float, coat_complete: bool) -> None:
     )
 
 
-def main() -> None:
-    state = load_arena_state()
-    collective: CollectiveState | None = state.collective if state else None
+def arena_view() -> (
+    tuple[CollectiveState | None, SoulState | None, list[dict[str, str]]]
+):
+    """
+    The coat, its deadliest puppy and the kill feed (oldest first), fetched
+    once per refresh and shared by every fragment of this session: the
+    fragments of one tick all land within half a refresh of each other.
+    """
+    now = time.monotonic()
+    cached = st.session_state.get("arena_view")
+    if cached is not None and now - cached[0] < config.DASHBOARD_REFRESH / 2:
+        return cached[1]
+    view = fetch_arena_view()
+    st.session_state["arena_view"] = (now, view)
+    return view
+
+
+def fetch_arena_view() -> (
+    tuple[CollectiveState | None, SoulState | None, list[dict[str, str]]]
+):
+    """From the API, else the file."""
+    view = watch_arena_api()
+    if view is not None:
+        collective, predator, feed = view
+    else:
+        state = shared_arena_state()
+        collective = state.collective if state else None
+        predator = (
+            max(state.souls.values(), key=lambda s: s.kills, default=None)
+            if state
+            else None
+        )
+        feed = build_kill_feed(collective)
+    return collective, predator, feed[::-1]
+
+
+@st.fragment(run_every=config.DASHBOARD_REFRESH)
+def coat_status() -> None:
+    """The sidebar's numbers, refreshed on their own."""
+    collective, predator, _ = arena_view()
     spots_claimed = collective.spots_claimed if collective else 0
-    total_spots = getattr(config, "NUM_STARTING_SOULS", 101) or 101
-    coat_complete = bool(collective.coat_complete) if collective else False
     tagline = collective.tagline if collective else "The coat hungers."
     kill_count = collective.kill_count if collective else 0
 
-    progress_pct = (
-        min(max(spots_claimed / float(total_spots), 0.0), 1.0) * 100.0
-        if total_spots > 0
-        else 0.0
-    )
-
-    inject_base_css(progress_pct=progress_pct, coat_complete=coat_complete)
+    st.markdown("### 🧥 Coat Status")
+    st.markdown(f"**Spots Claimed**  \n`{spots_claimed}/{TOTAL_SPOTS}`")
+    st.markdown(f"**Total Kills**  \n`{kill_count}`")
+    st.markdown("---")
+    st.markdown("**Current Whisper**")
+    st.markdown(f"_{tagline}_")
 
-    # Sidebar
-    with st.sidebar:
-        st.markdown("### 🧥 Coat Status")
-        st.markdown(f"**Spots Claimed**  \n`{spots_claimed}/{total_spots}`")
-        st.markdown(f"**Total Kills**  \n`{kill_count}`")
+    if predator is not None and predator.kills:
+        archive = soul_archive()
+        archive.refresh()
         st.markdown("---")
-        st.markdown("**Current Whisper**")
-        st.markdown(f"_{tagline}_")
+        st.markdown("**Top Predator**")
+        st.markdown(f"{predator.name}  \n`{predator.kills}` kills")
+        for victim in archive.lineage(predator, limit=5):
+            st.markdown(f"- _{victim.name}_")
+
+
+@st.fragment(run_every=config.DASHBOARD_REFRESH)
+def coat_progress() -> None:
+    """Title and the rising bar — the only markup that moves with every spot."""
+    collective, _, _ = arena_view()
+    spots_claimed = collective.spots_claimed if collective else 0
+    coat_complete = bool(collective.coat_complete) if collective else False
+    progress_pct = min(max(spots_claimed / float(TOTAL_SPOTS), 0.0), 1.0) * 100.0
 
-    # Header
     title_text = (
         "THE COAT IS FINISHED"
         if coat_complete
-        else f"{spots_claimed}/{total_spots} SPOTS CLAIMED"
+        else f"{spots_claimed}/{TOTAL_SPOTS} SPOTS CLAIMED"
     )
     st.markdown(
         f'<div class="cruella-title">{title_text}</div>',
         unsafe_allow_html=True,
     )
-    st.markdown(
-        """
-        <div class="cruella-subtitle">
-            WATCH THE PUPPIES FALL, DARLING. THIS IS NOT A DASHBOARD. THIS IS A CRIME SCENE.
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # Progress
     st.markdown("#### Coat Completion")
     st.markdown(
-        """
+        f"""
         <div class="coat-progress-wrapper">
             <div class="coat-progress-bar">
-                <div class="coat-progress-fill"></div>
+                <div class="coat-progress-fill" style="height: {progress_pct:.2f}%"></div>
             </div>
             <div class="coat-progress-text">
                 Each rise is another Matthew sewn screaming into the pattern.
@@ -516,48 +766,57 @@ def main() -> None:
         """,
         unsafe_allow_html=True,
     )
-    st.progress(spots_claimed / total_spots if total_spots else 0.0)
+    st.progress(progress_pct / 100.0)
+
+
+@st.cache_resource(max_entries=4 * KILL_FEED_SIZE)
+def kill_card_html(entry: tuple[tuple[str, str], ...], newest: bool) -> str:
+    """One kill card's markup, built once per kill rather than once per refresh."""
+    fields = dict(entry)
+    newest_class = "kill-card-newest" if newest else ""
+    spot_label = fields.get("spot", "?")
+    burn_class = f"kill-card-burn-{int(spot_label) % 3 if spot_label.isdigit() else 0}"
+    winner = fields.get("winner", "Unknown Matthew")
+    loser = fields.get("loser", "Unknown Puppy")
+    verdict = fields.get("verdict", fields.get("raw", ""))
+    raw_line = fields.get("raw", "")
+
+    return f"""
+        <div class="kill-card {newest_class} {burn_class}">
+            <div class="burn-spot-tl"></div>
+            <div class="burn-spot-tr"></div>
+            <div class="burn-spot-bl"></div>
+            <div class="burn-spot-br"></div>
+            <div class="burn-spot-center"></div>
+            <div class="kill-card-spot">
+                <span>SPOT {spot_label}/{TOTAL_SPOTS}</span>
+            </div>
+            <div class="kill-card-names">
+                <span class="gold-text">{winner}</span>
+                <span class="kill-versus">vs</span>
+                <span class="silver-text">{loser}</span>
+            </div>
+            <div class="kill-verdict">{verdict}</div>
+            <div class="kill-raw">{raw_line}</div>
+        </div>
+    """
 
-    col_left, col_right = st.columns([2, 1])
 
-    # Kill feed
-    with col_left:
-        st.markdown(
-            '<div class="kill-feed-title">LIVE KILL FEED — FRESH SPOTS</div>',
-            unsafe_allow_html=True,
-        )
-        feed = build_kill_feed(collective)
-        if feed:
-            for index, entry in enumerate(feed):
-                newest_class = "kill-card-newest" if index == 0 else ""
-                burn_class = f"kill-card-burn-{index % 3}"
-                spot_label = entry.get("spot", "?")
-                winner = entry.get("winner", "Unknown Matthew")
-                loser = entry.get("loser", "Unknown Puppy")
-                verdict = entry.get("verdict", entry.get("raw", ""))
-                raw_line = entry.get("raw", "")
-
-                card_html = f"""
-                <div class="kill-card {newest_class} {burn_class}">
-                    <div class="burn-spot-tl"></div>
-                    <div class="burn-spot-tr"></div>
-                    <div class="burn-spot-bl"></div>
-                    <div class="burn-spot-br"></div>
-                    <div class="burn-spot-center"></div>
-                    <div class="kill-card-spot">
-                        <span>SPOT {spot_label}/{total_spots}</span>
-                    </div>
-                    <div class="kill-card-names">
-                        <span class="gold-text">{winner}</span>
-                        <span class="kill-versus">vs</span>
-                        <span class="silver-text">{loser}</span>
-                    </div>
-                    <div class="kill-verdict">{verdict}</div>
-                    <div class="kill-raw">{raw_line}</div>
-                </div>
-                """
-                st.markdown(card_html, unsafe_allow_html=True)
-        else:
+@st.fragment(run_every=config.DASHBOARD_REFRESH)
+def kill_feed() -> None:
+    """
+    The feed, oldest card first so a new kill only appends one (CSS flips the
+    column). It trims in steps of ``KILL_FEED_STEP`` rather than one at a
+    time, so the cards already on screen keep their places between trims.
+    """
+    collective, _, feed = arena_view()
+    spots_claimed = collective.spots_claimed if collective else 0
+    shown = KILL_FEED_SIZE + max(0, spots_claimed - KILL_FEED_SIZE) % KILL_FEED_STEP
+    feed = feed[-shown:]
+
+    with st.container():  # its own block, so only the cards get flipped
+        st.markdown('<span class="kill-feed-anchor"></span>', unsafe_allow_html=True)
+        if not feed:
             st.markdown(
                 """
                 <div class="kill-card">
@@ -574,117 +833,182 @@ def main() -> None:
                 """,
                 unsafe_allow_html=True,
             )
-
-    # Coat complete overlay
-    cruella_final = ""
-    if coat_complete and collective:
-        cruella_final = st.session_state.get("cruella_final", "")
-        if not cruella_final:
-            final_prompt = (
-                "Deliver your final monologue to the hackathon cattle, "
-                "now that the coat is finished and every Matthew is yours."
-            )
-            cruella_final = call_collective(
-                build_coat_complete_prompt(collective),
-                final_prompt,
+        for index, entry in enumerate(feed):
+            card_html = kill_card_html(
+                tuple(sorted(entry.items())), newest=index == len(feed) - 1
             )
-            st.session_state["cruella_final"] = cruella_final
+            st.markdown(card_html, unsafe_allow_html=True)
 
-        fur_pattern = (
-            "radial-gradient(circle at 10% 20%, #ffffff 0, #ffffff 10px, transparent 11px), "
-            "radial-gradient(circle at 70% 40%, #ffffff 0, #ffffff 13px, transparent 14px), "
-            "radial-gradient(circle at 30% 80%, #ffffff 0, #ffffff 11px, transparent 12px)"
+
+@st.cache_resource
+def coat_complete_css() -> str:
+    """The fur takes over the whole page once the coat is done."""
+    fur_pattern = (
+        "radial-gradient(circle at 15% 20%, #ffffff 0, #ffffff 9px, transparent 10px), "
+        "radial-gradient(circle at 70% 60%, #ffffff 0, #ffffff 11px, transparent 12px), "
+        "radial-gradient(circle at 40% 80%, #ffffff 0, #ffffff 10px, transparent 11px)"
+    )
+    overlay_fur = (
+        "radial-gradient(circle at 10% 20%, #ffffff 0, #ffffff 10px, transparent 11px), "
+        "radial-gradient(circle at 70% 40%, #ffffff 0, #ffffff 13px, transparent 14px), "
+        "radial-gradient(circle at 30% 80%, #ffffff 0, #ffffff 11px, transparent 12px)"
+    )
+    return f"""
+    <style>
+    [data-testid="stAppViewContainer"] {{
+        background: #000000;
+        background-image: {fur_pattern};
+        background-size: 220px 220px;
+        background-repeat: repeat;
+    }}
+    </style>
+        <style>
+        .coat-complete-overlay {{
+            position: fixed;
+            inset: 0;
+            z-index: 50;
+            background-color: #000000;
+            background-image: {overlay_fur};
+            background-size: 260px 260px;
+            background-repeat: repeat;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            padding: 4rem 2rem;
+        }}
+        .coat-complete-inner {{
+            max-width: 960px;
+            background: rgba(0, 0, 0, 0.86);
+            border-radius: 32px;
+            border: 3px solid #d4af37;
+            box-shadow:
+                0 0 60px rgba(0, 0, 0, 0.9),
+                0 0 80px rgba(212, 175, 55, 0.9),
+                0 -12px 40px rgba(255, 30, 30, 0.8);
+            padding: 3rem 3rem 2.5rem 3rem;
+            position: relative;
+            overflow: hidden;
+        }}
+        .coat-complete-inner::before {{
+            content: "";
+            position: absolute;
+            top: -40px;
+            left: 0;
+            right: 0;
+            height: 70px;
+            background:
+                radial-gradient(circle at 10% 0, #ff1e1e80 0, transparent 55%),
+                radial-gradient(circle at 40% 0, #ff1e1ea0 0, transparent 60%),
+                radial-gradient(circle at 80% 0, #ff1e1e90 0, transparent 55%);
+            pointer-events: none;
+        }}
+        .coat-complete-title {{
+            font-family: "Cinzel", serif;
+            font-size: 3rem;
+            text-align: center;
+            letter-spacing: 0.32em;
+            text-transform: uppercase;
+            color: #d4af37;
+            text-shadow:
+                0 0 16px rgba(212, 175, 55, 0.9),
+                0 0 28px rgba(255, 255, 255, 0.8);
+            margin-bottom: 1.2rem;
+        }}
+        .coat-complete-subtitle {{
+            font-family: "Playfair Display", serif;
+            text-align: center;
+            color: #ff1e1e;
+            font-size: 1.2rem;
+            letter-spacing: 0.24em;
+            text-transform: uppercase;
+            margin-bottom: 1.8rem;
+        }}
+        .coat-complete-text {{
+            font-family: "Georgia", serif;
+            font-size: 1.1rem;
+            line-height: 1.85;
+            color: #f9f9f9;
+        }}
+        </style>
+    """
+
+
+@st.fragment(run_every=config.DASHBOARD_REFRESH)
+def coat_finale() -> None:
+    """Nothing at all until the last spot is sewn; then Cruella takes the stage."""
+    collective, _, _ = arena_view()
+    if not (collective and collective.coat_complete):
+        return
+
+    cruella_final = st.session_state.get("cruella_final", "")
+    if not cruella_final:
+        final_prompt = (
+            "Deliver your final monologue to the hackathon cattle, "
+            "now that the coat is finished and every Matthew is yours."
         )
+        memory = coat_memory()
+        memory.refresh()
+        cruella_final = call_collective(
+            build_coat_complete_prompt(collective, memory, final_prompt),
+            final_prompt,
+        )
+        st.session_state["cruella_final"] = cruella_final
 
-        st.markdown(
-            f"""
-            <style>
-            .coat-complete-overlay {{
-                position: fixed;
-                inset: 0;
-                z-index: 50;
-                background-color: #000000;
-                background-image: {fur_pattern};
-                background-size: 260px 260px;
-                background-repeat: repeat;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                padding: 4rem 2rem;
-            }}
-            .coat-complete-inner {{
-                max-width: 960px;
-                background: rgba(0, 0, 0, 0.86);
-                border-radius: 32px;
-                border: 3px solid #d4af37;
-                box-shadow:
-                    0 0 60px rgba(0, 0, 0, 0.9),
-                    0 0 80px rgba(212, 175, 55, 0.9),
-                    0 -12px 40px rgba(255, 30, 30, 0.8);
-                padding: 3rem 3rem 2.5rem 3rem;
-                position: relative;
-                overflow: hidden;
-            }}
-            .coat-complete-inner::before {{
-                content: "";
-                position: absolute;
-                top: -40px;
-                left: 0;
-                right: 0;
-                height: 70px;
-                background:
-                    radial-gradient(circle at 10% 0, #ff1e1e80 0, transparent 55%),
-                    radial-gradient(circle at 40% 0, #ff1e1ea0 0, transparent 60%),
-                    radial-gradient(circle at 80% 0, #ff1e1e90 0, transparent 55%);
-                pointer-events: none;
-            }}
-            .coat-complete-title {{
-                font-family: "Cinzel", serif;
-                font-size: 3rem;
-                text-align: center;
-                letter-spacing: 0.32em;
-                text-transform: uppercase;
-                color: #d4af37;
-                text-shadow:
-                    0 0 16px rgba(212, 175, 55, 0.9),
-                    0 0 28px rgba(255, 255, 255, 0.8);
-                margin-bottom: 1.2rem;
-            }}
-            .coat-complete-subtitle {{
-                font-family: "Playfair Display", serif;
-                text-align: center;
-                color: #ff1e1e;
-                font-size: 1.2rem;
-                letter-spacing: 0.24em;
-                text-transform: uppercase;
-                margin-bottom: 1.8rem;
-            }}
-            .coat-complete-text {{
-                font-family: "Georgia", serif;
-                font-size: 1.1rem;
-                line-height: 1.85;
-                color: #f9f9f9;
-            }}
-            </style>
-            <div class="coat-complete-overlay">
-                <div class="coat-complete-inner">
-                    <div class="coat-complete-title">
-                        THE COAT IS FINISHED
-                    </div>
-                    <div class="coat-complete-subtitle">
-                        CRUELLA IS COMPLETE. THE WORLD IS HER RUNWAY.
-                    </div>
-                    <div class="coat-complete-text">
-                        {cruella_final}
-                    </div>
+    st.markdown(coat_complete_css(), unsafe_allow_html=True)
+    st.markdown(
+        f"""
+        <div class="coat-complete-overlay">
+            <div class="coat-complete-inner">
+                <div class="coat-complete-title">
+                    THE COAT IS FINISHED
+                </div>
+                <div class="coat-complete-subtitle">
+                    CRUELLA IS COMPLETE. THE WORLD IS HER RUNWAY.
+                </div>
+                <div class="coat-complete-text">
+                    {cruella_final}
                 </div>
             </div>
-            """,
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def main() -> None:
+    """
+    Static couture once per page load; everything that moves lives in a
+    fragment refreshing every ``DASHBOARD_REFRESH`` seconds on its own, so a
+    refresh never re-runs the whole script or holds a thread asleep.
+    """
+    inject_base_css()
+
+    with st.sidebar:
+        coat_status()
+
+    coat_progress()
+    st.markdown(
+        """
+        <div class="cruella-subtitle">
+            WATCH THE PUPPIES FALL, DARLING. THIS IS NOT A DASHBOARD. THIS IS A CRIME SCENE.
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    col_left, col_right = st.columns([2, 1])
+
+    with col_right:
+        render_live_duels()
+
+    with col_left:
+        st.markdown(
+            '<div class="kill-feed-title">LIVE KILL FEED — FRESH SPOTS</div>',
             unsafe_allow_html=True,
         )
+        kill_feed()
 
-    time.sleep(5.0)
-    st.rerun()
+    coat_finale()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List, Optional
+
+import config
+from models import SoulState
+from souls import iter_next_generation
+
+if TYPE_CHECKING:
+    from arena import CruellaArena
+
+# The next litter is already whimpering in the wings before the last one finishes dying.
+
+
+class GenerationManager:
+    """
+    Pipelines generations instead of stopping the arena between them. Once the
+    living count drops below ``watermark`` the next litter is bred off the
+    event loop and staged; as soon as it is ready it is released into the
+    matchmaker, so the scheduler never runs dry at a generation boundary.
+
+    A watermark of 0 keeps the old behaviour: breed only when the arena has
+    fully drained. With ``lockstep`` (on while replaying a tape) the litter
+    is bred right on the loop and released on the very next tick, so no
+    battle moves while it is born and reruns don't depend on thread timing.
+    """
+
+    def __init__(
+        self,
+        arena: CruellaArena,
+        watermark: int = config.GENERATION_WATERMARK,
+        lockstep: bool = bool(config.ARENA_REPLAY),
+    ) -> None:
+        self.arena = arena
+        self.watermark = watermark
+        self.lockstep = lockstep
+        self.staging: Optional[asyncio.Future] = None
+
+    def _due(self) -> bool:
+        state = self.arena.state
+        return (
+            state is not None
+            and not state.collective.coat_complete
+            and self.arena.matchmaker.alive < self.watermark
+        )
+
+    def tick(self) -> None:
+        """Start breeding the next litter if we've crossed the watermark."""
+        if self.staging is None and self.watermark > 0 and self._due():
+            assert self.arena.state is not None
+            generation = self.arena.state.collective.current_generation
+            logging.info(
+                "🍼 Below %s alive — prespawning generation %s.",
+                self.watermark,
+                generation + 1,
+            )
+            if self.lockstep:
+                self.staging = asyncio.get_running_loop().create_future()
+                self.staging.set_result(_breed(config.NUM_STARTING_SOULS, generation))
+                return
+            self.staging = asyncio.create_task(
+                asyncio.to_thread(_breed, config.NUM_STARTING_SOULS, generation)
+            )
+
+    async def feed(self) -> int:
+        """Release a staged litter into the arena. Returns how many souls joined."""
+        if self.staging is None or not self.staging.done():
+            return 0
+        task, self.staging = self.staging, None
+        souls: List[SoulState] = task.result()
+        assert self.arena.state is not None
+        if self.arena.state.collective.coat_complete:
+            return 0  # the coat is finished; nobody else needs to be born
+        await self.arena._release_generation(souls)
+        return len(souls)
+
+    async def drained(self) -> None:
+        """The arena ran dry anyway: finish whatever is staged, or breed now."""
+        if self.staging is not None:
+            await asyncio.wait({self.staging})
+            await self.feed()
+        else:
+            await self.arena._spawn_generation()
+
+    async def close(self) -> None:
+        if self.staging is not None:
+            self.staging.cancel()
+            await asyncio.gather(self.staging, return_exceptions=True)
+            self.staging = None
+
+
+def _breed(num: int, current_generation: int) -> List[SoulState]:
+    return list(iter_next_generation(num, current_generation))
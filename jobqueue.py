@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import config
+
+# A durable waiting room. Puppies queue here; nobody leaves until the coat says so.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload     TEXT    NOT NULL,
+    status      TEXT    NOT NULL DEFAULT 'queued',
+    lease_owner TEXT,
+    lease_until REAL    NOT NULL DEFAULT 0,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    created     REAL    NOT NULL,
+    result      TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+# queued → leased → done → applied        (leased past lease_until → leasable again)
+#                 ↘ failed                 (after config.JOB_MAX_ATTEMPTS leases)
+
+
+@dataclass
+class Job:
+    id: int
+    payload: Dict[str, Any]
+    attempts: int = 0
+    status: str = "queued"
+    result: Optional[Dict[str, Any]] = None
+
+
+class BattleQueue:
+    """
+    SQLite-backed job queue with leases: at-least-once delivery, safe across
+    processes on one machine. A worker that dies mid-battle simply lets its
+    lease expire and the job is handed to someone else.
+    """
+
+    def __init__(self, path: str = config.JOB_QUEUE_PATH) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; asyncio.to_thread hops between workers.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, payload: Dict[str, Any]) -> int:
+        cur = self._conn().execute(
+            "INSERT INTO jobs (payload, created) VALUES (?, ?)",
+            (json.dumps(payload, separators=(",", ":")), time.time()),
+        )
+        return int(cur.lastrowid)
+
+    def lease(
+        self, owner: str, seconds: float = config.JOB_LEASE_SECONDS
+    ) -> Optional[Job]:
+        """Claim the oldest runnable job, including ones whose lease has lapsed."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM jobs "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, payload, attempts = row
+            if attempts >= config.JOB_MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed' WHERE id = ?", (job_id,)
+                )
+                conn.execute("COMMIT")
+                return self.lease(owner, seconds)
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (owner, now + seconds, job_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Job(
+            id=job_id,
+            payload=json.loads(payload),
+            attempts=attempts + 1,
+            status="leased",
+        )
+
+    def extend(
+        self, job_id: int, owner: str, seconds: float = config.JOB_LEASE_SECONDS
+    ) -> bool:
+        """Keep a lease alive between slow LLM calls. False if someone stole it."""
+        cur = self._conn().execute(
+            "UPDATE jobs SET lease_until = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + seconds, job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result: Dict[str, Any]) -> bool:
+        """Post a result under our own lease. False if the lease went to someone else."""
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = 'done', result = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            (json.dumps(result, separators=(",", ":")), job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def results(self, limit: int = 100) -> List[Job]:
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT id, payload, attempts, result FROM jobs "
+                "WHERE status = 'done' ORDER BY id LIMIT ?",
+                (limit,),
+            )
+            .fetchall()
+        )
+        return [
+            Job(
+                id=r[0],
+                payload=json.loads(r[1]),
+                attempts=r[2],
+                status="done",
+                result=json.loads(r[3]),
+            )
+            for r in rows
+        ]
+
+    def mark(self, job_id: int, status: str) -> None:
+        """Retire a job once the coordinator has applied (or discarded) it."""
+        self._conn().execute(
+            "UPDATE jobs SET status = ? WHERE id = ?", (status, job_id)
+        )
+
+    def open_jobs(self) -> List[Job]:
+        """Everything not yet retired — what a restarting coordinator must not re-pair."""
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT id, payload, attempts, status FROM jobs "
+                "WHERE status IN ('queued', 'leased', 'done') ORDER BY id"
+            )
+            .fetchall()
+        )
+        return [
+            Job(id=r[0], payload=json.loads(r[1]), attempts=r[2], status=r[3])
+            for r in rows
+        ]
+
+    def failed(self) -> List[Job]:
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT id, payload, attempts FROM jobs WHERE status = 'failed' ORDER BY id"
+            )
+            .fetchall()
+        )
+        return [
+            Job(id=r[0], payload=json.loads(r[1]), attempts=r[2], status="failed")
+            for r in rows
+        ]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import uuid
+from typing import IO, Any, Dict, List, Optional
+
+import config
+
+# Cruella never pays for the same scream twice. Every stage of a duel is written down as it happens.
+
+# paired → out_a → out_b → verdict → closed       (anything short of closed resumes on restart)
+# paired → duel (both outputs, maybe the verdict) → closed      (DUEL_MODE=duel|verdict)
+
+
+class BattleJournal:
+    """
+    Append-only JSONL log of in-flight battles: the pairing and seed first,
+    then each contestant output and the verdict as they arrive, then a
+    ``closed`` line. After a crash, ``load`` hands back every battle that
+    never closed, with whatever stages it already paid for.
+
+    An empty ``path`` disables journaling entirely.
+    """
+
+    def __init__(
+        self,
+        path: str = config.JOURNAL_PATH,
+        compact_bytes: int = config.JOURNAL_COMPACT_BYTES,
+    ) -> None:
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self.open_battles: Dict[str, Dict[str, Any]] = {}
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Replay the journal and return the battles that never closed, oldest first."""
+        self.open_battles.clear()
+        if not self.enabled or not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    event = json.loads(raw)
+                except ValueError:
+                    continue  # a torn last line from the crash itself
+                self._apply(event)
+        self._compact()
+        if self.open_battles:
+            logging.info(
+                "📓 Journal found %s unfinished battles.", len(self.open_battles)
+            )
+        return list(self.open_battles.values())
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        battle_id = event.get("battle")
+        if not battle_id:
+            return
+        stage = event.get("stage")
+        if stage == "closed":
+            self.open_battles.pop(battle_id, None)
+            return
+        entry = self.open_battles.setdefault(battle_id, {"battle": battle_id})
+        entry.update({k: v for k, v in event.items() if k != "stage"})
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        if self._handle is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._handle = open(self.path, "a", encoding="utf-8")
+        self._handle.write(
+            json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+        self._handle.flush()
+        if config.JOURNAL_FSYNC:
+            os.fsync(self._handle.fileno())
+
+    def open(self, a_id: str, b_id: str, battle_type: str, seed: int) -> Dict[str, Any]:
+        """Start a battle's page: who fights, what kind of fight, which seed."""
+        entry = {
+            "battle": uuid.uuid4().hex,
+            "a": a_id,
+            "b": b_id,
+            "battle_type": battle_type,
+            "seed": seed,
+        }
+        self.open_battles[entry["battle"]] = dict(entry)
+        self._write({**entry, "stage": "paired"})
+        return entry
+
+    def stage(self, battle_id: str, stage: str, **fields: Any) -> None:
+        """Record one paid-for stage: ``out_a``, ``out_b``, ``duel`` or ``verdict``."""
+        entry = self.open_battles.get(battle_id)
+        if entry is not None:
+            entry.update(fields)
+        self._write({"battle": battle_id, "stage": stage, **fields})
+
+    def settle(self, battle_id: str, outcome: str = "recorded") -> None:
+        """The battle is settled (or abandoned); nothing left to resume."""
+        if self.open_battles.pop(battle_id, None) is None:
+            return
+        self._write({"battle": battle_id, "stage": "closed", "outcome": outcome})
+        if self._size() > self.compact_bytes:  # busy arenas never go quiet
+            self._compact()
+
+    def _size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _compact(self) -> None:
+        """Rewrite the journal with only the open battles, one line each."""
+        if not self.enabled:
+            return
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self.open_battles.values():
+                f.write(
+                    json.dumps(
+                        {**entry, "stage": "paired"},
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                )
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
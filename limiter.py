@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import config
+from metrics import METRICS, percentile
+
+# Cruella doesn't guess how many screams the GPU can take. She listens, and squeezes a little harder.
+
+
+@dataclass
+class _Waiter:
+    rank: int  # lower goes first: see llm.PRIORITIES
+    born: float  # when the battle (or request) this call belongs to started
+    enqueued: float
+    fut: asyncio.Future = field(repr=False)
+
+    def key(self, now: float, aging: float) -> tuple[float, float]:
+        # Every ``aging`` seconds in line is worth one class: nobody waits forever.
+        return self.rank - (now - self.enqueued) / aging, self.born
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one backend. Every clean response adds
+    ``1 / limit`` (one extra slot per window of successes); an error or a
+    latency beyond ``tolerance ×`` that model's recent fast baseline
+    multiplies the limit by ``backoff``, at most once per baseline
+    round-trip so one burst doesn't collapse it. The limit lives between
+    ``floor`` and ``ceiling`` and is published as the ``llm.limit.<name>``
+    gauge. Models share the slots (they share the GPU) but keep separate
+    latency baselines, since a 7b judge and a 14b contestant differ.
+
+    When the limit is full, callers queue by priority: a lower ``rank`` goes
+    first, and within a rank the call whose battle started earliest. A
+    waiter climbs one rank for every ``aging`` seconds it has waited, so
+    background work still gets served under sustained load.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial: float = config.LLM_LIMIT_INITIAL,
+        floor: float = config.LLM_LIMIT_FLOOR,
+        ceiling: float = config.LLM_LIMIT_CEILING,
+        tolerance: float = config.LLM_LATENCY_TOLERANCE,
+        backoff: float = config.LLM_LIMIT_BACKOFF,
+        window: int = config.LLM_LATENCY_WINDOW,
+        aging: float = config.LLM_PRIORITY_AGING,
+    ) -> None:
+        self.name = name
+        self.floor = max(1.0, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = min(self.ceiling, max(self.floor, initial))
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.aging = max(1e-3, aging)
+        self.inflight = 0
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._waiters: List[_Waiter] = []
+        self._last_decrease = 0.0
+        self._publish()
+
+    def _publish(self) -> None:
+        METRICS.set_gauge(f"llm.limit.{self.name}", round(self.limit, 2))
+        METRICS.set_gauge(f"llm.inflight.{self.name}", self.inflight)
+
+    def latency(self, model: str, pct: float) -> float:
+        """``pct``-th percentile of ``model``'s recent successful calls."""
+        return percentile(list(self._latencies.get(model, ())), pct)
+
+    def samples(self, model: str) -> int:
+        return len(self._latencies.get(model, ()))
+
+    def baseline(self, model: str) -> float:
+        """What a healthy call to ``model`` costs lately: p10 of its window."""
+        return self.latency(model, 10)
+
+    def _has_room(self) -> bool:
+        return self.inflight < int(self.limit)
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now and nobody is queued for it."""
+        if self._has_room() and not self._waiters:
+            self.inflight += 1
+            self._publish()
+            return True
+        return False
+
+    async def acquire(self, rank: int = 0, born: Optional[float] = None) -> None:
+        if self.try_acquire():
+            return
+        now = time.monotonic()
+        waiter = _Waiter(
+            rank,
+            now if born is None else born,
+            now,
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        METRICS.set_gauge(f"llm.queued.{self.name}", len(self._waiters))
+        try:
+            await waiter.fut
+        except asyncio.CancelledError:
+            if waiter.fut.done() and not waiter.fut.cancelled():
+                self.release()  # granted a slot just as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+                METRICS.set_gauge(f"llm.queued.{self.name}", len(self._waiters))
+            raise
+
+    def release(self) -> None:
+        self.inflight -= 1
+        self._wake()
+        self._publish()
+
+    def _wake(self) -> None:
+        if not self._waiters:
+            return
+        now = time.monotonic()
+        while self._waiters and self._has_room():
+            # The queue is at most a few hundred calls; a scan beats re-heaping
+            # every waiter each time their ages shift.
+            best = min(self._waiters, key=lambda w: w.key(now, self.aging))
+            self._waiters.remove(best)
+            if not best.fut.done():
+                self.inflight += 1
+                best.fut.set_result(None)
+        METRICS.set_gauge(f"llm.queued.{self.name}", len(self._waiters))
+
+    def on_success(self, model: str, latency: float) -> None:
+        METRICS.observe(f"llm.latency.{model}", latency)
+        baseline = self.baseline(model)
+        window = self._latencies.get(model)
+        if window is None:
+            window = self._latencies[model] = deque(maxlen=self.window)
+        window.append(latency)
+        if len(window) > 4 and latency > baseline * self.tolerance:
+            self._decrease(baseline)
+            return
+        self.limit = min(self.ceiling, self.limit + 1.0 / self.limit)
+        self._wake()
+        self._publish()
+
+    def on_error(self, model: str) -> None:
+        METRICS.inc(f"llm.errors.{model}")
+        self._decrease(self.baseline(model))
+
+    def _decrease(self, baseline: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < baseline:
+            return  # same congestion event; already backed off for it
+        self._last_decrease = now
+        self.limit = max(self.floor, self.limit * self.backoff)
+        self._publish()
+
+
+class CircuitBreaker:
+    """
+    Trips after ``failures`` consecutive failed calls to one backend. While
+    tripped, calls to it are refused without being sent; once ``cooldown``
+    seconds pass the client may probe it, and the first success closes the
+    breaker again. State is published as the ``llm.breaker.<name>`` gauge
+    (1 = tripped).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failures: int = config.LLM_BREAKER_FAILURES,
+        cooldown: float = config.LLM_BREAKER_COOLDOWN,
+    ) -> None:
+        self.name = name
+        self.threshold = max(1, failures)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        METRICS.set_gauge(f"llm.breaker.{self.name}", 0)
+
+    @property
+    def closed(self) -> bool:
+        return self.opened_at is None
+
+    def due(self) -> bool:
+        """Tripped, and rested long enough to be worth a probe."""
+        return (
+            self.opened_at is not None
+            and time.monotonic() - self.opened_at >= self.cooldown
+        )
+
+    def probing(self) -> None:
+        """A probe is on its way; nobody else needs to send one this cooldown."""
+        if self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+    def success(self) -> None:
+        self.failures = 0
+        if self.opened_at is not None:
+            self.opened_at = None
+            METRICS.set_gauge(f"llm.breaker.{self.name}", 0)
+            logging.info("🔌 Backend %s answers again. The hunt resumes.", self.name)
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None:
+            self.opened_at = time.monotonic()  # still down: rest another cooldown
+        elif self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            METRICS.inc(f"llm.breaker_trips.{self.name}")
+            METRICS.set_gauge(f"llm.breaker.{self.name}", 1)
+            logging.warning(
+                "🔌 Backend %s failed %s calls in a row. Breaker open for %ss.",
+                self.name,
+                self.failures,
+                self.cooldown,
+            )
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import config
+from limiter import AdaptiveLimiter, CircuitBreaker
+from metrics import METRICS
+from recorder import TAPE
+
+# Every scream goes through one telephone. Hang it up and the GPU stops screaming too.
+
+Messages = List[Dict[str, str]]
+
+# Who gets the next free slot. A judge call finishes a battle; a contestant
+# call starts (or continues) one; the dashboard's collective voice has a
+# human waiting on it; the archivist can always wait.
+JUDGE = "judge"
+COLLECTIVE = "collective"
+CONTESTANT = "contestant"
+SUMMARY = "summary"
+PRIORITIES = {JUDGE: 0, COLLECTIVE: 1, CONTESTANT: 2, SUMMARY: 3}
+
+# When the battle this call belongs to began; older battles are served first.
+BATTLE_BORN: ContextVar[Optional[float]] = ContextVar("BATTLE_BORN", default=None)
+
+HEDGE_MIN_SAMPLES = 20  # latencies seen before a model's percentile means anything
+PROBE_TIMEOUT = 10.0  # seconds a tripped backend gets to list its models
+
+
+class LLMUnavailable(RuntimeError):
+    """Every backend's breaker is open; the call was refused without being sent."""
+
+
+class LLMTimeout(TimeoutError):
+    """One backend request outlived its deadline and was abandoned."""
+
+
+class LLMClient:
+    """
+    Async front door to the Ollama backends. Calls are plain coroutines on
+    ``ollama.AsyncClient``, so cancelling the awaiting task closes the HTTP
+    request and the server stops generating — nothing is left running in a
+    thread after the arena has lost interest.
+
+    Each backend gets one ``AdaptiveLimiter``, so how many requests are in
+    flight follows what it is actually serving, not a config guess. When it
+    is full, calls queue by class (``PRIORITIES``) and then battle age.
+
+    Every request has a deadline. One that runs past its model's
+    ``LLM_HEDGE_PERCENTILE`` latency is duplicated on an alternate backend
+    (``LLM_HEDGE_HOSTS``) and the first answer wins. Each backend also has a
+    ``CircuitBreaker``: a tripped primary fails over to the alternates, and
+    with every breaker open ``healthy()`` is False so the arena stops pairing.
+    """
+
+    def __init__(
+        self,
+        host: str = config.OLLAMA_HOST,
+        hedge_hosts: Sequence[str] = config.LLM_HEDGE_HOSTS,
+    ) -> None:
+        self.host = host
+        self.hosts = [host] + [h for h in hedge_hosts if h != host]
+        self._clients: Dict[str, Any] = {}
+        self.backend: Any = None  # stands in for every host, e.g. a replayed tape
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.limiters: Dict[str, AdaptiveLimiter] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.shares = 1  # processes splitting each backend's ceiling (shards)
+        self.calls = 0
+        self.hedges = 0
+
+    def limiter(self, host: str) -> AdaptiveLimiter:
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            limiter = self.limiters[host] = AdaptiveLimiter(
+                host or "local",
+                initial=config.LLM_LIMIT_INITIAL / self.shares,
+                ceiling=config.LLM_LIMIT_CEILING / self.shares,
+            )
+        return limiter
+
+    def share(self, shares: int) -> None:
+        """
+        This process is one of ``shares`` hitting the same backends: each
+        limiter starts and tops out at that slice of the configured limits,
+        so together they stay under ``LLM_LIMIT_CEILING``.
+        """
+        self.shares = max(1, shares)
+        self.limiters.clear()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(host or "local")
+        return breaker
+
+    def _session(self, host: str) -> Any:
+        if self.backend is not None:
+            return self.backend
+        # The HTTP pools belong to the loop that opened them; a new loop gets its own.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._clients.clear()
+            self._loop = loop
+        client = self._clients.get(host)
+        if client is None:
+            import ollama  # deferred: the client drags in httpx and pydantic
+
+            client = self._clients[host] = ollama.AsyncClient(host=host or None)
+        return client
+
+    def _pick_host(self, exclude: Optional[str] = None) -> Optional[str]:
+        """First backend, in preference order, whose breaker is closed."""
+        for host in self.hosts:
+            if host != exclude and self.breaker(host).closed:
+                return host
+        return None
+
+    def accepting(self) -> bool:
+        """Would a call be queued rather than refused? (Some breaker is closed.)"""
+        return self._pick_host() is not None
+
+    async def healthy(self) -> bool:
+        """
+        Is any backend taking calls? Tripped backends that have rested their
+        cooldown get a cheap probe (a model listing, no generation) first.
+        """
+        if self._pick_host() is not None:
+            return True
+        for host in self.hosts:
+            breaker = self.breaker(host)
+            if not breaker.due():
+                continue
+            breaker.probing()
+            try:
+                await asyncio.wait_for(self._session(host).list(), PROBE_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                breaker.failure()
+            else:
+                breaker.success()
+                return True
+        return False
+
+    async def chat(
+        self,
+        model: str,
+        messages: Messages,
+        options: Optional[Dict[str, Any]] = None,
+        priority: str = CONTESTANT,
+        deadline: float = config.LLM_CALL_DEADLINE,
+        format: str = "",
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        One chat completion, content only. ``format="json"`` asks Ollama to
+        constrain the output to JSON. With ``on_token`` the primary request
+        streams and every piece is handed over as it arrives; a hedge that
+        wins instead just returns its whole answer.
+        """
+        host = self._pick_host()
+        if host is None:
+            raise LLMUnavailable("every LLM backend is down; call refused")
+        limiter = self.limiter(host)
+        queued = time.monotonic()
+        await limiter.acquire(PRIORITIES[priority], BATTLE_BORN.get())
+        started = time.monotonic()
+        METRICS.observe(f"llm.queue_wait.{priority}", started - queued)
+        if not self.breaker(host).closed:
+            limiter.release()  # it tripped while we queued; don't knock on a dead door
+            raise LLMUnavailable(f"LLM backend {host or 'local'} went down")
+        self.calls += 1
+
+        primary = self._launch(
+            host, model, messages, options, deadline, format, on_token
+        )
+        pending = {primary}
+        try:
+            delay = self._hedge_delay(host, model)
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done():
+                    hedge = self._hedge(
+                        host, model, messages, options, deadline, format
+                    )
+                    if hedge is not None:
+                        pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            METRICS.inc("llm.hedge_wins")
+                        content = task.result()
+                        TAPE.llm(
+                            model,
+                            messages,
+                            format,
+                            priority,
+                            content,
+                            time.monotonic() - started,
+                        )
+                        return content
+            assert error is not None
+            TAPE.llm(
+                model,
+                messages,
+                format,
+                priority,
+                "",
+                time.monotonic() - started,
+                outcome="timeout" if isinstance(error, LLMTimeout) else "error",
+                error=str(error),
+            )
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()  # the loser's request is closed mid-generation
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _hedge_delay(self, host: str, model: str) -> Optional[float]:
+        """How long to give ``host`` before hedging, or None to never hedge."""
+        if len(self.hosts) < 2 or self.hedges >= self.calls * config.LLM_HEDGE_BUDGET:
+            return None
+        limiter = self.limiter(host)
+        if limiter.samples(model) < HEDGE_MIN_SAMPLES:
+            return None  # no idea yet what "slow" means for this model
+        return limiter.latency(model, config.LLM_HEDGE_PERCENTILE)
+
+    def _hedge(
+        self,
+        host: str,
+        model: str,
+        messages: Messages,
+        options: Optional[Dict[str, Any]],
+        deadline: float,
+        format: str,
+    ) -> Optional[asyncio.Task]:
+        """Duplicate a straggler on another backend, if one has a slot free now."""
+        alternate = self._pick_host(exclude=host)
+        if alternate is None or not self.limiter(alternate).try_acquire():
+            return None
+        self.hedges += 1
+        METRICS.inc("llm.hedges")
+        return self._launch(alternate, model, messages, options, deadline, format)
+
+    def _launch(
+        self,
+        host: str,
+        model: str,
+        messages: Messages,
+        options: Optional[Dict[str, Any]],
+        deadline: float,
+        format: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> asyncio.Task:
+        """Send on a slot already taken from ``host``; it comes back however the task ends."""
+        task = asyncio.create_task(
+            self._send(host, model, messages, options, deadline, format, on_token)
+        )
+        task.add_done_callback(lambda _: self.limiter(host).release())
+        return task
+
+    async def _send(
+        self,
+        host: str,
+        model: str,
+        messages: Messages,
+        options: Optional[Dict[str, Any]],
+        deadline: float,
+        format: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """One request to ``host``, judged against its deadline, limiter and breaker."""
+        limiter, breaker = self.limiter(host), self.breaker(host)
+        started = time.monotonic()
+        try:
+            if on_token is not None and self.backend is None:
+                content = await asyncio.wait_for(
+                    self._stream(host, model, messages, options, format, on_token),
+                    deadline,
+                )
+            else:
+                response = await asyncio.wait_for(
+                    self._session(host).chat(
+                        model=model,
+                        messages=messages,
+                        options=options or {},
+                        format=format,
+                    ),
+                    deadline,
+                )
+                content = str(response["message"]["content"])
+        except asyncio.CancelledError:
+            raise  # our choice, not the backend's fault
+        except asyncio.TimeoutError:
+            METRICS.inc(f"llm.timeouts.{model}")
+            limiter.on_error(model)
+            breaker.failure()
+            raise LLMTimeout(
+                f"{model} on {host or 'local'} gave nothing in {deadline:g}s"
+            ) from None
+        except Exception:
+            limiter.on_error(model)
+            breaker.failure()
+            raise
+        else:
+            limiter.on_success(model, time.monotonic() - started)
+            breaker.success()
+            return content
+
+    async def _stream(
+        self,
+        host: str,
+        model: str,
+        messages: Messages,
+        options: Optional[Dict[str, Any]],
+        format: str,
+        on_token: Callable[[str], None],
+    ) -> str:
+        """The same request with ``stream=True``; pieces go out as they land."""
+        pieces: List[str] = []
+        chunks = await self._session(host).chat(
+            model=model,
+            messages=messages,
+            options=options or {},
+            format=format,
+            stream=True,
+        )
+        async for chunk in chunks:
+            piece = str(chunk["message"]["content"])
+            if piece:
+                pieces.append(piece)
+                on_token(piece)
+        return "".join(pieces)
+
+
+LLM = LLMClient()
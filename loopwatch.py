@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
+
+import config
+from metrics import METRICS
+
+# When the runway freezes, Cruella wants the name of whoever tripped.
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag and catches the culprit red-handed.
+
+    A coroutine on the loop stamps a heartbeat every ``interval`` seconds and
+    records how late it woke up. A daemon thread watches that heartbeat; if the
+    loop goes silent for longer than ``threshold`` it grabs the loop thread's
+    stack *while it is still blocked* and logs it.
+    """
+
+    def __init__(
+        self,
+        interval: float = config.LOOP_WATCHDOG_INTERVAL,
+        threshold: float = config.LOOP_BLOCK_THRESHOLD,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self._beat = time.monotonic()
+        self._reported_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_dump = time.monotonic()
+        self.profiler = ProfilerSwitch()
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="cruella-watchdog", daemon=True
+        )
+        self._thread.start()
+        self.profiler.install(loop)
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.profiler.finish()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._beat = now
+            lag = max(0.0, now - started - self.interval)
+            METRICS.observe("loop_lag_ms", lag * 1000.0)
+            METRICS.set_gauge("loop_lag_ms", lag * 1000.0)
+            if lag >= self.threshold:
+                logging.warning(
+                    "⏱️ Event loop stalled %.0f ms. Someone is hogging the runway.",
+                    lag * 1000.0,
+                )
+            self.profiler.poll_trigger()
+            if now - self._last_dump >= config.METRICS_DUMP_INTERVAL:
+                self._last_dump = now
+                METRICS.dump(config.METRICS_PATH)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            stalled = time.monotonic() - beat
+            if stalled < self.threshold or beat == self._reported_beat:
+                continue
+            # One stack per stall — the coat does not need the same confession twice.
+            self._reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            METRICS.inc("loop_blocked_total")
+            logging.warning(
+                "🧊 Event loop blocked for %.0f ms so far. Caught mid-crime:\n%s",
+                stalled * 1000.0,
+                stack,
+            )
+
+
+class ProfilerSwitch:
+    """
+    Flip cProfile on inside the running arena for a few seconds, then dump it.
+
+    Triggered by SIGUSR1 (where the platform has it) or by touching
+    ``config.PROFILE_TRIGGER_PATH``. The trigger file may contain the number of
+    seconds to profile; otherwise ``config.PROFILE_SECONDS`` is used.
+    """
+
+    def __init__(self) -> None:
+        self._profiler: Optional[cProfile.Profile] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def install(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        sigusr1 = getattr(signal, "SIGUSR1", None)
+        if sigusr1 is None:
+            return
+        try:
+            loop.add_signal_handler(sigusr1, self.trigger)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows, or not the main thread. The trigger file still works.
+
+    @property
+    def active(self) -> bool:
+        return self._profiler is not None
+
+    def poll_trigger(self) -> None:
+        path = Path(config.PROFILE_TRIGGER_PATH)
+        if not path.exists():
+            return
+        seconds = config.PROFILE_SECONDS
+        try:
+            raw = path.read_text(encoding="utf-8").strip()
+            if raw:
+                seconds = float(raw)
+            path.unlink()
+        except (OSError, ValueError) as exc:
+            logging.error("Profile trigger was illegible, darling: %s", exc)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self.trigger(seconds)
+
+    def trigger(self, seconds: Optional[float] = None) -> None:
+        """Start a profiling window. Must be called on the loop thread."""
+        if self._loop is None or self.active:
+            return
+        seconds = seconds if seconds is not None else config.PROFILE_SECONDS
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        self._timer = self._loop.call_later(seconds, self.finish)
+        logging.info("🔬 Profiling the arena for %.1fs...", seconds)
+
+    def finish(self) -> None:
+        if self._profiler is None:
+            return
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        stem = os.path.join(config.PROFILE_DIR, f"profile_{int(time.time())}")
+        profiler.dump_stats(f"{stem}.prof")
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(40)
+        with open(f"{stem}.txt", "w", encoding="utf-8") as f:
+            f.write(report.getvalue())
+        logging.info("🔬 Profile dumped to %s.prof / .txt", stem)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import config
+from models import SoulState
+
+# Cruella doesn't count the whole kennel every round. She keeps a guest list.
+
+
+class AliveIndex:
+    """
+    Dense array of souls plus an id → slot map. Add, discard and uniform random
+    choice are all O(1): removal swaps the victim with the last slot.
+    """
+
+    def __init__(self, souls: Iterable[SoulState] = ()) -> None:
+        self._souls: List[SoulState] = []
+        self._pos: Dict[str, int] = {}
+        for soul in souls:
+            self.add(soul)
+
+    def __len__(self) -> int:
+        return len(self._souls)
+
+    def __contains__(self, soul_id: object) -> bool:
+        return soul_id in self._pos
+
+    def __iter__(self) -> Iterator[SoulState]:
+        return iter(self._souls)
+
+    def get(self, soul_id: str) -> Optional[SoulState]:
+        pos = self._pos.get(soul_id)
+        return None if pos is None else self._souls[pos]
+
+    def choice(self, rng: Any) -> SoulState:
+        return self._souls[rng.randrange(len(self._souls))]
+
+    def add(self, soul: SoulState) -> None:
+        if soul.id in self._pos:
+            return
+        self._pos[soul.id] = len(self._souls)
+        self._souls.append(soul)
+
+    def discard(self, soul_id: str) -> Optional[SoulState]:
+        pos = self._pos.pop(soul_id, None)
+        if pos is None:
+            return None
+        victim = self._souls[pos]
+        last = self._souls.pop()
+        if last is not victim:
+            self._souls[pos] = last
+            self._pos[last.id] = pos
+        return victim
+
+
+class Matchmaker:
+    """
+    Keeps living souls split into *idle* (ready to fight) and *busy* (in a
+    battle). ``pop_pair`` hands out two idle souls and ``release`` puts a
+    survivor back — no per-round scan of the whole population, dead
+    generations included.
+
+    ``MATCHMAKING=rating`` buckets idle souls by kill count and pairs each
+    pick with the nearest-rated rival; bucket count grows with the log of the
+    population, so a pop stays cheap at 100k+ souls.
+    """
+
+    def __init__(
+        self,
+        souls: Iterable[SoulState] = (),
+        mode: str = config.MATCHMAKING,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.mode = mode
+        self.rng: Any = rng if rng is not None else random  # module stream by default
+        self.idle = AliveIndex()
+        self.busy: Dict[str, SoulState] = {}
+        self._buckets: Dict[int, AliveIndex] = {}
+        for soul in souls:
+            if soul.alive:
+                self.add(soul)
+
+    @property
+    def alive(self) -> int:
+        """Living souls, fighting or not (a fresh corpse counts until released)."""
+        return len(self.idle) + len(self.busy)
+
+    def add(self, soul: SoulState) -> None:
+        if not soul.alive or soul.id in self.busy:
+            return
+        self.idle.add(soul)
+        if self.mode == "rating":
+            self._buckets.setdefault(soul.kills, AliveIndex()).add(soul)
+
+    def _take(self, soul: SoulState) -> SoulState:
+        self.idle.discard(soul.id)
+        if self.mode == "rating":
+            bucket = self._buckets.get(soul.kills)
+            if bucket is not None:
+                bucket.discard(soul.id)
+                if not len(bucket):
+                    del self._buckets[soul.kills]
+        self.busy[soul.id] = soul
+        return soul
+
+    def claim(self, soul_id: str) -> Optional[SoulState]:
+        """Mark a specific soul busy — e.g. one already promised to a queued job."""
+        soul = self.idle.get(soul_id)
+        return None if soul is None else self._take(soul)
+
+    def pop_pair(self) -> Optional[Tuple[SoulState, SoulState]]:
+        if len(self.idle) < 2:
+            return None
+        first = self._take(self.idle.choice(self.rng))
+        return first, self._take(self._rival(first))
+
+    def _rival(self, first: SoulState) -> SoulState:
+        if self.mode != "rating" or not self._buckets:
+            return self.idle.choice(self.rng)
+        nearest = min(self._buckets, key=lambda kills: abs(kills - first.kills))
+        return self._buckets[nearest].choice(self.rng)
+
+    def release(self, soul: SoulState) -> None:
+        """A battle is over. Survivors go back in the pool; the dead just leave."""
+        self.busy.pop(soul.id, None)
+        if soul.alive:
+            self.add(soul)
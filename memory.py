@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Deque, Dict, Iterator, Optional, Tuple
+
+import config
+from retrieval import MemoryIndex
+
+# The coat never forgets. The log on disk keeps every scream; the ring keeps the loud ones close.
+
+
+@dataclass
+class MemoryEntry:
+    """One stitch in the coat's memory — usually a kill, always a confession."""
+
+    text: str
+    kind: str = "kill"
+    spot: int = 0
+    generation: int = 1
+    winner_id: str = ""
+    loser_id: str = ""
+    battle_type: str = ""
+    timestamp: float = 0.0
+    seq: int = 0  # position in the log; summaries use it to say what they cover
+    tier: str = ""  # summaries only: "chunk" or "generation"
+    through: int = 0  # summaries only: last raw ``seq`` folded into this one
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> MemoryEntry:
+        return cls(
+            text=str(data.get("text", "")),
+            kind=str(data.get("kind", "kill")),
+            spot=int(data.get("spot", 0)),
+            generation=int(data.get("generation", 1)),
+            winner_id=str(data.get("winner_id", "")),
+            loser_id=str(data.get("loser_id", "")),
+            battle_type=str(data.get("battle_type", "")),
+            timestamp=float(data.get("timestamp", 0.0)),
+            seq=int(data.get("seq", 0)),
+            tier=str(data.get("tier", "")),
+            through=int(data.get("through", 0)),
+        )
+
+    @property
+    def is_summary(self) -> bool:
+        return self.kind == "summary"
+
+
+class CollectiveMemory:
+    """
+    Append-only JSONL log plus an in-memory ring buffer of the freshest snippets.
+
+    The log at ``config.MEMORY_LOG_PATH`` is the full history and is never
+    truncated. The ring holds at most ``capacity`` raw snippets so prompt
+    assembly only ever touches a bounded window, and ``window`` builds essence
+    with a single join instead of concatenating and re-slicing a growing string.
+
+    Summaries written by the background summarizer live in the same log and
+    are kept per tier, so ``context`` can hand prompts the compressed past plus
+    a short raw tail no matter how long the arena has been running.
+    """
+
+    def __init__(
+        self,
+        path: str = config.MEMORY_LOG_PATH,
+        capacity: int = config.MEMORY_RING_SIZE,
+    ) -> None:
+        self.path = path
+        self.ring: Deque[MemoryEntry] = deque(maxlen=capacity)
+        self.summaries: Dict[str, Deque[MemoryEntry]] = {
+            "chunk": deque(maxlen=config.SUMMARY_KEEP_PER_TIER),
+            "generation": deque(maxlen=config.SUMMARY_KEEP_PER_TIER),
+        }
+        self.summarized_through = 0  # last raw seq covered by a chunk summary
+        self.total = 0
+        self._offset = 0
+        self._scanned = 0  # log bytes the archivist never needs to read again
+        self._handle: Optional[IO[str]] = None
+        self.index: Optional[MemoryIndex] = (
+            MemoryIndex() if MemoryIndex.available() else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    def load(self) -> None:
+        """Replay the log into the ring. Only the tail survives in memory."""
+        self.ring.clear()
+        for tier in self.summaries.values():
+            tier.clear()
+        self.summarized_through = 0
+        self.total = 0
+        if self.index is not None:
+            self.index = MemoryIndex(self.index.capacity, self.index.embedder)
+        self._offset = 0
+        self._scanned = 0
+        self.refresh()
+        if self.total:
+            logging.info("🧠 Coat memory loaded — %s stitches on record.", self.total)
+
+    def refresh(self) -> int:
+        """
+        Pull in entries appended since the last read — e.g. by the arena while
+        the dashboard watches. Half-written trailing lines are left for later.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        added = 0
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                self._offset += len(raw)
+                try:
+                    entry = MemoryEntry.from_dict(json.loads(raw))
+                except (ValueError, TypeError) as exc:
+                    logging.error("A memory came back mangled, darling: %s", exc)
+                    continue
+                entry.seq = entry.seq or self.total + 1
+                self._remember(entry)
+                added += 1
+        return added
+
+    def seed_from_essence(self, essence: str) -> None:
+        """Legacy arenas kept memory only in ``CollectiveState.essence``. Adopt it."""
+        for line in (essence or "").splitlines():
+            line = line.strip()
+            if line:
+                self.append(MemoryEntry(text=line, kind="legacy"))
+
+    def append(self, entry: MemoryEntry) -> None:
+        """Sew a new memory in: one line on disk, one slot in the ring."""
+        if not entry.timestamp:
+            entry.timestamp = time.time()
+        if not entry.seq:
+            entry.seq = self.total + 1
+        line = json.dumps(entry.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        if self._handle is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._handle = open(self.path, "a", encoding="utf-8")
+        self._handle.write(line + "\n")
+        self._handle.flush()
+        self._offset = self._handle.tell()
+        self._remember(entry)
+
+    def _remember(self, entry: MemoryEntry) -> None:
+        self.total += 1
+        if entry.is_summary:
+            self.summaries.setdefault(entry.tier, deque()).append(entry)
+            if entry.tier == "chunk":
+                self.summarized_through = max(self.summarized_through, entry.through)
+            return
+        self.ring.append(entry)
+        if self.index is not None:
+            self.index.add(entry.text)
+
+    def window(self, max_chars: int) -> str:
+        """
+        The newest snippets that fit in ``max_chars``, oldest first.
+        Walks the ring backwards and joins once — whole snippets, never mid-word.
+        """
+        picked: list[str] = []
+        used = 0
+        for entry in reversed(self.ring):
+            cost = len(entry.text) + 1
+            if picked and used + cost > max_chars:
+                break
+            picked.append(entry.text)
+            used += cost
+        picked.reverse()
+        return "\n".join(picked)[-max_chars:] if picked else ""
+
+    def relevant(self, query: str, max_chars: int) -> str:
+        """
+        The memories most relevant to ``query`` under the retrieval token budget.
+        Falls back to the recency window when NumPy is absent or nothing is asked.
+        """
+        if self.index is None or not query.strip():
+            return self.window(max_chars)
+        return "\n".join(self.index.select(query))[-max_chars:]
+
+    def unsummarized(self, limit: int) -> list[MemoryEntry]:
+        """
+        Up to ``limit`` of the oldest raw snippets no chunk summary covers yet.
+        Served from the ring; falls back to the log if the backlog outran it,
+        resuming past the lines an earlier scan found already covered. Safe to
+        run off the loop: it reads a copy of the ring and its own file handle.
+        """
+        through = self.summarized_through
+        ring = list(self.ring)
+        if not (ring and ring[0].seq > through + 1):
+            return [e for e in ring if e.seq > through][:limit]
+        pending: list[MemoryEntry] = []
+        for end, entry in self._scan(self._scanned):
+            if entry.is_summary or entry.seq <= through:
+                if not pending:
+                    self._scanned = end  # covered for good: summaries only move forward
+                continue
+            pending.append(entry)
+            if len(pending) >= limit:
+                break
+        return pending
+
+    def context(self, max_chars: int, query: str = "") -> str:
+        """
+        Essence for a prompt: the summary tiers first, then the raw snippets no
+        summary covers yet (or the most relevant ones to ``query``), all
+        trimmed to ``max_chars``. Size stays flat as the log grows.
+        """
+        generations = list(self.summaries.get("generation", ()))[
+            -config.SUMMARY_PROMPT_GENERATIONS :
+        ]
+        rolled = generations[-1].through if generations else 0
+        chunks = [e for e in self.summaries.get("chunk", ()) if e.through > rolled][
+            -config.SUMMARY_PROMPT_CHUNKS :
+        ]
+        tiers = [e.text for e in generations + chunks]
+        if not tiers:
+            return self.relevant(query, max_chars)
+
+        header = "\n".join(tiers)
+        remaining = max_chars - len(header) - 1
+        if remaining <= 0:
+            return header[-max_chars:]
+        if query.strip() and self.index is not None:
+            fresh = self.relevant(query, remaining)
+        else:
+            tail = [e.text for e in self.ring if e.seq > self.summarized_through]
+            fresh = "\n".join(tail)[-remaining:]
+        return f"{header}\n{fresh}" if fresh else header
+
+    def history(self) -> Iterator[MemoryEntry]:
+        """Stream the full, untruncated record from disk."""
+        for _, entry in self._scan(0):
+            yield entry
+
+    def _scan(self, offset: int) -> Iterator[Tuple[int, MemoryEntry]]:
+        """Complete log lines from byte ``offset`` on, each with the offset just past it."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # still being written
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                try:
+                    yield offset, MemoryEntry.from_dict(json.loads(raw))
+                except (ValueError, TypeError):
+                    continue
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
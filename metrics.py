@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+# Cruella keeps receipts. Every stall, every prompt, every limit — tallied in one ledger.
+
+HISTOGRAM_SAMPLES = 2048
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile. Good enough for a villain's dashboard."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+class Metrics:
+    """
+    A tiny, thread-safe ledger of counters, gauges and rolling histograms.
+    Cheap to write from the hot path; summaries are only computed on demand.
+    """
+
+    def __init__(self, samples: int = HISTOGRAM_SAMPLES) -> None:
+        self._lock = threading.Lock()
+        self._samples = samples
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Deque[float]] = {}
+
+    def inc(self, name: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = deque(maxlen=self._samples)
+            hist.append(value)
+
+    def summary(self, name: str) -> Dict[str, float]:
+        """p50/p95/max over the retained window of one histogram."""
+        with self._lock:
+            values = list(self.histograms.get(name, ()))
+        return {
+            "count": float(len(values)),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": max(values) if values else 0.0,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything Cruella knows right now, ready for JSON."""
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            names = list(self.histograms)
+        return {
+            "timestamp": time.time(),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": {name: self.summary(name) for name in names},
+        }
+
+    def dump(self, path: str) -> None:
+        """Atomically write the snapshot next to the arena state."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def log_summary(self, prefix: str = "") -> None:
+        """Whisper the histogram tails into the log."""
+        with self._lock:
+            names = sorted(n for n in self.histograms if n.startswith(prefix))
+        for name in names:
+            s = self.summary(name)
+            logging.info(
+                "📊 %s n=%d p50=%.1f p95=%.1f max=%.1f",
+                name,
+                s["count"],
+                s["p50"],
+                s["p95"],
+                s["max"],
+            )
+
+
+# One ledger per process. The coat does not do bookkeeping twice.
+METRICS = Metrics()
@@ -1,7 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+try:  # optional speed-ups; stdlib JSON is always there
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
 
 
 @dataclass
@@ -25,7 +39,18 @@ class SoulState:
 
     def to_dict(self) -> Dict[str, Any]:
         """Flatten this doomed little darling for the freezer."""
-        return asdict(self)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "trait": self.trait,
+            "generation": self.generation,
+            "lineage": list(self.lineage),
+            "kills": self.kills,
+            "deaths": self.deaths,
+            "alive": self.alive,
+            "essence": self.essence,
+            "absorbed_at": self.absorbed_at,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> SoulState:
@@ -54,7 +79,19 @@ class BattleRecord:
 
     def to_dict(self) -> Dict[str, Any]:
         """Package the carnage for posterity."""
-        return asdict(self)
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "battle_type": self.battle_type,
+            "soul_a_id": self.soul_a_id,
+            "soul_b_id": self.soul_b_id,
+            "winner_id": self.winner_id,
+            "loser_id": self.loser_id,
+            "judge_summary": self.judge_summary,
+            "soul_a_output": self.soul_a_output,
+            "soul_b_output": self.soul_b_output,
+            "kill_number": self.kill_number,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> BattleRecord:
@@ -80,7 +117,15 @@ class CollectiveState:
 
     def to_dict(self) -> Dict[str, Any]:
         """Bottle the coat's venom for later."""
-        return asdict(self)
+        return {
+            "essence": self.essence,
+            "spots_claimed": self.spots_claimed,
+            "kill_count": self.kill_count,
+            "current_generation": self.current_generation,
+            "tagline": self.tagline,
+            "coat_complete": self.coat_complete,
+            "coat_complete_reason": self.coat_complete_reason,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> CollectiveState:
@@ -119,3 +164,146 @@ class ArenaState:
         ]
 
         return cls(souls=souls, collective=collective, battles=battles)
+
+
+# ─── Codecs — how the circus is frozen ────────────────────────────────────────
+# Every codec turns the flat ``to_dict`` tree into bytes and back. Readers
+# sniff the format from the first bytes, so a state file written by any codec
+# loads no matter what ``STATE_CODEC`` says today.
+
+SNAPSHOT_MAGIC = b"\x89CRUELLA\n"
+
+
+class StateCodec:
+    """Stdlib JSON, compact separators, UTF-8. Always available."""
+
+    name = "json"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        return json.loads(raw)
+
+
+class OrjsonCodec(StateCodec):
+    """Same JSON on disk, produced and parsed in C."""
+
+    name = "orjson"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        return orjson.loads(raw)
+
+
+class MsgpackCodec(StateCodec):
+    """Binary and smaller. Not for reading with your eyes, darling."""
+
+    name = "msgpack"
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+class SnapshotCodec(StateCodec):
+    """
+    Compressed binary snapshot: magic header, inner codec name, then a zlib
+    stream of msgpack (or JSON when msgpack isn't installed).
+    """
+
+    name = "snapshot"
+
+    def __init__(self, level: int = 6) -> None:
+        self.level = level
+        self.inner = _codec_or_fallback("msgpack")
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        header = SNAPSHOT_MAGIC + self.inner.name.encode("ascii") + b"\n"
+        return header + zlib.compress(self.inner.encode(data), self.level)
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        inner_name, _, body = raw[len(SNAPSHOT_MAGIC) :].partition(b"\n")
+        return _codec_or_fallback(inner_name.decode("ascii")).decode(
+            zlib.decompress(body)
+        )
+
+
+CODECS: Dict[str, Callable[[], StateCodec]] = {
+    "json": StateCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+    "snapshot": SnapshotCodec,
+}
+
+_AVAILABLE = {
+    "json": True,
+    "orjson": orjson is not None,
+    "msgpack": msgpack is not None,
+    "snapshot": True,
+}
+
+
+def _codec_or_fallback(name: str) -> StateCodec:
+    if name == "msgpack" and msgpack is None:
+        return StateCodec()
+    if name == "orjson" and orjson is None:
+        return StateCodec()
+    return CODECS[name]()
+
+
+def get_codec(name: str = "json") -> StateCodec:
+    """Pick a codec by name; missing optional libraries fall back to stdlib JSON."""
+    name = (name or "json").strip().lower()
+    if name not in CODECS:
+        raise ValueError(f"Unknown state codec {name!r}; pick one of {sorted(CODECS)}")
+    if not _AVAILABLE[name]:
+        logging.warning("State codec %r is not installed; freezing as JSON.", name)
+        return StateCodec()
+    return CODECS[name]()
+
+
+def sniff_codec(raw: bytes) -> StateCodec:
+    """Guess the codec from the first bytes of a frozen state."""
+    if raw.startswith(SNAPSHOT_MAGIC):
+        return SnapshotCodec()
+    head = raw.lstrip()[:1]
+    if head in (b"{", b"["):
+        return _codec_or_fallback("orjson")
+    if msgpack is None:
+        raise RuntimeError(
+            "This state was frozen with msgpack, but msgpack is not installed "
+            "(pip install msgpack)."
+        )
+    return MsgpackCodec()
+
+
+def encode_state(state: ArenaState, codec: Optional[StateCodec] = None) -> bytes:
+    return (codec or StateCodec()).encode(state.to_dict())
+
+
+def decode_state(raw: bytes) -> ArenaState:
+    return ArenaState.from_dict(sniff_codec(raw).decode(raw))
+
+
+def save_state(
+    state: ArenaState, path: str, codec: Optional[StateCodec] = None
+) -> None:
+    """Freeze the circus atomically: write a sibling temp file, then swap it in."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_state(state, codec))
+    os.replace(tmp_path, path)
+
+
+def load_state(path: str) -> ArenaState:
+    """Thaw the circus from whatever format it was frozen in."""
+    with open(path, "rb") as f:
+        return decode_state(f.read())
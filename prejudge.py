@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import config
+from metrics import METRICS
+from recorder import battle_rng
+
+# Some duels don't need a critic. A puppy who whimpers three words has already lost.
+
+_WORD = re.compile(r"[\w']+")
+_CLEAN_ENDINGS = tuple(".!?\"')*~…")
+
+FEATURES = [
+    "log_chars",
+    "log_words",
+    "distinct_words",
+    "mean_word_len",
+    "exclaims",
+    "shouting",
+    "you_density",
+    "non_ascii",
+    "clean_ending",
+]
+
+# Agreement is reported at each of these confidences, so PREJUDGE_CONFIDENCE
+# can be tuned from the log instead of guessed.
+AGREEMENT_THRESHOLDS = (0.6, 0.7, 0.8, 0.9, 0.95)
+
+SILENT_REASONS = [
+    "A silent puppy is a skinned puppy.",
+    "Nothing to say? Then nothing to keep. Into the coat.",
+    "Cruella doesn't wait for whimpers that never come.",
+]
+LOPSIDED_REASONS = [
+    "Not even close, darling. The critic didn't need to look up.",
+    "Outclassed before the second sentence. Skinned on sight.",
+    "One of them came to kill; the other came to be a lining.",
+]
+
+
+def features(text: str) -> List[float]:
+    """A few cheap numbers about one performance, each roughly in 0..8."""
+    text = text.strip()
+    if not text:
+        return [0.0] * len(FEATURES)
+    words = _WORD.findall(text.lower())
+    n_words = max(1, len(words))
+    letters = [c for c in text if c.isalpha()]
+    return [
+        math.log1p(len(text)),
+        math.log1p(len(words)),
+        len(set(words)) / n_words,
+        min(4.0, sum(len(w) for w in words) / n_words / 2),
+        min(2.0, text.count("!") * 5 / n_words),
+        sum(c.isupper() for c in letters) / max(1, len(letters)),
+        min(2.0, sum(w in ("you", "your", "you're") for w in words) * 10 / n_words),
+        sum(ord(c) > 127 for c in text) / len(text),
+        1.0 if text.endswith(_CLEAN_ENDINGS) else 0.0,
+    ]
+
+
+def _sigmoid(z: float) -> float:
+    if z < -30:
+        return 0.0
+    if z > 30:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+@dataclass(frozen=True)
+class Call:
+    """What the pre-judge thinks: who wins, and how sure it is (0.5..1)."""
+
+    winner: int
+    confidence: float
+    reason: str
+
+
+class RulePrejudge:
+    """
+    Only the undeniable: one contestant said nothing at all. Everything else
+    goes to the LLM judge.
+    """
+
+    name = "rules"
+    path = ""
+
+    def decide(self, out_a: str, out_b: str) -> Optional[Call]:
+        """A verdict if the duel is obvious, else None."""
+        empty_a, empty_b = not out_a.strip(), not out_b.strip()
+        if empty_a != empty_b:
+            return Call(1 if empty_a else 0, 1.0, battle_rng().choice(SILENT_REASONS))
+        return None
+
+    def predict(self, out_a: str, out_b: str) -> Optional[Call]:
+        """Best guess even for close duels, used to score against the judge."""
+        return self.decide(out_a, out_b)
+
+    def learn(self, out_a: str, out_b: str, winner: int) -> None:
+        pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {}
+
+    def save(self) -> None:
+        pass
+
+
+class LinearPrejudge(RulePrejudge):
+    """
+    The rules, then a logistic model over the difference between the two
+    performances' ``features``, trained online on every verdict the LLM
+    judge hands down. Once it has seen ``min_verdicts`` of them it settles
+    any duel it calls with at least ``confidence``; the rest go to the judge.
+
+    A slice of its confident calls (``audit_rate``) still go to the judge
+    anyway, so agreement on the calls it actually makes stays measured.
+    Weights persist as JSON at ``path``.
+    """
+
+    name = "linear"
+    LEARNING_RATE = 0.05
+    L2 = 1e-4
+
+    def __init__(
+        self,
+        path: str = config.PREJUDGE_MODEL_PATH,
+        confidence: float = config.PREJUDGE_CONFIDENCE,
+        min_verdicts: int = config.PREJUDGE_MIN_VERDICTS,
+        audit_rate: float = config.PREJUDGE_AUDIT_RATE,
+    ) -> None:
+        self.path = path
+        self.confidence = confidence
+        self.min_verdicts = min_verdicts
+        self.audit_rate = audit_rate
+        self.weights = [0.0] * len(FEATURES)
+        self.bias = 0.0  # the judge's taste for whoever spoke first
+        self.trained = 0
+        self.agreement = Agreement()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("features") != FEATURES:
+                return  # trained on a different feature set; start over
+            self.weights = [float(w) for w in data["weights"]]
+            self.bias = float(data["bias"])
+            self.trained = int(data["trained"])
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logging.warning("Pre-judge weights unreadable (%s). Starting blind.", exc)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "features": FEATURES,
+            "weights": self.weights,
+            "bias": self.bias,
+            "trained": self.trained,
+        }
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, self.path)
+
+    def _diff(self, out_a: str, out_b: str) -> List[float]:
+        return [fa - fb for fa, fb in zip(features(out_a), features(out_b))]
+
+    def _p_a(self, x: List[float]) -> float:
+        return _sigmoid(self.bias + sum(w * v for w, v in zip(self.weights, x)))
+
+    def predict(self, out_a: str, out_b: str) -> Optional[Call]:
+        ruled = super().decide(out_a, out_b)
+        if ruled is not None:
+            return ruled
+        if self.trained < self.min_verdicts:
+            return None
+        p_a = self._p_a(self._diff(out_a, out_b))
+        winner = 0 if p_a >= 0.5 else 1
+        return Call(winner, max(p_a, 1.0 - p_a), battle_rng().choice(LOPSIDED_REASONS))
+
+    def decide(self, out_a: str, out_b: str) -> Optional[Call]:
+        call = self.predict(out_a, out_b)
+        if call is None or call.confidence < self.confidence:
+            return None
+        if call.confidence < 1.0 and battle_rng().random() < self.audit_rate:
+            METRICS.inc("prejudge.audited")
+            return None
+        return call
+
+    def learn(self, out_a: str, out_b: str, winner: int) -> None:
+        """One SGD step on the judge's verdict; also scores our own guess."""
+        guess = self.predict(out_a, out_b)
+        if guess is not None:
+            self.agreement.add(guess.confidence, guess.winner == winner)
+        x = self._diff(out_a, out_b)
+        error = (1.0 if winner == 0 else 0.0) - self._p_a(x)
+        rate = self.LEARNING_RATE
+        self.weights = [
+            w + rate * (error * v - self.L2 * w) for w, v in zip(self.weights, x)
+        ]
+        self.bias += rate * error
+        self.trained += 1
+        if self.trained % config.PREJUDGE_SAVE_EVERY == 0:
+            self.save()
+
+
+class Agreement:
+    """
+    Rolling record of how often the pre-judge's guess matched the LLM judge.
+    Confident guesses are mostly settled without the judge, so the high
+    thresholds fill in through audits and the low ones through close calls.
+    """
+
+    def __init__(self, window: int = 2000) -> None:
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self._seen = 0
+
+    def add(self, confidence: float, agreed: bool) -> None:
+        self.samples.append((confidence, agreed))
+        METRICS.inc("prejudge.agree" if agreed else "prejudge.disagree")
+        self._seen += 1
+        if config.PREJUDGE_LOG_EVERY and self._seen % config.PREJUDGE_LOG_EVERY == 0:
+            self.report()
+
+    def at(self, threshold: float) -> Tuple[float, float]:
+        """(agreement, share of duels) among guesses at least this confident."""
+        sure = [
+            agreed for confidence, agreed in self.samples if confidence >= threshold
+        ]
+        if not sure:
+            return 0.0, 0.0
+        return sum(sure) / len(sure), len(sure) / len(self.samples)
+
+    def report(self) -> None:
+        overall, _ = self.at(0.0)
+        METRICS.set_gauge("prejudge.agreement", round(overall, 3))
+        cells = []
+        for threshold in AGREEMENT_THRESHOLDS:
+            rate, share = self.at(threshold)
+            pct = int(round(threshold * 100))
+            METRICS.set_gauge(f"prejudge.agreement.{pct}", round(rate, 3))
+            METRICS.set_gauge(f"prejudge.coverage.{pct}", round(share, 3))
+            cells.append(f"≥{threshold:g}: {rate:.0%} on {share:.0%}")
+        logging.info(
+            "⚖️ Pre-judge agrees with the critic %.0f%% of the time (n=%s); %s",
+            overall * 100,
+            len(self.samples),
+            ", ".join(cells),
+        )
+
+
+PREJUDGES = {"rules": RulePrejudge, "linear": LinearPrejudge}
+
+
+def get_prejudge(
+    name: str = config.PREJUDGE, read_only: bool = False
+) -> Optional[RulePrejudge]:
+    """
+    The configured pre-judge, or None when every duel should go to the LLM.
+    A ``read_only`` one starts from the saved weights but never writes them
+    back: shards and queue workers learn in memory and report every judged
+    verdict, and the coordinator learns from those and owns the file.
+    """
+    name = (name or "off").strip().lower()
+    if name == "off":
+        return None
+    if name not in PREJUDGES:
+        raise ValueError(
+            f"Unknown pre-judge {name!r}; pick off or one of {sorted(PREJUDGES)}"
+        )
+    prejudge = PREJUDGES[name]()
+    if read_only:
+        prejudge.path = ""
+    return prejudge
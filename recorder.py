@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import config
+from metrics import METRICS
+
+# Cruella likes a rerun. Every scream, every roll of the dice, taped so the show can play again.
+
+# One RNG per battle, seeded from the battle's own seed, so a duel's dice don't
+# shift when other duels finish in a different order.
+BATTLE_RNG: ContextVar[Optional[random.Random]] = ContextVar("BATTLE_RNG", default=None)
+
+# Knobs that change what a session does; the tape keeps them so a rerun matches.
+SESSION_KNOBS = [
+    "NUM_STARTING_SOULS",
+    "MAX_PARALLEL_BATTLES",
+    "GENERATION_WATERMARK",
+    "MATCHMAKING",
+    "DUEL_MODE",
+    "PREJUDGE",
+    "PREJUDGE_CONFIDENCE",
+    "PREJUDGE_MIN_VERDICTS",
+    "PREJUDGE_AUDIT_RATE",
+    "LLM_LIMIT_INITIAL",
+    "MODEL_CONTESTANT",
+    "MODEL_JUDGE",
+    "MODEL_COLLECTIVE",
+]
+
+_DIGITS = re.compile(r"\d+")
+
+
+def battle_rng() -> Any:
+    """The running battle's RNG, or the module stream outside a battle."""
+    rng = BATTLE_RNG.get()
+    return rng if rng is not None else random
+
+
+def request_key(model: str, messages: List[Dict[str, str]], format: str = "") -> str:
+    """Exact fingerprint of one LLM request."""
+    raw = json.dumps([model, format, messages], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def loose_key(model: str, messages: List[Dict[str, str]], format: str = "") -> str:
+    """
+    The same request with every number blurred: spot counts, seeds and
+    ordinals drift when battles finish in a different order, but the same
+    two puppies in the same kind of duel still match.
+    """
+    blurred = [
+        {**m, "content": _DIGITS.sub("#", m.get("content", ""))} for m in messages
+    ]
+    return request_key(model, blurred, format)
+
+
+class SessionTape:
+    """
+    Append-only JSONL recording of one arena session: a ``session`` header
+    (seed and knobs), a ``snapshot`` of the starting state, then ``llm``
+    calls (request, response or failure, latency), ``battle`` pairings with
+    their seeds, ``kill`` and ``generation`` events, and a closing ``end``.
+    A replayed session also notes every ``borrowed`` answer.
+
+    Disabled (every write a no-op) until ``open`` is called.
+    """
+
+    def __init__(self) -> None:
+        self.path = ""
+        self.started = 0.0
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._handle is not None
+
+    def open(self, path: str, seed: int) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.started = time.perf_counter()
+        self._handle = open(path, "w", encoding="utf-8")
+        self.write(
+            "session",
+            seed=seed,
+            knobs={name: getattr(config, name) for name in SESSION_KNOBS},
+            replay_of=config.ARENA_REPLAY,
+        )
+        logging.info("📼 Recording this session to %s (seed %s).", path, seed)
+
+    def write(self, kind: str, **fields: Any) -> None:
+        if self._handle is None:
+            return
+        self._handle.write(
+            json.dumps(
+                {"kind": kind, **fields}, ensure_ascii=False, separators=(",", ":")
+            )
+            + "\n"
+        )
+
+    def llm(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        format: str,
+        priority: str,
+        response: str,
+        latency: float,
+        outcome: str = "",
+        error: str = "",
+    ) -> None:
+        """One finished call; a failed one has ``outcome`` timeout or error."""
+        if self._handle is None:
+            return
+        failure = {"outcome": outcome, "error": error} if outcome else {}
+        self.write(
+            "llm",
+            key=request_key(model, messages, format),
+            loose=loose_key(model, messages, format),
+            model=model,
+            format=format,
+            priority=priority,
+            messages=messages,
+            response=response,
+            latency=round(latency, 4),
+            **failure,
+        )
+
+    def close(self, **fields: Any) -> None:
+        """Write the ``end`` line (wall time plus whatever the caller adds) and close."""
+        if self._handle is None:
+            return
+        self.write(
+            "end", seconds=round(time.perf_counter() - self.started, 3), **fields
+        )
+        self._handle.close()
+        self._handle = None
+
+
+TAPE = SessionTape()
+
+
+def read_tape(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            try:
+                yield json.loads(raw)
+            except ValueError:
+                continue  # a torn last line from a crashed session
+
+
+class ReplayedError(RuntimeError):
+    """A call that failed in the recorded session fails again in the rerun."""
+
+
+class _Take:
+    __slots__ = ("response", "latency", "outcome", "error", "used")
+
+    def __init__(
+        self, response: str, latency: float, outcome: str = "", error: str = ""
+    ) -> None:
+        self.response = response
+        self.latency = latency
+        self.outcome = outcome
+        self.error = error
+        self.used = False
+
+
+class ReplayBackend:
+    """
+    Stands in for ``ollama.AsyncClient``, answering from a tape. A request is
+    matched by its exact fingerprint first, then by ``loose_key``; a recorded
+    timeout or error is raised again. Anything else borrows a successful
+    answer (same model and format if possible), picked by the request's hash
+    so reruns stay deterministic, and is counted in ``borrowed`` and on the
+    new tape: a rerun with borrowed answers only approximates the original.
+    Answers arrive at once, or after their recorded latency divided by ``speed``.
+    """
+
+    def __init__(self, path: str, speed: float = config.REPLAY_SPEED) -> None:
+        self.path = path
+        self.speed = speed
+        self.seed: Optional[int] = None
+        self.borrowed = 0
+        self.exact: Dict[str, Deque[_Take]] = {}
+        self.loose: Dict[str, Deque[_Take]] = {}
+        self.pools: Dict[Any, List[_Take]] = {}
+        for event in read_tape(path):
+            kind = event.get("kind")
+            if kind == "session" and self.seed is None:
+                self.seed = int(event["seed"])
+            elif kind == "llm":
+                take = _Take(
+                    str(event["response"]),
+                    float(event.get("latency", 0.0)),
+                    str(event.get("outcome", "")),
+                    str(event.get("error", "")),
+                )
+                self.exact.setdefault(event["key"], deque()).append(take)
+                self.loose.setdefault(event["loose"], deque()).append(take)
+                if take.outcome:
+                    continue  # nobody borrows a failure
+                for pool in (
+                    (event["model"], event.get("format", "")),
+                    event["model"],
+                    None,
+                ):
+                    self.pools.setdefault(pool, []).append(take)
+        logging.info(
+            "📼 Replaying %s recorded LLM calls from %s.",
+            len(self.pools.get(None, ())),
+            path,
+        )
+
+    @staticmethod
+    def _unused(takes: Optional[Deque[_Take]]) -> Optional[_Take]:
+        while takes:
+            take = takes.popleft()
+            if not take.used:
+                return take
+        return None
+
+    def answer(
+        self, model: str, messages: List[Dict[str, str]], format: str = ""
+    ) -> _Take:
+        key = request_key(model, messages, format)
+        take = self._unused(self.exact.get(key))
+        if take is not None:
+            METRICS.inc("replay.exact")
+        else:
+            take = self._unused(self.loose.get(loose_key(model, messages, format)))
+            if take is not None:
+                METRICS.inc("replay.loose")
+        if take is not None:
+            take.used = True
+            return take
+        # Nothing recorded for this exact call: borrow from the same model and
+        # format, then the same model, then anyone — a rerun never stalls.
+        pool = (
+            self.pools.get((model, format))
+            or self.pools.get(model)
+            or self.pools.get(None)
+        )
+        if not pool:
+            raise RuntimeError(f"the tape {self.path} has no LLM calls to replay")
+        METRICS.inc("replay.borrowed")
+        self.borrowed += 1
+        if self.borrowed == 1:
+            logging.warning(
+                "📼 A %s call isn't on the tape; borrowing answers, so this rerun "
+                "only approximates the original.",
+                model,
+            )
+        TAPE.write("borrowed", model=model, format=format, key=key)
+        return pool[int(key[:8], 16) % len(pool)]
+
+    async def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        format: str = "",
+        **_: Any,
+    ) -> Dict[str, Any]:
+        take = self.answer(model, messages, format)
+        await asyncio.sleep(take.latency / self.speed if self.speed > 0 else 0)
+        if take.outcome == "timeout":
+            raise asyncio.TimeoutError()
+        if take.outcome:
+            raise ReplayedError(take.error or "recorded failure")
+        return {"message": {"role": "assistant", "content": take.response}}
+
+    async def list(self) -> Dict[str, Any]:
+        return {"models": []}
+
+
+def start_session(llm: Any) -> int:
+    """
+    Seed the session RNG and wire up record/replay from config. The seed is
+    ``ARENA_SEED``, else the replayed tape's, else fresh entropy — and is
+    always written to the tape so the run can be played again.
+    """
+    seed: Optional[int] = int(config.ARENA_SEED) if config.ARENA_SEED else None
+    if config.ARENA_REPLAY:
+        backend = ReplayBackend(config.ARENA_REPLAY)
+        llm.backend = backend
+        if seed is None:
+            seed = backend.seed
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    random.seed(seed)
+    if config.ARENA_RECORD:
+        TAPE.open(config.ARENA_RECORD, seed)
+    return seed
+
+
+def replay_env(tape: str, workdir: str, out: str) -> Dict[str, str]:
+    """
+    Environment for rerunning ``tape`` inside ``workdir``: every state path
+    redirected there, the tape's knobs restored, and the adaptive parts
+    (AIMD limit, hedging, the archivist's timer, sharding) pinned so the
+    schedule depends on the tape alone.
+    """
+    header: Dict[str, Any] = {"knobs": {}}
+    end: Dict[str, Any] = {}
+    for event in read_tape(tape):
+        if event.get("kind") == "session":
+            header = event
+        elif event.get("kind") == "end":
+            end = event
+    env = {name: str(value) for name, value in header["knobs"].items()}
+    # Pin the concurrency limit where the recorded session's AIMD ended up.
+    limits = end.get("llm_limits") or {}
+    limit = str(
+        int(max(limits.values()))
+        if limits
+        else env.get("LLM_LIMIT_INITIAL", config.LLM_LIMIT_INITIAL)
+    )
+    env.update(
+        {
+            "ARENA_REPLAY": os.path.abspath(tape),
+            "ARENA_RECORD": os.path.abspath(out),
+            "ARENA_SEED": "",
+            "ARENA_DISPATCH": "local",
+            "ARENA_SHARDS": "1",
+            "LLM_HEDGE_HOSTS": "",
+            "LLM_LIMIT_FLOOR": limit,
+            "LLM_LIMIT_CEILING": limit,
+            "SUMMARY_INTERVAL": "1e9",
+            "X_BEARER_TOKEN": "",
+        }
+    )
+    for name, rel in [
+        ("ARENA_LOG_PATH", "state/arena_state.json"),
+        ("ARCHIVE_DIR", "state/archive"),
+        ("JOURNAL_PATH", "state/battle_journal.jsonl"),
+        ("METRICS_PATH", "state/metrics.json"),
+        ("PREJUDGE_MODEL_PATH", "state/prejudge.json"),
+        ("PROFILE_TRIGGER_PATH", "state/profile.trigger"),
+        ("PROFILE_DIR", "state/profiles"),
+        ("JOB_QUEUE_PATH", "state/battle_queue.sqlite3"),
+        ("MEMORY_LOG_PATH", "memory/collective.jsonl"),
+        ("MEDIA_DIR", "media"),
+    ]:
+        env[name] = os.path.join(workdir, rel)
+    return env
+
+
+def prepare_workdir(tape: str, env: Dict[str, str]) -> None:
+    """Lay the tape's starting snapshot (state, open battles, pre-judge) into place."""
+    snapshot = next((e for e in read_tape(tape) if e.get("kind") == "snapshot"), None)
+    if snapshot is None:
+        return
+    from models import ArenaState, save_state
+
+    for name in ("ARENA_LOG_PATH", "JOURNAL_PATH", "PREJUDGE_MODEL_PATH"):
+        os.makedirs(os.path.dirname(env[name]), exist_ok=True)
+    save_state(ArenaState.from_dict(snapshot["state"]), env["ARENA_LOG_PATH"])
+    with open(env["JOURNAL_PATH"], "w", encoding="utf-8") as f:
+        for page in snapshot.get("journal", []):
+            f.write(json.dumps({**page, "stage": "paired"}, ensure_ascii=False) + "\n")
+    if snapshot.get("prejudge"):
+        with open(env["PREJUDGE_MODEL_PATH"], "w", encoding="utf-8") as f:
+            json.dump(snapshot["prejudge"], f)
+
+
+def kills(path: str) -> List[Tuple[str, str]]:
+    return [
+        (e["winner"], e["loser"]) for e in read_tape(path) if e.get("kind") == "kill"
+    ]
+
+
+def compare_tapes(a: str, b: str) -> Dict[str, Any]:
+    """How far two sessions agree: kill order, call counts, borrowed answers, wall time."""
+    kills_a, kills_b = kills(a), kills(b)
+    same_prefix = 0
+    for ka, kb in zip(kills_a, kills_b):
+        if ka != kb:
+            break
+        same_prefix += 1
+
+    def summary(path: str) -> Tuple[int, int, float]:
+        calls, borrowed, seconds = 0, 0, 0.0
+        for event in read_tape(path):
+            if event.get("kind") == "llm":
+                calls += 1
+            elif event.get("kind") == "borrowed":
+                borrowed += 1
+            elif event.get("kind") == "end":
+                seconds = float(event.get("seconds", 0.0))
+        return calls, borrowed, seconds
+
+    calls_a, borrowed_a, seconds_a = summary(a)
+    calls_b, borrowed_b, seconds_b = summary(b)
+    return {
+        "kills": (len(kills_a), len(kills_b)),
+        "same_prefix": same_prefix,
+        "same_kills": len(set(kills_a) & set(kills_b)),
+        "calls": (calls_a, calls_b),
+        "borrowed": (borrowed_a, borrowed_b),
+        "seconds": (seconds_a, seconds_b),
+    }
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from models import SoulState
+
+# A hundred thousand puppies, one copy of each trait. Cruella is glamorous, not wasteful.
+
+_GEN1_NAME = re.compile(r"^(?P<base>.*) \[(?P<ordinal>\d{3,})\]$")
+_GENN_NAME = re.compile(r"^(?P<base>.*) \[G(?P<gen>\d+)-(?P<ordinal>\d{3,})\]$")
+
+
+class Lineage:
+    """
+    A soul's victims as an ``array('I')`` of registry handles, allocated on the
+    first kill. Looks like the ``list[str]`` of ids it replaces — append,
+    iterate, reverse, index, len.
+    """
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: SoulRecord) -> None:
+        self._record = record
+
+    def _handles(self) -> array:
+        victims = self._record._victims
+        return victims if victims is not None else array("I")
+
+    def append(self, soul_id: str) -> None:
+        record = self._record
+        if record._victims is None:
+            record._victims = array("I")
+        record._victims.append(record._registry.handle(soul_id))
+
+    def __len__(self) -> int:
+        return len(self._handles())
+
+    def __getitem__(self, index: int) -> str:
+        return self._record._registry.ids[self._handles()[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        ids = self._record._registry.ids
+        return (ids[h] for h in self._handles())
+
+    def __reversed__(self) -> Iterator[str]:
+        ids = self._record._registry.ids
+        return (ids[h] for h in reversed(self._handles()))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, Lineage)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class SoulRecord:
+    """
+    Slotted, registry-backed stand-in for ``SoulState``: same attributes, same
+    ``to_dict`` shape, a fraction of the memory. The id is a dense integer
+    handle, the trait is an index into the registry's trait table, and the
+    name is rebuilt from base name + generation + ordinal on demand.
+    """
+
+    __slots__ = (
+        "_registry",
+        "handle",
+        "_trait",
+        "_ordinal",
+        "_name",
+        "generation",
+        "_victims",
+        "kills",
+        "deaths",
+        "alive",
+        "essence",
+        "absorbed_at",
+    )
+
+    def __init__(
+        self,
+        registry: SoulRegistry,
+        handle: int,
+        trait: int,
+        name: str,
+        generation: int,
+        lineage: Iterable[str],
+        kills: int,
+        deaths: int,
+        alive: bool,
+        essence: str,
+        absorbed_at: Optional[float],
+    ) -> None:
+        self._registry = registry
+        self.handle = handle
+        self._trait = trait
+        self.generation = generation
+        self._victims: Optional[array] = None
+        if lineage:
+            self._victims = array("I", (registry.handle(i) for i in lineage))
+        self.kills = kills
+        self.deaths = deaths
+        self.alive = alive
+        self.essence = essence
+        self.absorbed_at = absorbed_at
+        self._ordinal = registry.ordinal_for(name, trait, generation)
+        self._name = None if self._ordinal else sys.intern(name)
+
+    @property
+    def id(self) -> str:
+        return self._registry.ids[self.handle]
+
+    @property
+    def lineage(self) -> Lineage:
+        return Lineage(self)
+
+    @property
+    def trait(self) -> str:
+        return self._registry.traits[self._trait]
+
+    @property
+    def name(self) -> str:
+        if self._name is not None:
+            return self._name
+        base = self._registry.base_names[self._trait]
+        if self.generation <= 1:
+            return f"{base} [{self._ordinal:03d}]"
+        return f"{base} [G{self.generation}-{self._ordinal:03d}]"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The exact JSON shape ``SoulState.to_dict`` produces."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "trait": self.trait,
+            "generation": self.generation,
+            "lineage": list(self.lineage),
+            "kills": self.kills,
+            "deaths": self.deaths,
+            "alive": self.alive,
+            "essence": self.essence,
+            "absorbed_at": self.absorbed_at,
+        }
+
+    def to_state(self) -> SoulState:
+        return SoulState.from_dict(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"SoulRecord(id={self.id!r}, name={self.name!r}, alive={self.alive})"
+
+
+class SoulRegistry:
+    """
+    Interns everything souls repeat: 32-char ids become dense handles, traits
+    and their base names are stored once, and shared essence strings are
+    pooled. Records translate back to plain ``SoulState`` JSON at the edges.
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self._handles: Dict[str, int] = {}
+        self.traits: List[str] = []
+        self.base_names: List[str] = []
+        self._trait_index: Dict[str, int] = {}
+        self._essences: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def handle(self, soul_id: str) -> int:
+        h = self._handles.get(soul_id)
+        if h is None:
+            h = self._handles[soul_id] = len(self.ids)
+            self.ids.append(sys.intern(soul_id))
+        return h
+
+    def trait(self, trait: str) -> int:
+        t = self._trait_index.get(trait)
+        if t is None:
+            t = self._trait_index[trait] = len(self.traits)
+            self.traits.append(sys.intern(trait))
+            self.base_names.append(sys.intern(trait.split(" – ", 1)[0]))
+        return t
+
+    def essence(self, text: str) -> str:
+        return self._essences.setdefault(text, text)
+
+    def ordinal_for(self, name: str, trait: int, generation: int) -> int:
+        """Non-zero when ``name`` is exactly what the spawner would have built."""
+        match = (_GEN1_NAME if generation <= 1 else _GENN_NAME).match(name)
+        if match is None or match.group("base") != self.base_names[trait]:
+            return 0
+        if generation > 1 and int(match.group("gen")) != generation:
+            return 0
+        ordinal = int(match.group("ordinal"))
+        digits = match.group("ordinal")
+        return ordinal if f"{ordinal:03d}" == digits else 0
+
+    def adopt(self, soul: Union[SoulState, SoulRecord]) -> SoulRecord:
+        """Turn a plain ``SoulState`` (or a record from elsewhere) into a compact record."""
+        if isinstance(soul, SoulRecord) and soul._registry is self:
+            return soul
+        trait = self.trait(soul.trait)
+        return SoulRecord(
+            self,
+            self.handle(soul.id),
+            trait,
+            soul.name,
+            soul.generation,
+            soul.lineage,
+            soul.kills,
+            soul.deaths,
+            soul.alive,
+            self.essence(soul.essence),
+            soul.absorbed_at,
+        )
+
+    def from_dict(self, data: Dict[str, Any]) -> SoulRecord:
+        return self.adopt(SoulState.from_dict(data))
+
+
+# One registry per process, so handles mean the same thing everywhere in it.
+REGISTRY = SoulRegistry()
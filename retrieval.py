@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import zlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, List, Optional
+
+import config
+from budget import count_tokens
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is the only luxury here. Without it, the coat simply remembers in order.
+
+
+@lru_cache(maxsize=None)
+def _np() -> Any:
+    """NumPy, imported by the first index built rather than by everyone importing ``memory``."""
+    import numpy
+
+    return numpy
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+class HashedEmbedder:
+    """
+    Signed hashed bag-of-words (unigrams + bigrams), log-scaled and L2-normalised.
+    Stable across processes because it hashes with CRC32, not ``hash()``.
+    """
+
+    def __init__(self, dim: int = config.RETRIEVAL_DIM) -> None:
+        self.dim = dim
+
+    def tokens(self, text: str) -> List[str]:
+        words = _TOKEN_RE.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, text: str) -> np.ndarray:
+        np = _np()
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for tok in self.tokens(text):
+            h = zlib.crc32(tok.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        np.copysign(np.log1p(np.abs(vec)), vec, out=vec)
+        norm = float(np.linalg.norm(vec))
+        if norm > 0.0:
+            vec /= norm
+        return vec
+
+
+class MemoryIndex:
+    """
+    A fixed-capacity ring of embedded memories. Adding is O(dim); a query is
+    one matrix-vector product plus an ``argpartition`` for the top K.
+    """
+
+    def __init__(
+        self,
+        capacity: int = config.RETRIEVAL_INDEX_SIZE,
+        embedder: Optional[HashedEmbedder] = None,
+    ) -> None:
+        self.embedder = embedder or HashedEmbedder()
+        self.capacity = capacity
+        np = _np()
+        self.vectors = np.zeros((capacity, self.embedder.dim), dtype=np.float32)
+        self.texts: List[str] = [""] * capacity
+        self.count = 0  # total ever added; slot = count % capacity
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("numpy") is not None
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def add(self, text: str) -> None:
+        slot = self.count % self.capacity
+        self.vectors[slot] = self.embedder.embed(text)
+        self.texts[slot] = text
+        self.count += 1
+
+    def select(
+        self,
+        query: str,
+        k: int = config.RETRIEVAL_TOP_K,
+        max_tokens: int = config.RETRIEVAL_TOKEN_BUDGET,
+    ) -> List[str]:
+        """
+        The K most relevant memories that fit under ``max_tokens``, returned
+        oldest first so the prompt still reads like a chronicle.
+        """
+        n = len(self)
+        if n == 0 or k <= 0:
+            return []
+        np = _np()
+
+        scores = self.vectors[:n] @ self.embedder.embed(query)
+        # Slot age: 0 for the newest memory, n-1 for the oldest still held.
+        newest = (self.count - 1) % self.capacity
+        age = (newest - np.arange(n)) % self.capacity
+        scores += config.RETRIEVAL_RECENCY_WEIGHT * (1.0 - age / max(n, 1))
+
+        top = min(k, n)
+        candidates = np.argpartition(-scores, top - 1)[:top]
+        candidates = candidates[np.argsort(-scores[candidates])]
+
+        picked: List[int] = []
+        used = 0
+        for slot in candidates:
+            cost = count_tokens(self.texts[slot])
+            if used + cost > max_tokens:
+                continue
+            picked.append(int(slot))
+            used += cost
+
+        picked.sort(key=lambda s: -int(age[s]))
+        return [self.texts[s] for s in picked]
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import queue
+from typing import Any, Dict, List, Optional
+
+import config
+from arena import CruellaArena
+from journal import BattleJournal
+from llm import LLM
+from matchmaking import Matchmaker
+from models import ArenaState, BattleRecord, CollectiveState, SoulState
+from prejudge import get_prejudge
+from registry import REGISTRY
+
+# One kennel per core. Puppies die in parallel; the coat still counts them one at a time.
+
+Message = Dict[str, Any]
+
+
+class ShardArena(CruellaArena):
+    """
+    A worker's slice of the arena. It fights only its own souls and never owns
+    the coat: kills are reported to the coordinator, which numbers the spot,
+    updates ``CollectiveState`` and persists, and so are the judge's verdicts,
+    which only the coordinator's pre-judge keeps. Its collective is a read-only
+    snapshot kept fresh by coordinator broadcasts, used only for prompts.
+    It never prespawns either: new litters come from the coordinator.
+    """
+
+    generation_watermark = 0
+
+    def __init__(self, shard_id: int, inbox: Any, outbox: Any) -> None:
+        super().__init__()
+        self.shard_id = shard_id
+        self.inbox = inbox
+        self.outbox = outbox
+        self.sem = asyncio.Semaphore(
+            max(1, config.MAX_PARALLEL_BATTLES // max(1, config.ARENA_SHARDS))
+        )
+        self._refill: Optional[asyncio.Future] = None
+        self.journal = BattleJournal(path="")  # shards are re-dealt on restart
+        self.prejudge = get_prejudge(config.PREJUDGE, read_only=True)
+
+    async def _save(self) -> None:
+        return None  # the coordinator owns the freezer
+
+    async def _verdict(
+        self, a: SoulState, b: SoulState, battle_type: str, out_a: str, out_b: str
+    ) -> tuple[int, str, bool]:
+        """Rule as usual, and pass a sober judge's verdict on for the real pre-judge."""
+        winner_idx, reason, judged = await super()._verdict(
+            a, b, battle_type, out_a, out_b
+        )
+        if judged:
+            self.outbox.put(
+                {
+                    "type": "verdict",
+                    "out_a": out_a,
+                    "out_b": out_b,
+                    "winner": winner_idx,
+                }
+            )
+        return winner_idx, reason, judged
+
+    async def _record_kill(
+        self,
+        a: SoulState,
+        b: SoulState,
+        winner: SoulState,
+        loser: SoulState,
+        battle_type: str,
+        out_a: str,
+        out_b: str,
+        reason: str,
+    ) -> Optional[BattleRecord]:
+        async with self.lock:
+            if not loser.alive:
+                return None
+            loser.alive = False
+            winner.kills += 1
+            winner.lineage.append(loser.id)
+        self.outbox.put(
+            {
+                "type": "kill",
+                "shard": self.shard_id,
+                "a": a.id,
+                "b": b.id,
+                "winner": winner.id,
+                "loser": loser.id,
+                "battle_type": battle_type,
+                "out_a": out_a,
+                "out_b": out_b,
+                "reason": reason,
+            }
+        )
+        return None
+
+    async def _spawn_generation(self) -> list[SoulState]:
+        """Shards don't breed. Report survivors and wait for the next litter."""
+        assert self.state is not None
+        survivors = [s.id for s in self.state.souls.values() if s.alive]
+        loop = asyncio.get_running_loop()
+        self._refill = loop.create_future()
+        self.outbox.put({"type": "drained", "shard": self.shard_id, "alive": survivors})
+        souls: list[SoulState] = await self._refill
+        self._refill = None
+        self.state.souls = {s.id: s for s in souls}
+        self.matchmaker = Matchmaker(souls)
+        return souls
+
+    async def listen(self) -> None:
+        """Apply coordinator messages: collective snapshots, new souls, stop."""
+        while not self.shutdown.is_set():
+            try:
+                msg: Message = await asyncio.to_thread(self.inbox.get, True, 0.5)
+            except queue.Empty:
+                continue
+            kind = msg.get("type")
+            if kind == "collective" and self.state is not None:
+                self.state.collective = CollectiveState.from_dict(msg["collective"])
+            elif kind == "souls":
+                souls = [REGISTRY.from_dict(d) for d in msg["souls"]]
+                if self._refill is not None and not self._refill.done():
+                    self._refill.set_result(souls)
+            elif kind == "stop":
+                self.shutdown.set()
+                if self._refill is not None and not self._refill.done():
+                    self._refill.set_result([])
+
+
+def _shard_main(
+    shard_id: int,
+    souls: List[Dict[str, Any]],
+    collective: Dict[str, Any],
+    inbox: Any,
+    outbox: Any,
+) -> None:
+    """Process entry point for one shard."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f"[%(asctime)s] 🧥 shard-{shard_id} %(levelname)s :: %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    LLM.share(config.ARENA_SHARDS)
+
+    async def run() -> None:
+        arena = ShardArena(shard_id, inbox, outbox)
+        arena.state = ArenaState(
+            souls={d["id"]: REGISTRY.from_dict(d) for d in souls},
+            collective=CollectiveState.from_dict(collective),
+        )
+        listener = asyncio.create_task(arena.listen())
+        await arena.run_forever()
+        arena.shutdown.set()
+        await listener
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass  # the coordinator decides when the kennels close
+
+
+class ShardCoordinator:
+    """
+    Owns the real ``ArenaState``, splits the living souls across worker
+    processes, and applies their kill events one at a time so spot numbers
+    stay globally consistent. When every shard has drained, it spawns the next
+    generation and deals everyone alive back out round-robin.
+    """
+
+    def __init__(self, arena: CruellaArena, shards: int = config.ARENA_SHARDS) -> None:
+        self.arena = arena
+        self.shards = shards
+        self.ctx = mp.get_context("spawn")
+        self.outbox: Any = self.ctx.Queue()
+        self.inboxes: List[Any] = []
+        self.procs: List[Any] = []
+        self.drained: Dict[int, List[str]] = {}
+
+    def _deal(self, souls: List[SoulState]) -> List[List[SoulState]]:
+        hands: List[List[SoulState]] = [[] for _ in range(self.shards)]
+        for i, soul in enumerate(souls):
+            hands[i % self.shards].append(soul)
+        return hands
+
+    def start(self) -> None:
+        assert self.arena.state is not None
+        alive = [s for s in self.arena.state.souls.values() if s.alive]
+        collective = self.arena.state.collective.to_dict()
+        for shard_id, hand in enumerate(self._deal(alive)):
+            inbox = self.ctx.Queue()
+            proc = self.ctx.Process(
+                target=_shard_main,
+                args=(
+                    shard_id,
+                    [s.to_dict() for s in hand],
+                    collective,
+                    inbox,
+                    self.outbox,
+                ),
+                name=f"cruella-shard-{shard_id}",
+                daemon=True,
+            )
+            proc.start()
+            self.inboxes.append(inbox)
+            self.procs.append(proc)
+        logging.info("🧥 %s shards released %s puppies.", self.shards, len(alive))
+
+    def _broadcast(self, msg: Message) -> None:
+        for inbox in self.inboxes:
+            inbox.put(msg)
+
+    async def run(self) -> None:
+        self.start()
+        try:
+            while not self.arena.shutdown.is_set():
+                try:
+                    msg: Message = await asyncio.to_thread(self.outbox.get, True, 0.5)
+                except queue.Empty:
+                    if not any(p.is_alive() for p in self.procs):
+                        logging.error("Every shard has died. The kennels are empty.")
+                        break
+                    continue
+                if msg["type"] == "kill":
+                    await self._apply_kill(msg)
+                elif msg["type"] == "verdict":
+                    if self.arena.prejudge is not None:
+                        self.arena.prejudge.learn(
+                            msg["out_a"], msg["out_b"], msg["winner"]
+                        )
+                elif msg["type"] == "drained":
+                    self.drained[msg["shard"]] = msg["alive"]
+                    if len(self.drained) == self.shards:
+                        await self._refill()
+        finally:
+            await self.stop()
+
+    async def _apply_kill(self, msg: Message) -> None:
+        state = self.arena.state
+        assert state is not None
+        souls = state.souls
+        try:
+            a, b = souls[msg["a"]], souls[msg["b"]]
+            winner, loser = souls[msg["winner"]], souls[msg["loser"]]
+        except KeyError as exc:
+            logging.error("Shard %s reported a stranger: %s", msg.get("shard"), exc)
+            return
+        record = await self.arena._record_kill(
+            a,
+            b,
+            winner,
+            loser,
+            msg["battle_type"],
+            msg["out_a"],
+            msg["out_b"],
+            msg["reason"],
+        )
+        if record is not None:
+            self._broadcast(
+                {"type": "collective", "collective": state.collective.to_dict()}
+            )
+
+    async def _refill(self) -> None:
+        state = self.arena.state
+        assert state is not None
+        self.drained.clear()
+        if state.collective.coat_complete:
+            self.arena.shutdown.set()
+            return
+        await self.arena._spawn_generation()
+        alive = [s for s in state.souls.values() if s.alive]
+        for inbox, hand in zip(self.inboxes, self._deal(alive)):
+            inbox.put({"type": "souls", "souls": [s.to_dict() for s in hand]})
+        self._broadcast(
+            {"type": "collective", "collective": state.collective.to_dict()}
+        )
+
+    async def stop(self) -> None:
+        self._broadcast({"type": "stop"})
+        deadline = asyncio.get_running_loop().time() + config.SHARD_STOP_TIMEOUT
+        for proc in self.procs:
+            remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+            await asyncio.to_thread(proc.join, remaining)
+            if proc.is_alive():
+                proc.terminate()
@@ -2,26 +2,113 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import uuid
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import config
 from models import SoulState
 
 # Cruella does not tolerate empty kennels. The coat demands its 101 spots — but she'll improvise if someone was sloppy.
 
 
-def _load_soul_traits() -> List[str]:
+@dataclass(frozen=True)
+class TraitTable:
+    """The kennel roster, parsed once: every trait and its precomputed base name."""
+
+    path: Path
+    stamp: Tuple[int, int]  # (mtime_ns, size) — a changed file is a new table
+    traits: Tuple[str, ...]
+    base_names: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.traits)
+
+
+_TABLES: Dict[Path, TraitTable] = {}
+
+
+def _traits_path() -> Path:
+    return (
+        Path(config.SOUL_TRAITS_PATH)
+        if config.SOUL_TRAITS_PATH
+        else Path(__file__).with_name("souls.json")
+    )
+
+
+def _base_name(trait: str) -> str:
+    return trait.split(" – ", 1)[0]
+
+
+def _jsonl_trait(raw: str, lineno: int, path: Path) -> Optional[str]:
+    """One JSONL line → one trait. Bare strings or {"trait": ...} objects both count."""
+    raw = raw.strip()
+    if not raw:
+        return None
+    item = json.loads(raw)
+    if isinstance(item, dict):
+        item = item.get("trait")
+    if not isinstance(item, str):
+        raise ValueError(
+            f"{path.name}:{lineno} is not a string trait. Cruella is taking notes."
+        )
+    return item
+
+
+def _stream_jsonl_traits(path: Path) -> Iterator[str]:
+    with path.open("r", encoding="utf-8") as f:
+        for lineno, raw in enumerate(f, 1):
+            trait = _jsonl_trait(raw, lineno, path)
+            if trait is not None:
+                yield trait
+
+
+def trait_table() -> TraitTable:
+    """
+    The cached, immutable roster. Re-read only when the file's mtime or size
+    changes, so every litter after the first skips the parse entirely.
+    """
+    json_path = _traits_path()
+
+    try:
+        st = os.stat(json_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Cruella cannot find souls.json at {json_path}. The coat is furious. Fix it, darling."
+        ) from None
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _TABLES.get(json_path)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+
+    data = _load_soul_traits(json_path)
+    table = TraitTable(
+        path=json_path,
+        stamp=stamp,
+        traits=tuple(data),
+        base_names=tuple(_base_name(t) for t in data),
+    )
+    _TABLES[json_path] = table
+    return table
+
+
+def _load_soul_traits(json_path: Optional[Path] = None) -> List[str]:
     """Summon the raw Matthew souls from souls.json. Cruella expects exactly 101. If you gave her less, she will remember."""
-    json_path = Path(__file__).with_name("souls.json")
+    json_path = json_path or _traits_path()
 
     if not json_path.is_file():
         raise FileNotFoundError(
             f"Cruella cannot find souls.json at {json_path}. The coat is furious. Fix it, darling."
         )
 
-    with json_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    if json_path.suffix == ".jsonl":
+        data = list(_stream_jsonl_traits(json_path))
+    else:
+        with json_path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
 
     if not isinstance(data, list):
         raise ValueError(
@@ -47,32 +134,62 @@ def _load_soul_traits() -> List[str]:
     return data
 
 
-def create_initial_souls(num: int = 101) -> List[SoulState]:
-    """Birth the first litter of spotted little darlings. Fresh, terrified, delicious."""
-    traits = _load_soul_traits()
-    selected = traits[:num]
-
-    souls: List[SoulState] = []
-    for i, trait in enumerate(selected):
-        base_name = trait.split(" – ", 1)[0]
-        name = f"{base_name} [{i + 1:03d}]"
-
-        souls.append(
-            SoulState(
-                id=uuid.uuid4().hex,
-                name=name,
-                trait=trait,
-                generation=1,
-                lineage=[],
-                kills=0,
-                deaths=0,
-                alive=True,
-                essence=f"Prime Matthew fragment. Trait: {trait}. Born to run. Destined to be a spot on Cruella's coat. Delicious.",
-                absorbed_at=None,
+def iter_traits(num: int) -> Iterator[Tuple[str, str]]:
+    """
+    The first ``num`` ``(trait, base_name)`` pairs. JSONL pools are streamed
+    line by line and never loaded whole; JSON pools come from the cached table.
+    """
+    path = _traits_path()
+    if path.suffix == ".jsonl":
+        if not path.is_file():
+            raise FileNotFoundError(
+                f"Cruella cannot find {path}. The coat is furious. Fix it, darling."
             )
+        for trait in islice(_stream_jsonl_traits(path), num):
+            yield trait, _base_name(trait)
+        return
+    table = trait_table()
+    yield from islice(zip(table.traits, table.base_names), num)
+
+
+def iter_initial_souls(num: int = 101) -> Iterator[SoulState]:
+    """Birth the first litter one darling at a time. Fresh, terrified, delicious."""
+    for i, (trait, base_name) in enumerate(iter_traits(num)):
+        yield SoulState(
+            id=uuid.uuid4().hex,
+            name=f"{base_name} [{i + 1:03d}]",
+            trait=trait,
+            generation=1,
+            lineage=[],
+            kills=0,
+            deaths=0,
+            alive=True,
+            essence=f"Prime Matthew fragment. Trait: {trait}. Born to run. Destined to be a spot on Cruella's coat. Delicious.",
+            absorbed_at=None,
         )
 
-    return souls
+
+def create_initial_souls(num: int = 101) -> List[SoulState]:
+    """Birth the first litter of spotted little darlings. Fresh, terrified, delicious."""
+    return list(iter_initial_souls(num))
+
+
+def iter_next_generation(num: int, base_generation: int) -> Iterator[SoulState]:
+    """The coat bleeds new puppies lazily — as many as the caller cares to take."""
+    generation = base_generation + 1
+    for i, (trait, base_name) in enumerate(iter_traits(num)):
+        yield SoulState(
+            id=uuid.uuid4().hex,
+            name=f"{base_name} [G{generation}-{i + 1:03d}]",
+            trait=trait,
+            generation=generation,
+            lineage=[],
+            kills=0,
+            deaths=0,
+            alive=True,
+            essence="Fresh shard torn from the coat's lining. Hazy memories of absorbed siblings. Still believes escape is possible. Poor darling.",
+            absorbed_at=None,
+        )
 
 
 def spawn_next_generation(
@@ -81,28 +198,4 @@ def spawn_next_generation(
     collective,  # noqa: ARG001 — Cruella remembers everything anyway
 ) -> List[SoulState]:
     """The coat bleeds new puppies from its own memories. They arrive thinking they can escape. They never do."""
-    traits = _load_soul_traits()
-    generation = base_generation + 1
-    selected = traits[:num]
-
-    souls: List[SoulState] = []
-    for i, trait in enumerate(selected):
-        base_name = trait.split(" – ", 1)[0]
-        name = f"{base_name} [G{generation}-{i + 1:03d}]"
-
-        souls.append(
-            SoulState(
-                id=uuid.uuid4().hex,
-                name=name,
-                trait=trait,
-                generation=generation,
-                lineage=[],
-                kills=0,
-                deaths=0,
-                alive=True,
-                essence="Fresh shard torn from the coat's lining. Hazy memories of absorbed siblings. Still believes escape is possible. Poor darling.",
-                absorbed_at=None,
-            )
-        )
-
-    return souls
+    return list(iter_next_generation(num, base_generation))
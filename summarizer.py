@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+import config
+from budget import BUDGET
+from llm import LLM, SUMMARY
+from memory import CollectiveMemory, MemoryEntry
+
+# Old screams get pressed flat into lining. The coat keeps the gist, not the noise.
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are the archivist stitched into Cruella's coat. Compress the memories you are given "
+    "into one dense paragraph. Keep every name that won or died, the best insults, and any "
+    "pattern in how puppies lost. No lists, no preamble, no apologies. "
+    "Stay under {words} words."
+)
+
+
+class MemorySummarizer:
+    """
+    Background task that folds raw kill snippets into hierarchical summaries.
+
+    Tier ``chunk`` covers every ``SUMMARY_CHUNK_KILLS`` raw snippets; tier
+    ``generation`` rolls a finished generation's chunks into one paragraph.
+    Its calls queue at the ``SUMMARY`` class, behind every battle call, so
+    the limiter only hands it a slot the arena isn't asking for; it skips a
+    round while ``is_up`` says every backend is down.
+    """
+
+    def __init__(
+        self,
+        memory: CollectiveMemory,
+        is_up: Callable[[], bool] = lambda: True,
+        shutdown: Optional[asyncio.Event] = None,
+    ) -> None:
+        self.memory = memory
+        self.is_up = is_up
+        self.shutdown = shutdown or asyncio.Event()
+
+    async def run(self) -> None:
+        while not self.shutdown.is_set():
+            try:
+                await asyncio.wait_for(
+                    self.shutdown.wait(), timeout=config.SUMMARY_INTERVAL
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+
+            if not self.is_up():
+                continue
+            try:
+                if not await self.summarize_chunk():
+                    await self.roll_up_generation()
+            except Exception as exc:  # noqa: BLE001
+                logging.error("The archivist choked on a memory: %s", exc)
+
+    async def summarize_chunk(self) -> bool:
+        """Compress the oldest full chunk of raw snippets. False if none is ready."""
+        size = config.SUMMARY_CHUNK_KILLS
+        # A backlog that outran the ring is read from the log; not on the loop.
+        pending = await asyncio.to_thread(self.memory.unsummarized, size)
+        if len(pending) < size:
+            return False
+
+        first, last = pending[0], pending[-1]
+        text = await self._compress([e.text for e in pending])
+        if not text:
+            return False
+        self.memory.append(
+            MemoryEntry(
+                text=f"[Spots {first.spot:03d}–{last.spot:03d}] {text}",
+                kind="summary",
+                tier="chunk",
+                spot=last.spot,
+                generation=last.generation,
+                through=last.seq,
+            )
+        )
+        logging.info("🧵 Archived memories %s–%s into one patch.", first.seq, last.seq)
+        return True
+
+    async def roll_up_generation(self) -> bool:
+        """Fold the chunks of a generation that has finished into one summary."""
+        generations = self.memory.summaries.get("generation", ())
+        rolled = generations[-1].through if generations else 0
+        chunks = [
+            e for e in self.memory.summaries.get("chunk", ()) if e.through > rolled
+        ]
+        if not chunks:
+            return False
+
+        newest = max((e.generation for e in self.memory.ring), default=0)
+        target = chunks[0].generation
+        if target >= newest:
+            return False  # still being fought over; not lining yet
+
+        batch: List[MemoryEntry] = [e for e in chunks if e.generation == target]
+        text = await self._compress([e.text for e in batch])
+        if not text:
+            return False
+        self.memory.append(
+            MemoryEntry(
+                text=f"[Generation {target}] {text}",
+                kind="summary",
+                tier="generation",
+                spot=batch[-1].spot,
+                generation=target,
+                through=batch[-1].through,
+            )
+        )
+        logging.info("🧵 Generation %s pressed into the coat's lining.", target)
+        return True
+
+    async def _compress(self, texts: List[str]) -> str:
+        messages = [
+            {
+                "role": "system",
+                "content": SUMMARY_SYSTEM_PROMPT.format(words=config.SUMMARY_MAX_WORDS),
+            },
+            {"role": "user", "content": "\n".join(texts)},
+        ]
+        BUDGET.record("summary", messages)
+        try:
+            text = await LLM.chat(
+                config.MODEL_COLLECTIVE,
+                messages,
+                {"temperature": config.TEMP_SUMMARY},
+                priority=SUMMARY,
+            )
+            return text.strip()
+        except Exception as exc:  # noqa: BLE001
+            logging.error("Archivist call failed, will retry when idle: %s", exc)
+            return ""
@@ -1,28 +1,41 @@
 from __future__ import annotations
 
-import random
 import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict
 
 from PIL import Image, ImageDraw, ImageFont
 
+import config
 from models import BattleRecord
+from recorder import battle_rng
+
+# Cruella's trophy closet — built the first time a trophy needs hanging, not on import
+MEDIA_DIR = Path(config.MEDIA_DIR)
+
+FONT_SPECS = {
+    "title": ("arialbd.ttf", 140),
+    "big": ("georgia.ttf", 90),
+    "med": ("georgiai.ttf", 70),
+    "quote": ("georgiai.ttf", 60),
+}
+
+
+@lru_cache(maxsize=None)
+def _fonts() -> Dict[str, Any]:
+    """Fonts — if the system doesn't have them, Cruella will make do with murder."""
+    try:
+        return {k: ImageFont.truetype(f, size) for k, (f, size) in FONT_SPECS.items()}
+    except OSError:
+        default = ImageFont.load_default()
+        return {k: default for k in FONT_SPECS}
+
+
+def _trophy_path(filename: str) -> Path:
+    MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+    return MEDIA_DIR / filename
 
-# Cruella's trophy closet
-MEDIA_DIR = Path("media")
-MEDIA_DIR.mkdir(exist_ok=True)
-
-# Fonts — if the system doesn't have them, Cruella will make do with murder
-try:
-    FONT_TITLE = ImageFont.truetype("arialbd.ttf", 140)
-    FONT_BIG = ImageFont.truetype("georgia.ttf", 90)
-    FONT_MED = ImageFont.truetype("georgiai.ttf", 70)
-    FONT_QUOTE = ImageFont.truetype("georgiai.ttf", 60)
-except OSError:
-    FONT_TITLE = ImageFont.load_default()
-    FONT_BIG = ImageFont.load_default()
-    FONT_MED = ImageFont.load_default()
-    FONT_QUOTE = ImageFont.load_default()
 
 # Colors — blacker than Cruella's heart, redder than the blood on her hands
 BLACK = (0, 0, 0)
@@ -36,12 +49,13 @@ def _spotted_fur(width: int, height: int) -> Image.Image:
     """Darling, the coat's signature pattern — irregular, cruel, perfect."""
     img = Image.new("RGB", (width, height), BLACK)
     draw = ImageDraw.Draw(img)
+    rng = battle_rng()
 
-    spots = random.randint(50, 90)
+    spots = rng.randint(50, 90)
     for _ in range(spots):
-        x = random.randint(-50, width + 50)
-        y = random.randint(-50, height + 50)
-        r = random.randint(15, 80)  # <-- this line was missing
+        x = rng.randint(-50, width + 50)
+        y = rng.randint(-50, height + 50)
+        r = rng.randint(15, 80)  # <-- this line was missing
         draw.ellipse((x - r, y - r, x + r, y + r), fill=WHITE)
 
     return img
@@ -55,6 +69,7 @@ def render_kill_card(
 ) -> str:
     """Every kill is a work of art. This function is Cruella's camera."""
     width, height = 1200, 675  # X's favorite ratio
+    rng = battle_rng()
     img = _spotted_fur(width, height)
     draw = ImageDraw.Draw(img, "RGBA")
 
@@ -69,7 +84,7 @@ def render_kill_card(
         (width // 2, 80),
         title,
         fill=GOLD,
-        font=FONT_TITLE,
+        font=_fonts()["title"],
         anchor="mt",
         stroke_width=8,
         stroke_fill=BLOOD,
@@ -80,7 +95,7 @@ def render_kill_card(
         (100, 240),
         winner_name.upper(),
         fill=GOLD,
-        font=FONT_BIG,
+        font=_fonts()["big"],
         stroke_width=5,
         stroke_fill=BLACK,
     )
@@ -91,7 +106,7 @@ def render_kill_card(
         (width - 100, 240),
         loser_text,
         fill=(180, 180, 180),
-        font=FONT_BIG,
+        font=_fonts()["big"],
         anchor="rt",
         stroke_width=4,
         stroke_fill=BLACK,
@@ -103,7 +118,7 @@ def render_kill_card(
         (width // 2, height - 180),
         verdict,
         fill=WHITE,
-        font=FONT_MED,
+        font=_fonts()["med"],
         anchor="mm",
         align="center",
         stroke_width=3,
@@ -123,12 +138,12 @@ def render_kill_card(
         "You were never a puppy. You were always fabric.",
         "The coat is hungry. Thank you for feeding it.",
     ]
-    quote = random.choice(quotes)
+    quote = rng.choice(quotes)
     draw.text(
         (width // 2, height - 80),
         quote,
         fill=(220, 220, 220),
-        font=FONT_QUOTE,
+        font=_fonts()["quote"],
         anchor="mm",
     )
 
@@ -136,15 +151,15 @@ def render_kill_card(
     smoke = Image.new("RGBA", (400, 400), (0, 0, 0, 0))
     sdraw = ImageDraw.Draw(smoke)
     for _ in range(40):
-        sx = random.randint(0, 400)
-        sy = random.randint(0, 400)
-        sr = random.randint(15, 80)
+        sx = rng.randint(0, 400)
+        sy = rng.randint(0, 400)
+        sr = rng.randint(15, 80)
         sdraw.ellipse((sx - sr, sy - sr, sx + sr, sy + sr), fill=SMOKE)
     img.paste(smoke, (width - 380, 20), smoke)
 
     # Save the masterpiece
     timestamp = int(time.time())
-    filename = MEDIA_DIR / f"kill_{timestamp}_{spot_number:03d}.png"
+    filename = _trophy_path(f"kill_{timestamp}_{spot_number:03d}.png")
     img.save(filename, "PNG", quality=95)
 
     return str(filename)
@@ -165,7 +180,7 @@ def render_coat_progress_card(spots_claimed: int) -> str:
         (width // 2, height // 2),
         text,
         fill=GOLD if spots_claimed < 101 else WHITE,
-        font=FONT_TITLE,
+        font=_fonts()["title"],
         anchor="mm",
         stroke_width=10,
         stroke_fill=BLOOD if spots_claimed < 101 else BLACK,
@@ -174,19 +189,17 @@ def render_coat_progress_card(spots_claimed: int) -> str:
     whisper = (
         "The coat hungers..."
         if spots_claimed < 101
-        else "THE COAT IS PERFECT."
-        if spots_claimed == 101
-        else "CRUELLA IS COMPLETE."
+        else "THE COAT IS PERFECT." if spots_claimed == 101 else "CRUELLA IS COMPLETE."
     )
     draw.text(
         (width // 2, height // 2 + 120),
         whisper,
         fill=WHITE,
-        font=FONT_BIG,
+        font=_fonts()["big"],
         anchor="mm",
     )
 
-    filename = MEDIA_DIR / f"coat_progress_{spots_claimed:03d}.png"
+    filename = _trophy_path(f"coat_progress_{spots_claimed:03d}.png")
     img.save(filename, "PNG")
 
     return str(filename)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+import config
+from arena import BATTLE_TYPES, CruellaArena
+from generations import GenerationManager
+from jobqueue import BattleQueue, Job
+from llm import LLM
+from matchmaking import Matchmaker
+from metrics import METRICS
+from models import ArenaState, CollectiveState, SoulState
+from prejudge import get_prejudge
+
+# The coordinator keeps the ledger; the workers do the screaming. Neither trusts the other.
+
+
+class QueueCoordinator:
+    """
+    Owns ``ArenaState`` and matchmaking. Each pairing becomes a job in the
+    durable ``BattleQueue``; stateless ``BattleWorker`` processes run the
+    contestant and judge calls and post results back. Kills are applied here,
+    one at a time, so spot numbering never forks. A job whose souls are no
+    longer both alive when its result lands is discarded, which makes
+    at-least-once delivery harmless.
+    """
+
+    def __init__(
+        self, arena: CruellaArena, queue: Optional[BattleQueue] = None
+    ) -> None:
+        self.arena = arena
+        self.queue = queue or BattleQueue()
+
+    @property
+    def matchmaker(self) -> Matchmaker:
+        return self.arena.matchmaker
+
+    def _adopt_open_jobs(self) -> None:
+        """After a restart, souls already queued or leased stay spoken for."""
+        for job in self.queue.open_jobs():
+            self.matchmaker.claim(job.payload["a"]["id"])
+            self.matchmaker.claim(job.payload["b"]["id"])
+        if self.matchmaker.busy:
+            logging.info(
+                "📮 Adopted %s souls already waiting in the queue.",
+                len(self.matchmaker.busy),
+            )
+
+    def _payload(self, a: SoulState, b: SoulState) -> Dict[str, Any]:
+        assert self.arena.state is not None
+        return {
+            "a": a.to_dict(),
+            "b": b.to_dict(),
+            "battle_type": random.choice(BATTLE_TYPES),
+            "seed": random.randint(0, 10**9),
+            "collective": self.arena.state.collective.to_dict(),
+        }
+
+    async def run(self) -> None:
+        arena = self.arena
+        assert arena.state is not None
+        arena.matchmaker = Matchmaker(arena.state.souls.values())
+        generations = GenerationManager(arena, arena.generation_watermark)
+        self._adopt_open_jobs()
+        while not arena.shutdown.is_set():
+            applied = await self._drain_results()
+            generations.tick()
+            applied += await generations.feed()
+
+            if self.matchmaker.alive < 2 and not self.matchmaker.busy:
+                if arena.state.collective.coat_complete:
+                    break
+                await generations.drained()
+                continue
+
+            queued = 0
+            while len(self.matchmaker.busy) // 2 < config.JOB_MAX_OUTSTANDING:
+                pair = self.matchmaker.pop_pair()
+                if pair is None:
+                    break
+                await asyncio.to_thread(self.queue.put, self._payload(*pair))
+                queued += 1
+
+            if not applied and not queued:
+                await asyncio.sleep(config.JOB_POLL_INTERVAL)
+        await generations.close()
+
+    async def _drain_results(self) -> int:
+        applied = 0
+        for job in await asyncio.to_thread(self.queue.results):
+            if self.arena.shutdown.is_set():
+                break
+            await self._apply(job)
+            applied += 1
+        for job in await asyncio.to_thread(self.queue.failed):
+            logging.error(
+                "📮 Battle job %s failed %s times. Releasing its puppies.",
+                job.id,
+                job.attempts,
+            )
+            self._release(job)
+            await asyncio.to_thread(self.queue.mark, job.id, "discarded")
+        return applied
+
+    def _release(self, job: Job) -> None:
+        for key in ("a", "b"):
+            # Look in the matchmaker, not the state: the dead are already archived.
+            soul = self.matchmaker.busy.get(job.payload[key]["id"])
+            if soul is not None:
+                self.matchmaker.release(soul)
+
+    async def _apply(self, job: Job) -> None:
+        assert self.arena.state is not None and job.result is not None
+        souls = self.arena.state.souls
+        result = job.result
+        if result.get("judged") and self.arena.prejudge is not None:
+            # Workers only learn in memory; the weights that persist learn here.
+            self.arena.prejudge.learn(
+                result["out_a"], result["out_b"], result["winner"]
+            )
+        a = souls.get(job.payload["a"]["id"])
+        b = souls.get(job.payload["b"]["id"])
+        if a is None or b is None or not (a.alive and b.alive):
+            self._release(job)
+            await asyncio.to_thread(self.queue.mark, job.id, "discarded")
+            return
+        winner, loser = (a, b) if result["winner"] == 0 else (b, a)
+        await self.arena._record_kill(
+            a,
+            b,
+            winner,
+            loser,
+            job.payload["battle_type"],
+            result["out_a"],
+            result["out_b"],
+            result["reason"],
+        )
+        self._release(job)
+        await asyncio.to_thread(self.queue.mark, job.id, "applied")
+
+
+class BattleWorker:
+    """
+    A stateless pair of claws. Leases a battle job, runs both contestants and
+    the judge with the arena's own ``_call_soul``/``_verdict``, posts the result.
+    Holds no state beyond the job in hand, so any number can run anywhere the
+    queue file is reachable.
+    """
+
+    def __init__(self, queue: Optional[BattleQueue] = None, owner: str = "") -> None:
+        self.queue = queue or BattleQueue()
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.arena = CruellaArena()
+        self.arena.state = ArenaState(souls={})
+        self.arena.prejudge = get_prejudge(config.PREJUDGE, read_only=True)
+
+    async def run(self) -> None:
+        logging.info("🐾 Battle worker %s reporting for slaughter.", self.owner)
+        while not self.arena.shutdown.is_set():
+            if not await LLM.healthy():
+                # Let the lease go elsewhere.
+                await asyncio.sleep(config.JOB_POLL_INTERVAL)
+                continue
+            job = await asyncio.to_thread(self.queue.lease, self.owner)
+            if job is None:
+                await asyncio.sleep(config.JOB_POLL_INTERVAL)
+                continue
+            try:
+                await self.fight(job)
+            except Exception as exc:  # noqa: BLE001
+                # Leave the lease to expire; another worker will pick it up.
+                logging.error(
+                    "Battle job %s blew up on %s: %s", job.id, self.owner, exc
+                )
+
+    async def fight(self, job: Job) -> None:
+        p = job.payload
+        a, b = SoulState.from_dict(p["a"]), SoulState.from_dict(p["b"])
+        assert self.arena.state is not None
+        self.arena.state.collective = CollectiveState.from_dict(p["collective"])
+
+        duel = None
+        if self.arena.duel_mode != "split":
+            duel = await self.arena._call_duel(a, b, p["battle_type"], p["seed"])
+        if duel is not None:
+            out_a, out_b, verdict = duel
+        else:
+            out_a = await self.arena._call_soul(a, b, p["battle_type"], p["seed"])
+            if not await self._hold(job):
+                return
+            out_b = await self.arena._call_soul(b, a, p["battle_type"], p["seed"])
+            verdict = None
+        if not await self._hold(job):
+            return
+        judged = False
+        if verdict is None:
+            winner_idx, reason, judged = await self.arena._verdict(
+                a, b, p["battle_type"], out_a, out_b
+            )
+        else:
+            winner_idx, reason = verdict
+
+        posted = await asyncio.to_thread(
+            self.queue.complete,
+            job.id,
+            self.owner,
+            {
+                "winner": winner_idx,
+                "reason": reason,
+                "out_a": out_a,
+                "out_b": out_b,
+                "judged": judged,
+            },
+        )
+        if not posted:
+            self._lost(job)
+
+    async def _hold(self, job: Job) -> bool:
+        """Extend the lease; False (and give up) once another worker has the job."""
+        if await asyncio.to_thread(self.queue.extend, job.id, self.owner):
+            return True
+        self._lost(job)
+        return False
+
+    def _lost(self, job: Job) -> None:
+        METRICS.inc("jobs.lease_lost")
+        logging.warning(
+            "Battle job %s lost its lease on %s; its result is someone else's now.",
+            job.id,
+            self.owner,
+        )
+
+
+async def main(owner: str = "") -> None:
+    worker = BattleWorker(owner=owner)
+    try:
+        await worker.run()
+    except asyncio.CancelledError:
+        pass
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else ""))
+    except KeyboardInterrupt:
+        logging.info("Worker dismissed. The queue remembers its jobs.")